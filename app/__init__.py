@@ -1,19 +1,52 @@
 """
 Application Factory Pattern for Mechanics Shop API
 """
-from flask import Flask, jsonify
+import os
+from flask import Flask, jsonify, request
 from sqlalchemy import text
 from datetime import datetime, timezone
 from config import Config
 from app.extensions import db, ma, migrate, limiter, cache
+from app.utils.db_pool import engine_options, init_pool_metrics, pool_status
+from app.utils.query_stats import init_query_stats
+from app.utils.fault_injection import init_fault_injection
+from app.utils.replicas import init_replicas, replica_binds
+from app.utils.metrics import init_metrics
+from app.utils.profiling import init_profiling
+from app.utils.seed import init_seed_command
+from app.utils.startup_profile import init_startup_profile_command
+from app.utils.json_provider import FastJSONProvider
+from app.utils.compression import init_compression
+from app.utils.request_validation import init_request_validation
+from app.utils.serializers import init_serializers
+from app.utils.batch import init_batch
+from app.utils.idempotency import init_idempotency
+from app.utils.webhooks import init_webhooks
+import flask_swagger_ui
 from flask_swagger_ui import get_swaggerui_blueprint
 
 def create_app(config_class=Config):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(config_class)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    app.config['SQLALCHEMY_BINDS'] = replica_binds(app.config)
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        init_pool_metrics(app, db.engine)
+        init_query_stats(app, *db.engines.values())
+        init_fault_injection(app, *db.engines.values())
+    init_replicas(app, db)
+    init_metrics(app)
+    init_profiling(app)
+    init_seed_command(app)
+    init_startup_profile_command(app)
+    init_compression(app)
+    init_batch(app)
+    init_idempotency(app)
+    init_webhooks(app)
     ma.init_app(app)  # Removed jwt.init_app(app)
     migrate.init_app(app, db)
     limiter.init_app(app)
@@ -38,6 +71,11 @@ def create_app(config_class=Config):
     
     # Register Swagger UI blueprint
     app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    if 'compression' in app.extensions:
+        # Swagger UI serves its bundle through a view, not a static route
+        app.extensions['compression'].register_static(
+            'swagger_ui.show', os.path.join(os.path.dirname(flask_swagger_ui.__file__), 'dist'), 'path'
+        )
     # ========== END SWAGGER CONFIG ==========
 
     # Import and register blueprints
@@ -46,6 +84,7 @@ def create_app(config_class=Config):
     from app.blueprints.mechanics.routes import mechanics_bp
     from app.blueprints.service_tickets.routes import service_tickets_bp
     from app.blueprints.inventory.routes import inventory_bp
+    from app.blueprints.batch.routes import batch_bp
     
     # Register blueprints with URL prefixes
     app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -53,6 +92,10 @@ def create_app(config_class=Config):
     app.register_blueprint(mechanics_bp, url_prefix='/mechanics')
     app.register_blueprint(service_tickets_bp, url_prefix='/tickets')
     app.register_blueprint(inventory_bp, url_prefix='/inventory')
+    app.register_blueprint(batch_bp, url_prefix='/batch')
+    # Compile the request validators the routes above declared
+    init_request_validation(app)
+    init_serializers(db)
 
     # ========== SERVE SWAGGER.YAML FILE ==========
     @app.route('/swagger.yaml')
@@ -78,21 +121,25 @@ def create_app(config_class=Config):
     # Fixed health check endpoint
     @app.route('/health')
     def health_check():
-        """Health check endpoint with proper structure"""
+        """Health check endpoint with proper structure (?detailed=1 adds pool stats)"""
         try:
             db.session.execute(text('SELECT 1'))
             database_status = 'healthy'
         except Exception:
             database_status = 'unhealthy'
             
-        return jsonify({
+        payload = {
             "status": "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "services": {
                 "database": database_status,
                 "api": "healthy"
             }
-        })
+        }
+        if request.args.get('detailed', '').lower() in ('1', 'true', 'yes'):
+            payload["database_pool"] = pool_status(app, db.engine)
+
+        return jsonify(payload)
 
     # Mark as accessed to satisfy static analyzers
     _ = health_check
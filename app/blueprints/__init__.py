@@ -7,5 +7,6 @@ from app.blueprints.customers.routes import customers_bp
 from app.blueprints.mechanics.routes import mechanics_bp
 from app.blueprints.service_tickets.routes import service_tickets_bp
 from app.blueprints.inventory.routes import inventory_bp
+from app.blueprints.batch.routes import batch_bp
 
-__all__ = ['auth_bp', 'customers_bp', 'mechanics_bp', 'service_tickets_bp', 'inventory_bp']
\ No newline at end of file
+__all__ = ['auth_bp', 'customers_bp', 'mechanics_bp', 'service_tickets_bp', 'inventory_bp', 'batch_bp']
\ No newline at end of file
@@ -1,39 +1,26 @@
 """
 Authentication Routes - Fixed error handling
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.models.customer import Customer
 from app.models.mechanic import Mechanic
-from app import db
+from app import db, limiter
+from app.utils.request_validation import validate_json
 
 auth_bp = Blueprint('auth', __name__)
 
+def login_rate_limit():
+    """Per-client login limit, read from config so deployments can tune it"""
+    return current_app.config.get('RATELIMIT_LOGIN', '10 per minute')
+
 @auth_bp.route('/customer/login', methods=['POST'])
+@limiter.limit(login_rate_limit)
+@validate_json('CustomerLogin')
 def customer_login():
     """Customer login endpoint with comprehensive error handling"""
     try:
-        # Validate request has JSON
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
 
-        # Validate required fields
-        if not data:
-            return jsonify({
-                "success": False,
-                "error": "No data provided"
-            }), 400
-
-        if not data.get('email') or not data.get('password'):
-            return jsonify({
-                "success": False,
-                "error": "Email and password are required"
-            }), 400
-
         # Find customer
         customer = Customer.query.filter_by(email=data['email']).first()
 
@@ -67,31 +54,13 @@ def customer_login():
         }), 500
 
 @auth_bp.route('/mechanic/login', methods=['POST'])
+@limiter.limit(login_rate_limit)
+@validate_json('MechanicLogin')
 def mechanic_login():
     """Mechanic login endpoint with comprehensive error handling"""
     try:
-        # Validate request has JSON
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
 
-        # Validate required fields
-        if not data:
-            return jsonify({
-                "success": False,
-                "error": "No data provided"
-            }), 400
-
-        if not data.get('email') or not data.get('password'):
-            return jsonify({
-                "success": False,
-                "error": "Email and password are required"
-            }), 400
-
         # Find mechanic
         mechanic = Mechanic.query.filter_by(email=data['email']).first()
 
@@ -0,0 +1 @@
+# Blueprint package
@@ -0,0 +1,39 @@
+"""
+Batch Routes - several API calls in one round trip
+"""
+from flask import Blueprint, request, jsonify, current_app
+from app.utils.request_validation import validate_json
+
+batch_bp = Blueprint('batch', __name__)
+
+@batch_bp.route('', methods=['POST'])
+@validate_json('BatchRequest')
+def run_batch():
+    """Run a list of API calls and return all their results - auth per call"""
+    data = request.get_json()
+    operations = data['requests']
+
+    limit = current_app.config.get('BATCH_MAX_REQUESTS', 20)
+    if len(operations) > limit:
+        return jsonify({
+            "success": False,
+            "error": f"A batch may contain at most {limit} requests"
+        }), 400
+
+    for index, operation in enumerate(operations):
+        path = operation['path']
+        if not path.startswith('/') or path.split('?')[0].rstrip('/') == request.path.rstrip('/'):
+            return jsonify({
+                "success": False,
+                "error": "Invalid batch request",
+                "details": {f"requests[{index}].path": "must be an API path other than /batch"}
+            }), 400
+
+    responses = current_app.extensions['batch'].run(operations, parallel=data.get('parallel', False))
+    return jsonify({
+        "success": True,
+        "data": {
+            "responses": responses,
+            "count": len(responses)
+        }
+    }), 200
@@ -5,32 +5,21 @@ from flask import Blueprint, request, jsonify
 from app.models.customer import Customer
 from app.models.service_ticket import ServiceTicket
 from app.utils.auth import token_required, mechanic_token_required
+from app.utils.request_validation import validate_json
+from app.utils.ticket_json import ticket_list_response
+from app.utils.ticket_sideload import compact_ticket_list, wants_compact
+from app.utils.multi_get import CUSTOMERS, multi_get_response, wants_multi_get
 from app import db
 
 customers_bp = Blueprint('customers', __name__)
 
 @customers_bp.route('/register', methods=['POST'])
+@validate_json('CustomerRegister')
 def register_customer():
     """Create a new customer - No auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['first_name', 'last_name', 'email', 'password']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        
-        if missing_fields:
-            return jsonify({
-                "success": False,
-                "error": f"Missing required fields: {', '.join(missing_fields)}"
-            }), 400
-
         # Check if email already exists
         if Customer.query.filter_by(email=data['email']).first():
             return jsonify({
@@ -68,8 +57,11 @@ def register_customer():
 @customers_bp.route('/', methods=['GET'])
 @mechanic_token_required  # Only mechanics can view all customers
 def get_all_customers(current_mechanic_id):
-    """Get all customers with pagination - Mechanic auth required"""
+    """Get all customers with pagination (or ?ids=1,2,3) - Mechanic auth required"""
     try:
+        if wants_multi_get():
+            return multi_get_response(CUSTOMERS)
+
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
 
@@ -135,6 +127,7 @@ def get_customer(current_customer_id, customer_id):
 
 @customers_bp.route('/<int:customer_id>', methods=['PUT'])
 @token_required
+@validate_json('CustomerUpdate')
 def update_customer(current_customer_id, customer_id):
     """Update a customer - Customer auth required (own profile only)"""
     try:
@@ -145,12 +138,6 @@ def update_customer(current_customer_id, customer_id):
                 "error": "Unauthorized to update this customer"
             }), 403
 
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({
@@ -243,8 +230,21 @@ def get_my_tickets(current_customer_id):
                 "error": "Customer not found"
             }), 404
 
+        if wants_compact():
+            data, included = compact_ticket_list(customer_id=current_customer_id)
+            return jsonify({
+                "success": True,
+                "data": data,
+                "included": included
+            }), 200
+        
+        response = ticket_list_response(customer_id=current_customer_id)
+        if response is not None:
+            return response
+        
         # Get customer's tickets with proper error handling
-        tickets = ServiceTicket.query.filter_by(customer_id=current_customer_id).all()
+        tickets = ServiceTicket.with_relations().filter_by(customer_id=current_customer_id).\
+            order_by(ServiceTicket.id).all()
         
         return jsonify({
             "success": True,
@@ -4,14 +4,21 @@ Inventory Routes - Fixed endpoints
 from flask import Blueprint, request, jsonify
 from app.models.inventory import Inventory
 from app.utils.auth import mechanic_token_required
+from app.utils.request_validation import validate_json
+from app.utils.response_cache import cached_response, invalidate_on_commit
+from app.utils.multi_get import INVENTORY, multi_get_response, wants_multi_get
+from app.utils.webhooks import emit_event, stock_payload
 from app import db
 
 inventory_bp = Blueprint('inventory', __name__)
 
 @inventory_bp.route('/', methods=['GET'])
+@cached_response('inventory:*')
 def get_inventory():
-    """Get all inventory items - No auth required"""
+    """Get all inventory items (or ?ids=1,2,3) - No auth required"""
     try:
+        if wants_multi_get():
+            return multi_get_response(INVENTORY)
         inventory_items = Inventory.query.all()
         return jsonify({
             "success": True,
@@ -30,27 +37,12 @@ def get_inventory():
 
 @inventory_bp.route('/', methods=['POST'])
 @mechanic_token_required
+@validate_json('InventoryCreate')
 def create_inventory_item(current_mechanic_id):
     """Create a new inventory item - Mechanic auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['part_name', 'price']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        
-        if missing_fields:
-            return jsonify({
-                "success": False,
-                "error": f"Missing required fields: {', '.join(missing_fields)}"
-            }), 400
-
         # Create inventory item
         inventory = Inventory(
             part_name=data['part_name'],
@@ -64,6 +56,9 @@ def create_inventory_item(current_mechanic_id):
         )
 
         db.session.add(inventory)
+        if inventory.quantity:
+            emit_event('inventory.stock_changed', stock_payload, inventory, 0, 'created')
+        invalidate_on_commit('inventory:*')
         db.session.commit()
 
         return jsonify({
@@ -81,6 +76,7 @@ def create_inventory_item(current_mechanic_id):
         }), 500
 
 @inventory_bp.route('/<int:item_id>', methods=['GET'])
+@cached_response('inventory:{item_id}')
 def get_inventory_item(item_id):
     """Get a specific inventory item by ID - No auth required"""
     try:
@@ -105,15 +101,10 @@ def get_inventory_item(item_id):
 
 @inventory_bp.route('/<int:item_id>', methods=['PUT'])
 @mechanic_token_required
+@validate_json('InventoryUpdate')
 def update_inventory_item(current_mechanic_id, item_id):
     """Update an inventory item - Mechanic auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         item = db.session.get(Inventory, item_id)
         if not item:
             return jsonify({
@@ -126,10 +117,14 @@ def update_inventory_item(current_mechanic_id, item_id):
         # Update fields if provided
         updatable_fields = ['part_name', 'part_number', 'description', 'quantity', 
                            'price', 'category', 'supplier', 'min_stock_level']
+        previous_quantity = item.quantity
         for field in updatable_fields:
             if field in data:
                 setattr(item, field, data[field])
 
+        if item.quantity != previous_quantity:
+            emit_event('inventory.stock_changed', stock_payload, item, previous_quantity, 'adjusted')
+        invalidate_on_commit(f'inventory:{item_id}', 'inventory:*')
         db.session.commit()
 
         return jsonify({
@@ -159,6 +154,7 @@ def delete_inventory_item(current_mechanic_id, item_id):
             }), 404
 
         db.session.delete(item)
+        invalidate_on_commit(f'inventory:{item_id}', 'inventory:*')
         db.session.commit()
 
         return jsonify({
@@ -186,7 +182,11 @@ def archive_inventory_item(current_mechanic_id, item_id):
                 "error": "Inventory item not found"
             }), 404
 
+        previous_quantity = item.quantity
         item.quantity = 0
+        if previous_quantity:
+            emit_event('inventory.stock_changed', stock_payload, item, previous_quantity, 'archived')
+        invalidate_on_commit(f'inventory:{item_id}', 'inventory:*')
         db.session.commit()
 
         return jsonify({
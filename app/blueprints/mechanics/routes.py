@@ -5,14 +5,21 @@ from flask import Blueprint, request, jsonify
 from app.models.mechanic import Mechanic
 from app.models.service_ticket import ServiceTicket
 from app.utils.auth import mechanic_token_required
+from app.utils.request_validation import validate_json
+from app.utils.response_cache import cached_response, invalidate_on_commit
+from app.utils.multi_get import MECHANICS, multi_get_response, wants_multi_get
+from app.extensions import service_mechanic
 from app import db
 
 mechanics_bp = Blueprint('mechanics', __name__)
 
 @mechanics_bp.route('/', methods=['GET'])
+@cached_response('mechanics:*')
 def get_mechanics():
-    """Get all mechanics - No auth required"""
+    """Get all mechanics (or ?ids=1,2,3) - No auth required"""
     try:
+        if wants_multi_get():
+            return multi_get_response(MECHANICS)
         mechanics = Mechanic.query.all()
         return jsonify({
             "success": True,
@@ -30,27 +37,12 @@ def get_mechanics():
         }), 500
 
 @mechanics_bp.route('/register', methods=['POST'])
+@validate_json('MechanicRegister')
 def create_mechanic():
     """Create a new mechanic - No auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['first_name', 'last_name', 'email', 'password']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        
-        if missing_fields:
-            return jsonify({
-                "success": False,
-                "error": f"Missing required fields: {', '.join(missing_fields)}"
-            }), 400
-        
         # Check if email already exists
         if Mechanic.query.filter_by(email=data['email']).first():
             return jsonify({
@@ -70,6 +62,7 @@ def create_mechanic():
         mechanic.set_password(data['password'])
         
         db.session.add(mechanic)
+        invalidate_on_commit('mechanics:*')
         db.session.commit()
         
         return jsonify({
@@ -87,6 +80,7 @@ def create_mechanic():
         }), 500
 
 @mechanics_bp.route('/<int:mechanic_id>', methods=['GET'])
+@cached_response('mechanics:{mechanic_id}')
 def get_mechanic(mechanic_id):
     """Get a specific mechanic by ID - No auth required"""
     try:
@@ -111,6 +105,7 @@ def get_mechanic(mechanic_id):
 
 @mechanics_bp.route('/<int:mechanic_id>', methods=['PUT'])
 @mechanic_token_required
+@validate_json('MechanicUpdate')
 def update_mechanic(current_mechanic_id, mechanic_id):
     """Update a mechanic - Mechanic auth required"""
     try:
@@ -121,12 +116,6 @@ def update_mechanic(current_mechanic_id, mechanic_id):
                 "error": "Unauthorized to update this mechanic"
             }), 403
 
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         mechanic = db.session.get(Mechanic, mechanic_id)
         if not mechanic:
             return jsonify({
@@ -157,6 +146,7 @@ def update_mechanic(current_mechanic_id, mechanic_id):
         if 'password' in data:
             mechanic.set_password(data['password'])
         
+        invalidate_on_commit(f'mechanics:{mechanic_id}', 'mechanics:*')
         db.session.commit()
         
         return jsonify({
@@ -193,6 +183,7 @@ def delete_mechanic(current_mechanic_id, mechanic_id):
             }), 404
         
         db.session.delete(mechanic)
+        invalidate_on_commit(f'mechanics:{mechanic_id}', 'mechanics:*')
         db.session.commit()
         
         return jsonify({
@@ -209,14 +200,19 @@ def delete_mechanic(current_mechanic_id, mechanic_id):
         }), 500
 
 @mechanics_bp.route('/ranking', methods=['GET'])
+@cached_response('mechanics:*', 'mechanics:ranking')
 def get_mechanics_ranking():
     """Get mechanics ranked by number of assigned service tickets - No auth required"""
     try:
-        mechanics = Mechanic.query.all()
+        # Count assignments in the same query instead of loading every
+        # mechanic's tickets one mechanic at a time
+        ticket_counts = db.func.count(service_mechanic.c.service_ticket_id)
+        rows = db.session.query(Mechanic, ticket_counts).\
+            outerjoin(service_mechanic, service_mechanic.c.mechanic_id == Mechanic.id).\
+            group_by(Mechanic.id).order_by(Mechanic.id).all()
         
         ranking = []
-        for mechanic in mechanics:
-            ticket_count = len(mechanic.service_tickets) if hasattr(mechanic, 'service_tickets') else 0
+        for mechanic, ticket_count in rows:
             ranking.append({
                 'id': mechanic.id,
                 'name': f"{mechanic.first_name} {mechanic.last_name}",
@@ -254,7 +250,9 @@ def get_mechanic_tickets(mechanic_id):
                 "error": "Mechanic not found"
             }), 404
         
-        tickets = mechanic.service_tickets if hasattr(mechanic, 'service_tickets') else []
+        tickets = ServiceTicket.with_relations().\
+            filter(ServiceTicket.mechanics.any(Mechanic.id == mechanic_id)).\
+            order_by(ServiceTicket.id).all()
         return jsonify({
             "success": True,
             "data": {
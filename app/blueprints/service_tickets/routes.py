@@ -7,33 +7,25 @@ from app.models.customer import Customer
 from app.models.mechanic import Mechanic
 from app.models.inventory import Inventory
 from app.utils.auth import token_required, mechanic_token_required
+from app.utils.request_validation import validate_json
+from app.utils.ticket_json import ticket_list_response
+from app.utils.ticket_sideload import compact_ticket_list, wants_compact
+from app.utils.response_cache import invalidate_on_commit
+from app.utils.idempotency import idempotent
+from app.utils.webhooks import emit_event, stock_payload, ticket_payload
 from app import db
 
 service_tickets_bp = Blueprint('service_tickets', __name__)
 
 @service_tickets_bp.route('/', methods=['POST'])
 @token_required
+@idempotent
+@validate_json('ServiceTicketCreate')
 def create_service_ticket(current_customer_id):
     """Create a new service ticket - Customer auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['vehicle_info', 'issue_description']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        
-        if missing_fields:
-            return jsonify({
-                "success": False,
-                "error": f"Missing required fields: {', '.join(missing_fields)}"
-            }), 400
-
         # Create service ticket with authenticated customer's ID
         ticket = ServiceTicket(
             customer_id=current_customer_id,  # Use authenticated customer's ID
@@ -45,6 +37,7 @@ def create_service_ticket(current_customer_id):
         )
 
         db.session.add(ticket)
+        emit_event('ticket.created', ticket_payload, ticket)
         db.session.commit()
 
         return jsonify({
@@ -69,14 +62,25 @@ def get_all_service_tickets(_current_mechanic_id):
         status = request.args.get('status')
         priority = request.args.get('priority')
         
-        query = ServiceTicket.query
-        
+        filters = {}
         if status:
-            query = query.filter_by(status=status)
+            filters['status'] = status
         if priority:
-            query = query.filter_by(priority=priority)
+            filters['priority'] = priority
+        
+        if wants_compact():
+            data, included = compact_ticket_list(**filters)
+            return jsonify({
+                "success": True,
+                "data": data,
+                "included": included
+            }), 200
         
-        tickets = query.all()
+        response = ticket_list_response(**filters)
+        if response is not None:
+            return response
+        
+        tickets = ServiceTicket.with_relations().filter_by(**filters).order_by(ServiceTicket.id).all()
         
         return jsonify({
             "success": True,
@@ -126,15 +130,10 @@ def get_service_ticket(current_customer_id, ticket_id):
 
 @service_tickets_bp.route('/<int:ticket_id>', methods=['PUT'])
 @token_required
+@validate_json('ServiceTicketUpdate')
 def update_service_ticket(current_customer_id, ticket_id):
     """Update a service ticket - Customer auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         ticket = db.session.get(ServiceTicket, ticket_id)
         if not ticket:
             return jsonify({
@@ -155,10 +154,13 @@ def update_service_ticket(current_customer_id, ticket_id):
         updatable_fields = ['vehicle_info', 'issue_description', 'status', 'priority', 
                            'estimated_hours', 'total_cost']
         
+        previous_status = ticket.status
         for field in updatable_fields:
             if field in data:
                 setattr(ticket, field, data[field])
 
+        if ticket.status != previous_status:
+            emit_event('ticket.status_changed', ticket_payload, ticket, previous_status)
         db.session.commit()
 
         return jsonify({
@@ -188,6 +190,8 @@ def delete_service_ticket(current_mechanic_id, ticket_id):
             }), 404
 
         db.session.delete(ticket)
+        # Assignments go with the ticket, which changes the ranking
+        invalidate_on_commit('mechanics:ranking')
         db.session.commit()
 
         return jsonify({
@@ -208,7 +212,20 @@ def delete_service_ticket(current_mechanic_id, ticket_id):
 def get_my_tickets(current_customer_id):
     """Get the current customer's service tickets - Customer auth required"""
     try:
-        tickets = ServiceTicket.query.filter_by(customer_id=current_customer_id).all()
+        if wants_compact():
+            data, included = compact_ticket_list(customer_id=current_customer_id)
+            return jsonify({
+                "success": True,
+                "data": data,
+                "included": included
+            }), 200
+        
+        response = ticket_list_response(customer_id=current_customer_id)
+        if response is not None:
+            return response
+        
+        tickets = ServiceTicket.with_relations().filter_by(customer_id=current_customer_id).\
+            order_by(ServiceTicket.id).all()
         
         return jsonify({
             "success": True,
@@ -227,15 +244,11 @@ def get_my_tickets(current_customer_id):
 
 @service_tickets_bp.route('/<int:ticket_id>/assign-mechanic', methods=['POST'])
 @mechanic_token_required
+@idempotent
+@validate_json('TicketMechanicAssign')
 def assign_mechanic_to_ticket(current_mechanic_id, ticket_id):
     """Assign a mechanic to a service ticket - Mechanic auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         ticket = db.session.get(ServiceTicket, ticket_id)
         if not ticket:
             return jsonify({
@@ -274,6 +287,7 @@ def assign_mechanic_to_ticket(current_mechanic_id, ticket_id):
 
         if not exists:
             ticket.mechanics.append(mechanic)
+            invalidate_on_commit('mechanics:ranking')
             db.session.commit()
 
         return jsonify({
@@ -292,15 +306,11 @@ def assign_mechanic_to_ticket(current_mechanic_id, ticket_id):
 
 @service_tickets_bp.route('/<int:ticket_id>/add-part', methods=['POST'])
 @mechanic_token_required
+@idempotent
+@validate_json('TicketPartAdd')
 def add_part_to_ticket(current_mechanic_id, ticket_id):
     """Add an inventory part to a service ticket - Mechanic auth required"""
     try:
-        if not request.is_json:
-            return jsonify({
-                "success": False,
-                "error": "Missing JSON in request"
-            }), 400
-
         ticket = db.session.get(ServiceTicket, ticket_id)
         if not ticket:
             return jsonify({
@@ -312,12 +322,6 @@ def add_part_to_ticket(current_mechanic_id, ticket_id):
         part_id = data.get('part_id')
         quantity = data.get('quantity', 1)
 
-        if not part_id:
-            return jsonify({
-                "success": False,
-                "error": "part_id is required"
-            }), 400
-
         part = db.session.get(Inventory, part_id)
         if not part:
             return jsonify({
@@ -359,11 +363,14 @@ def add_part_to_ticket(current_mechanic_id, ticket_id):
             ticket.inventory.append(part)
             
             # Update inventory quantity
+            previous_quantity = part.quantity
             part.quantity -= quantity
+            emit_event('inventory.stock_changed', stock_payload, part, previous_quantity, 'used', ticket.id)
             
             # Update ticket cost
             ticket.total_cost = (ticket.total_cost or 0) + (part.price * quantity)
             
+            invalidate_on_commit(f'inventory:{part.id}', 'inventory:*')
             db.session.commit()
 
         return jsonify({
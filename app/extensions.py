@@ -1,15 +1,19 @@
 import os
 import sys
 from flask_sqlalchemy import SQLAlchemy
-from flask_marshmallow import Marshmallow
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
-from flask_migrate import Migrate
+from app.utils import rate_limit_storage  # noqa: F401 - registers the mmap:// storage scheme
+from app.utils.lazy_extension import LazyExtension
+from app.utils.replicas import RoutingSession
 
-db = SQLAlchemy()
-ma = Marshmallow()
-migrate = Migrate()
+# RoutingSession sends reads to SQLALCHEMY_REPLICA_URIS when configured
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+# Only needed for schemas and the `flask db` commands: imported on first use
+ma = LazyExtension('flask_marshmallow', 'Marshmallow', 'flask-marshmallow')
+migrate = LazyExtension('flask_migrate', 'Migrate', 'migrate',
+                        cli_group=('db', 'Perform database migrations.'))
 
 # Junction tables for many-to-many relationships
 service_mechanic = db.Table('service_mechanic',
@@ -22,16 +26,17 @@ ticket_inventory = db.Table('ticket_inventory',
     db.Column('inventory_id', db.Integer, db.ForeignKey('inventory.id'))
 )
 
-# Initialize limiter with MEMORY storage for testing
+# Storage comes from RATELIMIT_STORAGE_URI so production workers can share
+# counters (mmap://) while tests keep using memory://
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri="memory://",
     default_limits=["200 per day", "50 per hour"],
     strategy="fixed-window",
     enabled=not os.getenv("TESTING"),
 )
 
-# Use SimpleCache for testing
-cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})
+# Backend comes from CACHE_TYPE: SimpleCache for dev/tests, the shared
+# SQLite cache (app.utils.shared_cache.SQLiteCache) in production
+cache = Cache()
 
 __all__ = ['db', 'ma', 'migrate', 'limiter', 'cache', 'service_mechanic', 'ticket_inventory']
\ No newline at end of file
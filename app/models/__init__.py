@@ -5,5 +5,10 @@ from app.models.customer import Customer
 from app.models.mechanic import Mechanic
 from app.models.service_ticket import ServiceTicket
 from app.models.inventory import Inventory
+from app.models.idempotency_key import IdempotencyKey
+from app.models.webhook_subscription import WebhookSubscription
+from app.models.webhook_event import WebhookEvent
+from app.models.webhook_delivery import WebhookDelivery
 
-__all__ = ['Customer', 'Mechanic', 'ServiceTicket', 'Inventory']
\ No newline at end of file
+__all__ = ['Customer', 'Mechanic', 'ServiceTicket', 'Inventory', 'IdempotencyKey',
+           'WebhookSubscription', 'WebhookEvent', 'WebhookDelivery']
\ No newline at end of file
@@ -6,6 +6,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 from datetime import datetime, timezone, timedelta
 from config import Config
+from app.utils.serializers import serializer_for
 
 class Customer(db.Model):
     """Customer model for automotive shop customers"""
@@ -20,7 +21,8 @@ class Customer(db.Model):
     phone = db.Column(db.String(20))
     address = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    
+
+    __serialize_exclude__ = ('password_hash',)
 
     def set_password(self, password):
         """Set hashed password"""
@@ -41,15 +43,7 @@ class Customer(db.Model):
 
     def to_dict(self):
         """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'phone': self.phone,
-            'address': self.address,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return serializer_for(Customer).one(self)
 
     def __repr__(self):
         return f'<Customer {self.email}>'
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Idempotency Key Model
+"""
+from app import db
+
+class IdempotencyKey(db.Model):
+    """The stored response for one Idempotency-Key (see app/utils/idempotency.py)"""
+
+    __tablename__ = 'idempotency_key'
+
+    # sha256 of the client (customer or mechanic id), method, path and key
+    key = db.Column(db.String(64), primary_key=True)
+    # sha256 of the request body, to reject a key reused for another request
+    fingerprint = db.Column(db.String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code = db.Column(db.SmallInteger)
+    content_type = db.Column(db.String(100))
+    body = db.Column(db.LargeBinary)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key[:12]} {self.status_code}>'
@@ -2,6 +2,7 @@
 Inventory Model
 """
 from app import db
+from app.utils.serializers import serializer_for
 
 class Inventory(db.Model):
     """Inventory model for automotive parts"""
@@ -23,19 +24,7 @@ class Inventory(db.Model):
 
     def to_dict(self):
         """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'part_name': self.part_name,
-            'part_number': self.part_number,
-            'description': self.description,
-            'quantity': self.quantity,
-            'price': self.price,
-            'category': self.category,
-            'supplier': self.supplier,
-            'min_stock_level': self.min_stock_level,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return serializer_for(Inventory).one(self)
 
     def __repr__(self):
         return f'<Inventory {self.part_name}>'
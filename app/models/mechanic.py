@@ -6,6 +6,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 import datetime
 from config import Config
+from app.utils.serializers import serializer_for
 
 class Mechanic(db.Model):
     """Mechanic model for automotive shop mechanics"""
@@ -23,6 +24,8 @@ class Mechanic(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+    __serialize_exclude__ = ('password_hash',)
+
     def set_password(self, password):
         """Set hashed password"""
         self.password_hash = generate_password_hash(password)
@@ -54,17 +57,7 @@ class Mechanic(db.Model):
         
     def to_dict(self):
         """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'specialization': self.specialization,
-            'years_experience': self.years_experience,
-            'hourly_rate': self.hourly_rate,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return serializer_for(Mechanic).one(self)
 
     def __repr__(self):
         return f'<Mechanic {self.email}>'
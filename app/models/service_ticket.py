@@ -3,7 +3,7 @@ Service Ticket Model with Fixed Relationships
 """
 """Service Ticket Model with Fixed Relationships"""
 from app import db
-from collections.abc import Iterable
+from app.utils.serializers import serializer_for
 
 class ServiceTicket(db.Model):
     __tablename__ = 'service_ticket'
@@ -22,43 +22,22 @@ class ServiceTicket(db.Model):
 
     # Fixed relationships
     customer = db.relationship('Customer', backref=db.backref('service_tickets', lazy=True))
-    mechanics = db.relationship('Mechanic', secondary='service_mechanic', backref='service_tickets', lazy='select')
-    inventory = db.relationship('Inventory', secondary='ticket_inventory', backref='service_tickets', lazy='select')
+    mechanics = db.relationship('Mechanic', secondary='service_mechanic', backref='service_tickets', lazy='select',
+                                order_by='Mechanic.id')
+    inventory = db.relationship('Inventory', secondary='ticket_inventory', backref='service_tickets', lazy='select',
+                                order_by='Inventory.id')
 
-    def to_dict(self):
-        # Handle relationships that may be dynamic (query) or list-like
-        # Safely resolve relationship collections that may sometimes appear as RelationshipProperty
-        mech_attr = getattr(self, 'mechanics', [])
-        inv_attr = getattr(self, 'inventory', [])
-
-        # Normalize relationship collections to concrete lists without unsafe attribute checks
-        try:
-            from sqlalchemy.orm.query import Query  # SQLAlchemy Query (for lazy='dynamic')
-        except Exception:
-            Query = tuple()  # Fallback to avoid import issues
+    __serialize_nested__ = ('mechanics', 'inventory')
 
-        def to_list(attr):
-            # If it's a SQLAlchemy Query, fetch results with .all()
-            if 'Query' in str(type(attr)) or (Query and isinstance(attr, Query)):
-                return attr.all()
-            # If it's already iterable (e.g., list, InstrumentedList), cast to list
-            return list(attr) if isinstance(attr, Iterable) else []
+    @classmethod
+    def with_relations(cls):
+        """Query that loads mechanics and parts up front (no per-row queries in to_dict)"""
+        return cls.query.options(
+            db.selectinload(cls.mechanics),
+            db.selectinload(cls.inventory),
+        )
 
-        mechanics_list = to_list(mech_attr)
-        inventory_list = to_list(inv_attr)
-
-        return {
-            'id': self.id,
-            'customer_id': self.customer_id,
-            'vehicle_info': self.vehicle_info,
-            'issue_description': self.issue_description,
-            'status': self.status,
-            'priority': self.priority,
-            'estimated_hours': self.estimated_hours,
-            'total_cost': self.total_cost,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'mechanics': [m.to_dict() for m in mechanics_list] if mechanics_list else [],
-            'inventory': [i.to_dict() for i in inventory_list] if inventory_list else []
-        }
+    def to_dict(self):
+        """Convert to dictionary, with the assigned mechanics and parts"""
+        return serializer_for(ServiceTicket).one(self)
     
@@ -0,0 +1,25 @@
+"""
+Webhook Delivery Model
+"""
+from app import db
+
+class WebhookDelivery(db.Model):
+    """One event to one subscription, with its retry state"""
+
+    __tablename__ = 'webhook_delivery'
+    __table_args__ = (
+        db.Index('ix_webhook_delivery_due', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subscription_id = db.Column(db.Integer, db.ForeignKey('webhook_subscription.id', ondelete='CASCADE'),
+                                nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('webhook_event.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, delivered, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_error = db.Column(db.String(500))
+    delivered_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<WebhookDelivery {self.event_id} -> {self.subscription_id} {self.status}>'
@@ -0,0 +1,19 @@
+"""
+Webhook Event Model
+"""
+from app import db
+
+class WebhookEvent(db.Model):
+    """Outbox row written in the same transaction as the change it describes"""
+
+    __tablename__ = 'webhook_event'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, nullable=False)
+    # Set once the worker has created a delivery per matching subscription
+    dispatched = db.Column(db.Boolean, nullable=False, default=False, index=True)
+
+    def __repr__(self):
+        return f'<WebhookEvent {self.id} {self.event_type}>'
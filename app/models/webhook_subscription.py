@@ -0,0 +1,33 @@
+"""
+Webhook Subscription Model
+"""
+from fnmatch import fnmatchcase
+
+from app import db
+from app.utils.serializers import serializer_for
+
+class WebhookSubscription(db.Model):
+    """An endpoint that receives webhook events (see app/utils/webhooks.py)"""
+
+    __tablename__ = 'webhook_subscription'
+    __serialize_exclude__ = ('secret',)
+
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), nullable=False)
+    # HMAC-SHA256 key for the X-Webhook-Signature header
+    secret = db.Column(db.String(128), nullable=False)
+    # Comma-separated event types; shell-style patterns like ticket.* allowed
+    events = db.Column(db.String(500), nullable=False, default='*')
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def wants(self, event_type):
+        """Whether ``event_type`` matches one of this subscription's patterns"""
+        return any(fnmatchcase(event_type, pattern.strip()) for pattern in self.events.split(','))
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return serializer_for(WebhookSubscription).one(self)
+
+    def __repr__(self):
+        return f'<WebhookSubscription {self.url}>'
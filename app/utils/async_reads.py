@@ -0,0 +1,230 @@
+"""
+ASGI application with async hot reads in front of the Flask app
+
+``asgi.py`` serves the API through :func:`create_asgi_app`. The hottest
+read-only endpoints are answered on the event loop with an async
+SQLAlchemy engine (aiosqlite for SQLite, asyncpg for PostgreSQL):
+
+* ``GET /tickets/``   - mechanic token; ``status``, ``priority``, ``compact``
+* ``GET /inventory/``  - ``ids``
+* ``GET /mechanics/``  - ``ids``
+
+A slow query then waits on the loop instead of pinning a worker thread,
+so one worker holds as many of these requests as its connection pool
+allows. Every other request - writes, logins, docs, ``/metrics`` - goes to
+the Flask app through asgiref's ``WsgiToAsgi``, on a thread as before.
+
+The async endpoints return the same payloads, token checks and error
+bodies as the Flask views, encoded by the app's JSON provider and
+compressed like the Flask hook does. When rate limiting is enabled they
+are counted against Flask-Limiter's limits first, inside a Flask request
+context for the same URL, so they share the Flask views' counters and
+429 response. They skip the rest of what is tied to a Flask request: the
+response cache, the query-count headers, profiling and the ``/metrics``
+histograms.
+
+The async URL is derived from ``SQLALCHEMY_DATABASE_URI`` unless
+``ASYNC_DATABASE_URL`` is set. Pool sizing follows the ``DB_POOL_*``
+settings. In-memory SQLite cannot be shared with a second engine, so it
+is rejected. The async engine always reads from the primary:
+``SQLALCHEMY_REPLICA_URIS`` only applies to the Flask app's session.
+"""
+import io
+
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import TooManyRequests
+from werkzeug.http import parse_accept_header
+
+from app.models import Inventory, Mechanic
+from app.utils.auth import check_token
+from app.utils.compression import compress, negotiate
+from app.utils.db_pool import engine_options
+from app.utils.multi_get import INVENTORY, MECHANICS, parse_ids, wants_multi_get
+from app.utils.serializers import serializer_for
+from app.utils.ticket_sideload import TicketListQuery, wants_compact
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def async_database_url(url):
+    """The async-driver URL for a sync database URL"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == 'postgres':  # the scheme Heroku-style providers hand out
+        backend = 'postgresql'
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for {backend} databases")
+    if backend == 'sqlite' and url.database in (None, '', ':memory:'):
+        raise ValueError("An in-memory SQLite database cannot be shared with the async engine")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def async_engine_options(config):
+    """``engine_options()`` for an async engine"""
+    options = engine_options(config)
+    # InstrumentedQueuePool is sync-only; async engines default to AsyncAdaptedQueuePool
+    options.pop('poolclass', None)
+    return options
+
+
+class _Request:
+    """The parts of an ASGI HTTP scope the handlers read"""
+
+    def __init__(self, scope):
+        query = scope.get('query_string', b'').decode('latin-1')
+        self.args = MultiDict(parse_qsl(query, keep_blank_values=True))
+        self.headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+
+
+class AsyncReadApp:
+    """ASGI app: the async read endpoints, and the Flask app for everything else"""
+
+    def __init__(self, flask_app, engine):
+        self.flask_app = flask_app
+        self.engine = engine
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.routes = {
+            '/tickets/': self.tickets,
+            '/inventory/': self.inventory,
+            '/mechanics/': self.mechanics,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        handler = None
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            handler = self.routes.get(scope['path'])
+        if handler is None:
+            await self.wsgi(scope, receive, send)
+            return
+
+        limited = self._rate_limit(scope)
+        if limited is not None:
+            await self._send_response(send, limited)
+            return
+
+        request = _Request(scope)
+        try:
+            payload, status = await handler(request)
+        except Exception as e:
+            payload, status = {
+                "success": False,
+                "error": "Internal server error",
+                "details": str(e)
+            }, 500
+        await self._send_json(send, request, payload, status)
+
+    def _rate_limit(self, scope):
+        """Apply Flask-Limiter's limits to the request: the 429 response, or None"""
+        limiters = [limiter for limiter in self.flask_app.extensions.get('limiter', ()) if limiter.enabled]
+        if not limiters:
+            return None
+        environ_builder = WsgiToAsgiInstance(self.flask_app)
+        environ_builder.scope = scope
+        environ = environ_builder.build_environ(scope, io.BytesIO())
+        with self.flask_app.request_context(environ):
+            try:
+                for limiter in limiters:
+                    # the check Flask-Limiter registers as a before_request hook
+                    limiter._check_request_limit()
+            except TooManyRequests as e:
+                return self.flask_app.finalize_request(self.flask_app.handle_user_exception(e),
+                                                       from_error_handler=True)
+        return None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _send_json(self, send, request, payload, status):
+        body = self.flask_app.json.body(payload)
+        headers = [(b'content-type', self.flask_app.json.mimetype.encode('latin-1'))]
+        compressor = self.flask_app.extensions.get('compression')
+        if compressor is not None:
+            headers.append((b'vary', b'Accept-Encoding'))
+            encoding = negotiate(parse_accept_header(request.headers.get('accept-encoding')))
+            if encoding is not None and len(body) >= compressor.min_size:
+                level = compressor.br_quality if encoding == 'br' else compressor.gzip_level
+                body = compress(body, encoding, level)
+                headers.append((b'content-encoding', encoding.encode('latin-1')))
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _send_response(self, send, response):
+        """Send a Flask response object"""
+        body = response.get_data()
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                   for name, value in response.headers.items()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _rows(self, *statements):
+        """Row lists for ``statements``, run in order on one connection"""
+        async with self.engine.connect() as conn:
+            return [(await conn.execute(statement)).all() for statement in statements]
+
+    async def tickets(self, request):
+        """``GET /tickets/`` - the ``get_all_service_tickets`` view"""
+        _mechanic_id, error, status = check_token(request.headers.get('authorization'), 'mechanic')
+        if error is not None:
+            return error, status
+        filters = {name: request.args[name] for name in ('status', 'priority') if request.args.get(name)}
+        query = TicketListQuery(**filters)
+        results = await self._rows(*query.statements)
+        if wants_compact(request.args):
+            data, included = query.compact(results)
+            return {"success": True, "data": data, "included": included}, 200
+        return {"success": True, "data": query.embedded(results)}, 200
+
+    async def inventory(self, request):
+        """``GET /inventory/`` - the ``get_inventory`` view"""
+        if wants_multi_get(request.args):
+            return await self._multi_get(request, INVENTORY)
+        return await self._list(Inventory, 'inventory')
+
+    async def mechanics(self, request):
+        """``GET /mechanics/`` - the ``get_mechanics`` view"""
+        if wants_multi_get(request.args):
+            return await self._multi_get(request, MECHANICS)
+        return await self._list(Mechanic, 'mechanics')
+
+    async def _multi_get(self, request, multi_get):
+        ids, error, status = parse_ids(request.args.getlist('ids'),
+                                       self.flask_app.config.get('MULTI_GET_MAX_IDS', 100))
+        if error is not None:
+            return error, status
+        rows, = await self._rows(multi_get.statement(ids))
+        return multi_get.payload(ids, rows), 200
+
+    async def _list(self, model, key):
+        serializer = serializer_for(model)
+        rows, = await self._rows(serializer.select())
+        items = serializer.rows(rows)
+        return {"success": True, "data": {key: items, "count": len(items)}}, 200
+
+
+def create_asgi_app(flask_app, engine=None):
+    """Wrap ``flask_app`` for an ASGI server, with its async read endpoints"""
+    if engine is None:
+        config = flask_app.config
+        url = config.get('ASYNC_DATABASE_URL') or async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+        engine = create_async_engine(url, **async_engine_options(config))
+        injector = flask_app.extensions.get('db_fault_injection')
+        if injector is not None:
+            # DB_FAULT_* latency applies here too (awaited, not slept)
+            injector.attach(engine.sync_engine)
+    return AsyncReadApp(flask_app, engine)
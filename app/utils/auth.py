@@ -3,7 +3,7 @@ Authentication utilities for Mechanics Shop API - FIXED for PyJWT
 """
 import os
 from functools import wraps
-from flask import request, jsonify
+from flask import g, has_app_context, request, jsonify
 import jwt  # Using PyJWT instead of python-jose
 from datetime import datetime, timezone
 
@@ -12,148 +12,127 @@ SECRET_KEY = os.environ.get("SECRET_KEY") or "super-secret-key-change-in-product
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-def token_required(f):
-    """Decorator for customer token authentication"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-
-        # Check if Authorization header exists
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return jsonify({
-                "success": False,
-                "error": "Authentication required",
-                "message": "No authorization header provided"
-            }), 401
-
-        # Validate Authorization header format
-        parts = auth_header.split()
-        
-        if len(parts) != 2:
-            return jsonify({
-                "success": False,
-                "error": "Invalid token format",
-                "message": "Use: Bearer <token>"
-            }), 401
-
-        if parts[0].lower() != 'bearer':
-            return jsonify({
-                "success": False,
-                "error": "Invalid token format", 
-                "message": "Use: Bearer <token>"
-            }), 401
-
-        token = parts[1]
+def decode_token(token):
+    """Decode and verify a JWT, raising ``jwt.InvalidTokenError`` subclasses.
 
+    Inside a ``POST /batch`` request each token is verified once, and the
+    result (or error) reused by every operation in the batch.
+    """
+    verified = g.get('_verified_tokens') if has_app_context() else None
+    if verified is None:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if token not in verified:
         try:
-            # Decode token using PyJWT
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            
-            # Check token type
-            if data.get('type') != 'customer':
-                return jsonify({
-                    "success": False,
-                    "error": "Invalid token type",
-                    "message": "Customer token required"
-                }), 403
-                
-            customer_id = data['customer_id']
-            
-        except jwt.ExpiredSignatureError:
-            return jsonify({
-                "success": False,
-                "error": "Token expired",
-                "message": "Please login again"
-            }), 401
-            
-        except jwt.InvalidTokenError:
-            return jsonify({
+            verified[token] = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.InvalidTokenError as e:
+            verified[token] = e
+    result = verified[token]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def mechanic_id_from_request():
+    """Return the mechanic id from a valid Bearer token, or None.
+
+    For features that are only unlocked (not required) by a mechanic token.
+    """
+    parts = (request.headers.get('Authorization') or '').split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
+        return None
+    try:
+        data = decode_token(parts[1])
+    except jwt.InvalidTokenError:
+        return None
+    if data.get('type') != 'mechanic':
+        return None
+    return data.get('mechanic_id')
+
+def check_token(auth_header, token_type):
+    """Validate an ``Authorization`` header value for a ``token_type`` token.
+
+    Returns ``(user_id, None, None)``, or ``(None, error_payload, status)``
+    for the caller to send back. Used by the decorators below and by the
+    ASGI read endpoints, which have no Flask request.
+    """
+    if not auth_header:
+        return None, {
+            "success": False,
+            "error": "Authentication required",
+            "message": "No authorization header provided"
+        }, 401
+
+    # Validate Authorization header format
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
+        return None, {
+            "success": False,
+            "error": "Invalid token format",
+            "message": "Use: Bearer <token>"
+        }, 401
+
+    try:
+        # Decode token using PyJWT
+        data = decode_token(parts[1])
+
+        # Check token type
+        if data.get('type') != token_type:
+            return None, {
                 "success": False,
-                "error": "Invalid token",
-                "message": "Token is invalid"
-            }), 401
-            
-        except Exception as e:
-            return jsonify({
-                "success": False,
-                "error": "Token validation failed",
-                "message": str(e)
-            }), 401
+                "error": "Invalid token type",
+                "message": f"{token_type.capitalize()} token required"
+            }, 403
+
+        user_id = data['customer_id'] if token_type == 'customer' else data.get('mechanic_id')
+
+    except jwt.ExpiredSignatureError:
+        return None, {
+            "success": False,
+            "error": "Token expired",
+            "message": "Please login again"
+        }, 401
+
+    except jwt.InvalidTokenError:
+        return None, {
+            "success": False,
+            "error": "Invalid token",
+            "message": "Token is invalid"
+        }, 401
+
+    except Exception as e:
+        return None, {
+            "success": False,
+            "error": "Token validation failed",
+            "message": str(e)
+        }, 401
+
+    return user_id, None, None
 
+def token_required(f):
+    """Decorator for customer token authentication
+
+    Sets ``g.auth_principal`` to ``('customer', customer_id)``.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        customer_id, error, status = check_token(request.headers.get('Authorization'), 'customer')
+        if error is not None:
+            return jsonify(error), status
+        g.auth_principal = ('customer', customer_id)
         return f(customer_id, *args, **kwargs)
 
     return decorated
 
 def mechanic_token_required(f):
-    """Decorator for mechanic token authentication"""
+    """Decorator for mechanic token authentication
+
+    Sets ``g.auth_principal`` to ``('mechanic', mechanic_id)``.
+    """
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-
-        # Check if Authorization header exists
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return jsonify({
-                "success": False,
-                "error": "Authentication required",
-                "message": "No authorization header provided"
-            }), 401
-
-        # Validate Authorization header format
-        parts = auth_header.split()
-        
-        if len(parts) != 2:
-            return jsonify({
-                "success": False,
-                "error": "Invalid token format",
-                "message": "Use: Bearer <token>"
-            }), 401
-
-        if parts[0].lower() != 'bearer':
-            return jsonify({
-                "success": False,
-                "error": "Invalid token format", 
-                "message": "Use: Bearer <token>"
-            }), 401
-
-        token = parts[1]
-
-        try:
-            # Decode token using PyJWT
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            
-            # Check token type and role
-            if data.get('type') != 'mechanic':
-                return jsonify({
-                    "success": False,
-                    "error": "Invalid token type",
-                    "message": "Mechanic token required"
-                }), 403
-                
-            mechanic_id = data.get('mechanic_id')
-            
-        except jwt.ExpiredSignatureError:
-            return jsonify({
-                "success": False,
-                "error": "Token expired",
-                "message": "Please login again"
-            }), 401
-            
-        except jwt.InvalidTokenError:
-            return jsonify({
-                "success": False,
-                "error": "Invalid token",
-                "message": "Token is invalid"
-            }), 401
-            
-        except Exception as e:
-            return jsonify({
-                "success": False,
-                "error": "Token validation failed",
-                "message": str(e)
-            }), 401
-
+        mechanic_id, error, status = check_token(request.headers.get('Authorization'), 'mechanic')
+        if error is not None:
+            return jsonify(error), status
+        g.auth_principal = ('mechanic', mechanic_id)
         return f(mechanic_id, *args, **kwargs)
 
-    return decorated
\ No newline at end of file
+    return decorated
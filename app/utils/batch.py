@@ -0,0 +1,156 @@
+"""
+Batched API calls for ``POST /batch``
+
+A batch is a list of operations - ``{"method", "path", "body", "headers",
+"id"}`` - dispatched through the app's own URL map inside the one HTTP
+request, with the usual request hooks, auth decorators and validation. A
+client opening a screen pays one round trip instead of one per call.
+
+* The batch's ``Authorization`` header is passed on to every operation (an
+  operation may send its own), and each token is verified once per batch
+  (see :func:`app.utils.auth.decode_token`).
+* Operations run in order in the batch request's app context, so they share
+  its database session. Each write commits on its own, as it would have
+  standalone: a batch is not a transaction.
+* With ``"parallel": true``, runs of consecutive GET operations are spread
+  over a small thread pool (``BATCH_MAX_WORKERS``), each in its own app
+  context and session, so their database round trips overlap. Writes are
+  never reordered, so a GET after a write in the same batch sees it.
+* Every operation gets a ``g`` of its own; the batch's query count and DB
+  time include the operations'.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g, request
+from sqlalchemy.pool import StaticPool
+from werkzeug.datastructures import Headers
+from werkzeug.test import EnvironBuilder
+
+# Passed from the batch request to every operation
+INHERITED_HEADERS = ('Authorization', 'Accept', 'User-Agent')
+# The batch response as a whole is compressed, not each operation
+DROPPED_HEADERS = frozenset(('accept-encoding', 'content-length', 'content-type', 'host'))
+
+
+class BatchRunner:
+    """Runs batch operations against ``app``, sequentially or on a thread pool"""
+
+    def __init__(self, app, max_workers=4):
+        self.app = app
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        # Started on first use: threads started in a preloading gunicorn
+        # master would not survive the fork into the workers
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='batch')
+        return self._executor
+
+    def environ(self, operation):
+        """WSGI environ for one operation, built from the batch request"""
+        headers = Headers()
+        for name in INHERITED_HEADERS:
+            if name in request.headers:
+                headers[name] = request.headers[name]
+        for name, value in (operation.get('headers') or {}).items():
+            if name.lower() not in DROPPED_HEADERS:
+                headers[name] = value
+        builder = EnvironBuilder(
+            path=operation['path'], method=operation['method'].upper(), headers=headers,
+            json=operation.get('body'), base_url=request.url_root,
+            environ_base={'REMOTE_ADDR': request.remote_addr},
+        )
+        try:
+            return builder.get_environ()
+        finally:
+            builder.close()
+
+    def dispatch(self, environ):
+        """``((status, body), queries, db_time)`` for one operation
+
+        Runs in the current app context with a fresh ``g`` - only the
+        batch's verified tokens carry over - and the caller's ``g`` is
+        restored afterwards.
+        """
+        from app import db
+
+        outer = dict(vars(g))
+        vars(g).clear()
+        if '_verified_tokens' in outer:
+            g._verified_tokens = outer['_verified_tokens']
+        try:
+            with self.app.request_context(environ):
+                try:
+                    response = self.app.full_dispatch_request()
+                except Exception as e:
+                    self.app.logger.exception("Batch operation %s %s failed",
+                                              request.method, request.full_path)
+                    db.session.rollback()
+                    response = self.app.make_response(({
+                        "success": False,
+                        "error": "Internal server error",
+                        "details": str(e)
+                    }, 500))
+                # Read streamed bodies while their request is still active
+                if response.is_json:
+                    body = response.get_json()
+                else:
+                    body = response.get_data(as_text=True)
+                result = (response.status_code, body)
+        finally:
+            inner = vars(g)
+            queries, db_time = inner.get('_db_queries', 0), inner.get('_db_time', 0.0)
+            inner.clear()
+            inner.update(outer)
+        return result, queries, db_time
+
+    def _dispatch_in_context(self, environ, verified_tokens):
+        with self.app.app_context():
+            g._verified_tokens = verified_tokens
+            return self.dispatch(environ)
+
+    def _concurrent(self):
+        # In-memory SQLite is one connection shared by every thread
+        from app import db
+        return not isinstance(db.engine.pool, StaticPool)
+
+    def run(self, operations, parallel=False):
+        """Run ``operations`` in order; a result per operation"""
+        g.setdefault('_verified_tokens', {})
+        environs = [self.environ(operation) for operation in operations]
+        concurrent = parallel and self._concurrent()
+        results = []
+        start = 0
+        while start < len(operations):
+            end = start + 1
+            if concurrent and operations[start]['method'].upper() == 'GET':
+                while end < len(operations) and operations[end]['method'].upper() == 'GET':
+                    end += 1
+            if end - start > 1:
+                futures = [self.executor.submit(self._dispatch_in_context, environ, g._verified_tokens)
+                           for environ in environs[start:end]]
+                outcomes = [future.result() for future in futures]
+            else:
+                outcomes = [self.dispatch(environs[start])]
+            for operation, ((status, body), queries, db_time) in zip(operations[start:end], outcomes):
+                g._db_queries = g.get('_db_queries', 0) + queries
+                g._db_time = g.get('_db_time', 0.0) + db_time
+                result = {"status": status, "body": body}
+                if 'id' in operation:
+                    result = {"id": operation['id'], **result}
+                results.append(result)
+            start = end
+        return results
+
+
+def init_batch(app):
+    """Create the runner behind ``POST /batch``"""
+    runner = BatchRunner(app, max_workers=app.config.get('BATCH_MAX_WORKERS', 4))
+    app.extensions['batch'] = runner
+    return runner
@@ -0,0 +1,224 @@
+"""
+gzip / brotli response compression
+
+Responses with a compressible content type are encoded with the best
+encoding the client accepts: brotli when the ``brotli`` package is installed
+and preferred by the client, otherwise gzip. Bodies under
+``COMPRESS_MIN_SIZE`` bytes are sent as is, since the encoding overhead
+outweighs the saving. Streamed (generator) responses are compressed chunk
+by chunk with a sync flush, so clients still receive data as it is produced.
+
+Static files (the swagger spec and the Swagger UI assets) are compressed
+once at the highest practical level and kept in memory; later requests are
+served from that copy with their own ETag. The app's static folder is
+compressed at startup. Blueprint assets such as the Swagger UI bundle are
+compressed on first request, so they do not slow down cold starts.
+"""
+import mimetypes
+import os
+import zlib
+
+from flask import request
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Python does not know YAML; without this the spec is served as
+# application/octet-stream and never compressed.
+mimetypes.add_type('application/yaml', '.yaml')
+mimetypes.add_type('application/yaml', '.yml')
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'application/yaml',
+    'application/x-yaml', 'application/xml', 'image/svg+xml',
+}
+STATIC_GZIP_LEVEL = 9
+STATIC_BR_QUALITY = 9
+SKIP_STATUS = {204, 206, 304}
+
+
+def compressible(mimetype):
+    if not mimetype:
+        return False
+    return mimetype.startswith('text/') or mimetype.endswith('+json') or mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate(accepted=None):
+    """The encoding to use for this request (or for a parsed
+    ``Accept-Encoding`` header, ``accepted``), or None"""
+    if accepted is None:
+        accepted = request.accept_encodings
+    br_quality = accepted.quality('br') if brotli else 0
+    gzip_quality = accepted.quality('gzip')
+    if br_quality and br_quality >= gzip_quality:
+        return 'br'
+    if gzip_quality:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level):
+    """Compress an iterable of byte chunks, flushing after each one"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def _tag_etag(response, encoding):
+    """A compressed representation must not share the identity ETag"""
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak=weak)
+
+
+class StaticCache:
+    """Compressed copies of static files, refreshed when a file changes"""
+
+    def __init__(self, min_size):
+        self.min_size = min_size
+        self.entries = {}
+
+    def get(self, path):
+        """``{'gzip': bytes, 'br': bytes?, ...}`` for ``path``, or None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self.entries.get(path)
+        if entry is not None and entry['stamp'] == (stat.st_mtime_ns, stat.st_size):
+            return entry
+        mimetype = mimetypes.guess_type(path)[0]
+        if not compressible(mimetype) or stat.st_size < self.min_size:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = {
+            'stamp': (stat.st_mtime_ns, stat.st_size),
+            'mimetype': mimetype,
+            'etag': f'{stat.st_mtime_ns:x}-{stat.st_size:x}-{zlib.adler32(data):x}',
+            'last_modified': stat.st_mtime,
+            'gzip': compress(data, 'gzip', STATIC_GZIP_LEVEL),
+        }
+        if brotli:
+            entry['br'] = compress(data, 'br', STATIC_BR_QUALITY)
+        self.entries[path] = entry
+        return entry
+
+    def warm(self, folder):
+        """Compress every eligible file under ``folder`` now"""
+        for root, _dirs, files in os.walk(folder):
+            for name in files:
+                self.get(os.path.join(root, name))
+
+
+class ResponseCompressor:
+    """before/after request hooks doing the actual work"""
+
+    def __init__(self, app):
+        self.app = app
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.gzip_level = app.config.get('COMPRESS_LEVEL', 6)
+        self.br_quality = app.config.get('COMPRESS_BR_QUALITY', 4)
+        self.static = StaticCache(self.min_size)
+        self.static_routes = {'static': (app.static_folder, 'filename')}
+
+    def register_static(self, endpoint, folder, argument='filename'):
+        """Serve ``endpoint``'s files (``folder`` / view arg) precompressed"""
+        self.static_routes[endpoint] = (folder, argument)
+
+    def _static_file(self):
+        route = self.static_routes.get(request.endpoint)
+        if route is None and (request.endpoint or '').endswith('.static'):
+            blueprint = self.app.blueprints.get(request.endpoint.rsplit('.', 1)[0])
+            route = (blueprint.static_folder, 'filename') if blueprint else None
+        if route is None or not route[0]:
+            return None
+        folder, argument = route
+        filename = (request.view_args or {}).get(argument)
+        return safe_join(folder, filename) if filename else None
+
+    def serve_static(self):
+        """Answer static file requests from the precompressed copies"""
+        if request.method not in ('GET', 'HEAD') or 'Range' in request.headers:
+            return None
+        path = self._static_file()
+        if not path:
+            return None
+        encoding = negotiate()
+        entry = self.static.get(path) if encoding else None
+        if entry is None or encoding not in entry:
+            return None
+
+        response = self.app.response_class(entry[encoding], mimetype=entry['mimetype'])
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f"{entry['etag']}-{encoding}")
+        response.last_modified = entry['last_modified']
+        max_age = self.app.get_send_file_max_age(path)
+        if max_age is not None:
+            response.cache_control.max_age = max_age
+            response.cache_control.public = True
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def after_request(self, response):
+        if not compressible(response.mimetype):
+            return response
+        response.vary.add('Accept-Encoding')
+        passthrough = response.direct_passthrough or 'Content-Encoding' in response.headers
+        if passthrough or request.method == 'HEAD' or response.status_code < 200 or response.status_code in SKIP_STATUS:
+            return response
+        encoding = negotiate()
+        if encoding is None:
+            return response
+        level = self.br_quality if encoding == 'br' else self.gzip_level
+
+        if response.is_streamed:
+            original = response.response
+            response.response = compress_stream(response.iter_encoded(), encoding, level)
+            if hasattr(original, 'close'):
+                response.call_on_close(original.close)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compress(data, encoding, level))
+        response.headers['Content-Encoding'] = encoding
+        _tag_etag(response, encoding)
+        return response
+
+
+def init_compression(app):
+    """Compress responses and precompress the static folder"""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return None
+    compressor = ResponseCompressor(app)
+    if app.static_folder and os.path.isdir(app.static_folder):
+        compressor.static.warm(app.static_folder)
+    app.extensions['compression'] = compressor
+    app.before_request(compressor.serve_static)
+    app.after_request(compressor.after_request)
+    return compressor
@@ -0,0 +1,152 @@
+"""
+Database connection pool configuration and live pool statistics
+
+``engine_options()`` turns the ``DB_POOL_*`` settings of a config class
+into ``SQLALCHEMY_ENGINE_OPTIONS``. Server databases get an
+:class:`InstrumentedQueuePool`, which records how long each checkout waited
+for a connection; ``pool_status()`` reports those numbers for the detailed
+``/health`` check.
+"""
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (milliseconds) of the checkout latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    """Counters and a checkout latency histogram for one engine"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.max_wait = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record_wait(self, seconds):
+        millis = seconds * 1000
+        index = bisect.bisect_left(LATENCY_BUCKETS_MS, millis)
+        with self._lock:
+            self.wait_time_total += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.bucket_counts[index] += 1
+
+    def incr(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def histogram(self):
+        """Cumulative bucket counts, Prometheus style"""
+        buckets, running = {}, 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + ('+Inf',), self.bucket_counts):
+            running += count
+            buckets[str(bound)] = running
+        return {
+            'buckets': buckets,
+            'count': running,
+            'sum_ms': round(self.wait_time_total * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection"""
+
+    stats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the running totals
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* config values"""
+    options = {
+        'pool_pre_ping': bool(config.get('DB_POOL_PRE_PING', True)),
+        'pool_recycle': int(config.get('DB_POOL_RECYCLE', -1)),
+    }
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    # In-memory SQLite must stay on the single shared connection
+    # Flask-SQLAlchemy gives it (StaticPool), so sizing doesn't apply.
+    if not _is_memory_sqlite(url):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=int(config.get('DB_POOL_SIZE', 5)),
+            max_overflow=int(config.get('DB_MAX_OVERFLOW', 10)),
+            pool_timeout=float(config.get('DB_POOL_TIMEOUT', 30)),
+        )
+    return options
+
+
+def init_pool_metrics(app, engine):
+    """Attach a PoolStats collector to the app's engine"""
+    stats = PoolStats()
+    app.extensions['pool_stats'] = stats
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.stats = stats
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        stats.incr('connects')
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.incr('checkouts')
+
+    @event.listens_for(engine, 'invalidate')
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.incr('invalidations')
+
+    return stats
+
+
+def pool_status(app, engine):
+    """Live pool occupancy plus the collected statistics"""
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    status.update(
+        recycle=pool._recycle,
+        pre_ping=pool._pre_ping,
+    )
+
+    stats = app.extensions.get('pool_stats')
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            connects=stats.connects,
+            invalidations=stats.invalidations,
+            wait_time_ms_total=round(stats.wait_time_total * 1000, 3),
+            max_wait_ms=round(stats.max_wait * 1000, 3),
+            checkout_latency_ms=stats.histogram(),
+        )
+    return status
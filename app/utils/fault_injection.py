@@ -0,0 +1,72 @@
+"""
+Artificial database latency for load and failure testing
+
+With ``DB_FAULT_LATENCY_MS`` set, every SQL statement sleeps that long (plus
+up to ``DB_FAULT_JITTER_MS`` of random jitter) before it reaches the driver,
+while holding its pooled connection. ``DB_FAULT_CONNECT_MS`` delays new
+connections the same way. Together they reproduce a slow or distant database
+locally, so pool exhaustion and ``DB_POOL_TIMEOUT`` behaviour can be tested
+with ``benchmarks/loadgen.py`` against SQLite. Both default to 0 (off).
+
+On an async engine the listeners run inside SQLAlchemy's greenlet bridge;
+there the delay is awaited (``asyncio.sleep``) rather than slept, so it
+holds the connection without blocking the event loop, like a slow query.
+"""
+import asyncio
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+
+def _sleep(seconds):
+    if in_greenlet():
+        await_only(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
+
+class LatencyInjector:
+    """Engine event listeners that sleep before statements and connects"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, connect_ms=0.0):
+        self.latency = float(latency_ms or 0) / 1000
+        self.jitter = float(jitter_ms or 0) / 1000
+        self.connect = float(connect_ms or 0) / 1000
+
+    def _delay(self):
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        _sleep(self._delay())
+
+    def on_connect(self, dbapi_connection, connection_record):
+        _sleep(self.connect)
+
+    def attach(self, engine):
+        if self.latency or self.jitter:
+            event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        if self.connect:
+            event.listen(engine, 'connect', self.on_connect)
+
+
+def init_fault_injection(app, *engines):
+    """Attach a :class:`LatencyInjector` to ``engines`` when configured"""
+    injector = LatencyInjector(
+        app.config.get('DB_FAULT_LATENCY_MS', 0),
+        app.config.get('DB_FAULT_JITTER_MS', 0),
+        app.config.get('DB_FAULT_CONNECT_MS', 0),
+    )
+    if not (injector.latency or injector.jitter or injector.connect):
+        return None
+    if not app.debug and not app.testing:
+        app.logger.warning(
+            "DB fault injection active: +%.0fms per statement, +%.0fms per connect",
+            injector.latency * 1000, injector.connect * 1000,
+        )
+    for engine in engines:
+        injector.attach(engine)
+    app.extensions['db_fault_injection'] = injector
+    return injector
@@ -0,0 +1,206 @@
+"""
+``Idempotency-Key`` support for retried POSTs
+
+Tablets on shop Wi-Fi retry a POST when the response is lost, and each
+retry used to create another ticket or take another part out of stock.
+Write routes decorated with :func:`idempotent` accept an
+``Idempotency-Key: <any unique string>`` header:
+
+* The first request with a key claims it by inserting an in-flight row in
+  ``idempotency_key`` (committed before the view runs), runs the view, and
+  stores the response status and body on that row.
+* A retry with the same key - from the same customer or mechanic (the
+  authenticated principal, not the token: a tablet that logs in again
+  before retrying still gets its first response), to the same method and
+  path - gets the stored response back
+  with ``Idempotent-Replayed: true``. The view and the models are not
+  touched.
+* A duplicate arriving while the first request is still running waits for
+  it (single flight: the row's primary key is the lock, so this holds
+  across workers) for up to ``IDEMPOTENCY_WAIT_SECONDS``, then replays its
+  response. If it is still running after that, the answer is a 409 with
+  ``Retry-After``.
+* Reusing a key with a different request body is a 422.
+
+Only responses below 500 are stored; after a server error, or an exception,
+the key is released so a retry runs the request again. An in-flight row
+older than ``IDEMPOTENCY_LOCK_SECONDS`` belongs to a request that died and
+is taken over. Stored responses expire after ``IDEMPOTENCY_TTL_SECONDS``
+(24 hours); ``flask purge-idempotency-keys`` deletes expired rows.
+Requests without the header are not affected.
+"""
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+import click
+from flask import current_app, g, jsonify, make_response, request
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+_table = IdempotencyKey.__table__
+
+
+def _utcnow():
+    # Naive UTC, like the other DateTime columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _client():
+    # Set by the auth decorators above this one; tokens expire and change
+    principal = g.get('auth_principal')
+    if principal is not None:
+        return '{}:{}'.format(*principal)
+    return request.headers.get('Authorization', '')
+
+
+def _request_key(value):
+    scope = '\n'.join((_client(), request.method, request.path, value))
+    return hashlib.sha256(scope.encode()).hexdigest()
+
+
+def _fingerprint():
+    return hashlib.sha256(request.get_data(cache=True)).hexdigest()
+
+
+class IdempotencyStore:
+    """Claims, stores and replays responses in the ``idempotency_key`` table"""
+
+    def __init__(self, ttl=86400, lock_timeout=60, wait=5.0, poll_interval=0.05):
+        self.ttl = timedelta(seconds=ttl)
+        self.lock_timeout = timedelta(seconds=lock_timeout)
+        self.wait = wait
+        self.poll_interval = poll_interval
+
+    def claim(self, key, fingerprint):
+        """``None`` once this request owns ``key``, else the row already there
+
+        A row returned with a ``NULL`` status is a request still in flight
+        after waiting ``wait`` seconds for it.
+        """
+        deadline = time.monotonic() + self.wait
+        while True:
+            now = _utcnow()
+            try:
+                db.session.execute(insert(_table).values(
+                    key=key, fingerprint=fingerprint, created_at=now, expires_at=now + self.ttl,
+                ))
+                db.session.commit()
+                return None
+            except IntegrityError:
+                db.session.rollback()
+
+            row = db.session.execute(select(_table).where(_table.c.key == key)).first()
+            if row is not None and (row.expires_at <= now or (
+                    row.status_code is None and row.created_at <= now - self.lock_timeout)):
+                # Expired, or its request died before storing a response
+                db.session.execute(delete(_table).where(
+                    _table.c.key == key, _table.c.created_at == row.created_at,
+                ))
+                row = None
+            db.session.commit()
+            if row is None:
+                continue
+            if row.status_code is not None or row.fingerprint != fingerprint or time.monotonic() >= deadline:
+                return row
+            time.sleep(self.poll_interval)
+
+    def save(self, key, response):
+        """Store ``response`` for ``key``, or release the key after a server error"""
+        if response.status_code >= 500:
+            self.release(key)
+            return
+        db.session.execute(update(_table).where(_table.c.key == key).values(
+            status_code=response.status_code,
+            content_type=response.content_type,
+            body=response.get_data(),
+        ))
+        db.session.commit()
+
+    def release(self, key):
+        db.session.rollback()
+        db.session.execute(delete(_table).where(_table.c.key == key, _table.c.status_code.is_(None)))
+        db.session.commit()
+
+    def purge(self):
+        """Delete expired responses; returns how many"""
+        result = db.session.execute(delete(_table).where(_table.c.expires_at <= _utcnow()))
+        db.session.commit()
+        return result.rowcount
+
+
+def _replay(row, fingerprint):
+    if row.fingerprint != fingerprint:
+        return jsonify({
+            "success": False,
+            "error": "Idempotency key reused",
+            "message": "This Idempotency-Key was used for a different request"
+        }), 422
+    if row.status_code is None:
+        response = jsonify({
+            "success": False,
+            "error": "Request in progress",
+            "message": "A request with this Idempotency-Key is still being processed"
+        })
+        response.status_code = 409
+        response.headers['Retry-After'] = '1'
+        return response
+    response = current_app.response_class(row.body, status=row.status_code, content_type=row.content_type)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """Honour an ``Idempotency-Key`` header on a write route
+
+    Place it below the auth decorator, so only authorized requests claim keys.
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        value = request.headers.get(HEADER)
+        if value is None:
+            return view(*args, **kwargs)
+        if not value.strip() or len(value) > MAX_KEY_LENGTH:
+            return jsonify({
+                "success": False,
+                "error": "Invalid Idempotency-Key",
+                "message": f"Use a unique string of at most {MAX_KEY_LENGTH} characters"
+            }), 400
+
+        store = current_app.extensions['idempotency']
+        key, fingerprint = _request_key(value), _fingerprint()
+        row = store.claim(key, fingerprint)
+        if row is not None:
+            return _replay(row, fingerprint)
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            store.release(key)
+            raise
+        store.save(key, response)
+        return response
+    return decorated
+
+
+def init_idempotency(app):
+    """Create the store behind :func:`idempotent` and ``flask purge-idempotency-keys``"""
+    store = IdempotencyStore(
+        ttl=app.config.get('IDEMPOTENCY_TTL_SECONDS', 86400),
+        lock_timeout=app.config.get('IDEMPOTENCY_LOCK_SECONDS', 60),
+        wait=app.config.get('IDEMPOTENCY_WAIT_SECONDS', 5.0),
+    )
+    app.extensions['idempotency'] = store
+
+    @app.cli.command('purge-idempotency-keys')
+    def purge_idempotency_keys():
+        """Delete stored Idempotency-Key responses past their TTL."""
+        click.echo(f"🧹 Deleted {store.purge()} expired idempotency keys")
+
+    return store
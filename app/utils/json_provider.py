@@ -0,0 +1,79 @@
+"""
+JSON provider for API responses
+
+Uses ``orjson`` when it is installed (several times faster than the stdlib
+on large nested payloads such as ``/tickets/``) and falls back to Flask's
+stdlib provider otherwise. Either way ``datetime``, ``date`` and ``time``
+values are written as ISO 8601 strings, so models can put them in
+``to_dict()`` as they are.
+"""
+import json
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def float_text(value):
+    """How responses write the float ``value`` (orjson and the stdlib
+    disagree on exponents, e.g. ``0.00001`` vs ``1e-05``)"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+def _default(o):
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` with ISO dates and an orjson fast path"""
+
+    default = staticmethod(_default)
+
+    def _orjson_dumps(self, obj, indent=None, **kwargs):
+        """UTF-8 bytes via orjson, or None when only the stdlib can do it"""
+        # Other json.dumps options (cls, ensure_ascii=..., ...) have no
+        # orjson equivalent; separators only matter for indentation.
+        if orjson is None or kwargs.keys() - {'separators', 'sort_keys', 'default'}:
+            return None
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; let the stdlib decide
+            return None
+
+    def dumps(self, obj, **kwargs):
+        data = self._orjson_dumps(obj, **kwargs)
+        if data is None:
+            return super().dumps(obj, **kwargs)
+        return data.decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def body(self, obj):
+        """The UTF-8 body ``jsonify(obj)`` sends (also used outside requests)"""
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        data = self._orjson_dumps(obj, indent=2 if indent else None)
+        if data is None:
+            dump_args = {'indent': 2} if indent else {'separators': (',', ':')}
+            data = self.dumps(obj, **dump_args).encode('utf-8')
+        return data + b'\n'
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.body(obj), mimetype=self.mimetype)
@@ -0,0 +1,197 @@
+"""
+Request metrics exported in Prometheus text format on ``/metrics``
+
+Every request records, per endpoint and method:
+
+* ``http_requests_total`` by status code
+* ``http_request_duration_seconds`` latency histogram
+* ``http_request_db_seconds`` histogram of time spent in SQL
+* ``http_response_size_bytes`` histogram
+* ``http_requests_in_flight`` gauge
+
+Samples go into a :class:`~app.utils.shared_counters.SharedCounters` file,
+so every gunicorn worker on the host adds to the same series and any worker
+can serve a complete ``/metrics`` scrape. ``METRICS_PATH`` must therefore
+be a fixed path in production; when it is unset (tests) each app gets its
+own temporary file.
+
+Label values are bounded: methods outside the standard set are counted as
+``OTHER`` and requests that match no route as ``unmatched``, so clients
+cannot grow the table with made-up methods or paths. Should the table still
+fill up, new series are dropped (and logged once) rather than failing the
+request.
+"""
+import bisect
+import os
+import tempfile
+import time
+import logging
+import weakref
+
+from flask import g, request
+
+from app.utils.query_stats import request_db_time
+from app.utils.shared_counters import SharedCounters, TableFull
+
+logger = logging.getLogger(__name__)
+
+METRICS_SLOTS = 8192
+
+METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+UNMATCHED = 'unmatched'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Histogram kind code -> (metric name, bucket bounds, sum scale).
+# Sums are stored as integers, so seconds are kept in microseconds.
+HISTOGRAMS = {
+    'l': ('http_request_duration_seconds', LATENCY_BUCKETS, 1e6),
+    'd': ('http_request_db_seconds', LATENCY_BUCKETS, 1e6),
+    'b': ('http_response_size_bytes', SIZE_BUCKETS, 1),
+}
+HELP = {
+    'http_requests_total': ('counter', 'Requests by endpoint, method and status'),
+    'http_requests_in_flight': ('gauge', 'Requests currently being served'),
+    'http_request_duration_seconds': ('histogram', 'Request latency'),
+    'http_request_db_seconds': ('histogram', 'Time spent in the database per request'),
+    'http_response_size_bytes': ('histogram', 'Response body size'),
+}
+
+
+def _endpoint():
+    return request.endpoint or UNMATCHED
+
+
+def _method():
+    return request.method if request.method in METHODS else 'OTHER'
+
+
+def _histogram_samples(kind, endpoint, method, value, bounds, scale):
+    index = bisect.bisect_left(bounds, value)
+    return [
+        (f'{kind}|{endpoint}|{method}|{index}', 1),
+        (f'{kind}|{endpoint}|{method}|s', int(value * scale)),
+    ]
+
+
+class RequestMetrics:
+    """Before/after request hooks feeding the shared counter table"""
+
+    def __init__(self, counters):
+        self.counters = counters
+        self.table_full = False
+
+    def _record(self, samples):
+        try:
+            self.counters.incr_many(samples)
+        except TableFull:
+            if not self.table_full:
+                self.table_full = True
+                logger.warning("Metrics table %s is full, dropping new series", self.counters.path)
+
+    def before_request(self):
+        g._metrics_start = time.perf_counter()
+        g._metrics_key = (_endpoint(), _method())
+        self._record([('f|{}|{}'.format(*g._metrics_key), 1)])
+
+    def after_request(self, response):
+        started = g.pop('_metrics_start', None)
+        if started is None:
+            # An earlier before_request hook (e.g. the rate limiter) cut the
+            # request short: count it, there is no latency to record.
+            self._record([(f'r|{_endpoint()}|{_method()}|{response.status_code}', 1)])
+            return response
+        endpoint, method = g._metrics_key
+        samples = [(f'r|{endpoint}|{method}|{response.status_code}', 1)]
+        samples += _histogram_samples('l', endpoint, method, time.perf_counter() - started,
+                                      LATENCY_BUCKETS, 1e6)
+        samples += _histogram_samples('d', endpoint, method, request_db_time(),
+                                      LATENCY_BUCKETS, 1e6)
+        # Asking a streamed response for its length would buffer the stream
+        size = None if response.is_streamed else response.calculate_content_length()
+        if size is not None:
+            samples += _histogram_samples('b', endpoint, method, size, SIZE_BUCKETS, 1)
+        self._record(samples)
+        return response
+
+    def teardown_request(self, exc):
+        key = g.pop('_metrics_key', None)
+        if key is not None:
+            self._record([('f|{}|{}'.format(*key), -1)])
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def render(self):
+        """All series in Prometheus text exposition format"""
+        requests, in_flight, histograms = [], [], {}
+        for key, value in sorted(self.counters.items()):
+            parts = key.split('|')
+            if len(parts) != (3 if parts[0] == 'f' else 4):
+                continue  # written by an older version without label checks
+            kind, endpoint, method = parts[0], parts[1], parts[2]
+            labels = f'endpoint="{endpoint}",method="{method}"'
+            if kind == 'r':
+                requests.append(f'http_requests_total{{{labels},status="{parts[3]}"}} {value}')
+            elif kind == 'f':
+                in_flight.append(f'http_requests_in_flight{{{labels}}} {value}')
+            elif kind in HISTOGRAMS:
+                series = histograms.setdefault((kind, labels), {'buckets': {}, 'sum': 0})
+                if parts[3] == 's':
+                    series['sum'] = value
+                else:
+                    series['buckets'][int(parts[3])] = value
+
+        lines = []
+        for name, samples in (('http_requests_total', requests),
+                              ('http_requests_in_flight', in_flight)):
+            lines += self._header(name) + samples
+
+        for kind, (name, bounds, scale) in HISTOGRAMS.items():
+            lines += self._header(name)
+            for (series_kind, labels), series in sorted(histograms.items()):
+                if series_kind != kind:
+                    continue
+                running = 0
+                for index, bound in enumerate(bounds + ('+Inf',)):
+                    running += series['buckets'].get(index, 0)
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+                total = series['sum'] / scale if scale != 1 else series['sum']
+                lines.append(f'{name}_sum{{{labels}}} {total}')
+                lines.append(f'{name}_count{{{labels}}} {running}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _header(name):
+        metric_type, help_text = HELP[name]
+        return [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+
+
+def init_metrics(app):
+    """Instrument every request and register the /metrics endpoint"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return None
+
+    path = app.config.get('METRICS_PATH')
+    private_file = not path
+    if private_file:
+        fd, path = tempfile.mkstemp(prefix='mechanics_shop_metrics_', suffix='.bin')
+        os.close(fd)
+    metrics = RequestMetrics(SharedCounters(path, slots=METRICS_SLOTS))
+    if private_file:
+        weakref.finalize(metrics, os.unlink, path)
+    app.extensions['metrics'] = metrics
+
+    app.before_request(metrics.before_request)
+    app.after_request(metrics.after_request)
+    app.teardown_request(metrics.teardown_request)
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Prometheus scrape endpoint aggregated across workers"""
+        return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+    # Mark as accessed to satisfy static analyzers
+    _ = prometheus_metrics
+
+    return metrics
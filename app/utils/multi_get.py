@@ -0,0 +1,102 @@
+"""
+Multi-get by id lists: ``?ids=1,2,3`` on the inventory, mechanics and
+customers lists
+
+A client already holding ids (the part ids of a ticket) gets them in one
+request and one ``SELECT ... WHERE id IN (...)`` rather than a
+``GET /<resource>/<id>`` - and a ``db.session.get`` - per id. Results come
+back in request order, one entry per requested id; an id without a row
+gets an explicit marker and is listed under ``missing``::
+
+    {"success": true,
+     "data": {"inventory": [{"id": 4, ...}, {"id": 7, "error": "Inventory item not found"}],
+              "count": 2, "found": 1, "missing": [7]}}
+
+Rows are selected through the generated row serializer, so no ORM objects
+are built. ``MULTI_GET_MAX_IDS`` (default 100) caps one call. Used by the
+Flask list views and by the ASGI read endpoints.
+"""
+from flask import current_app, jsonify, request
+
+from app.models import Customer, Inventory, Mechanic
+from app.utils.serializers import serializer_for
+
+# Largest id a BIGINT (and SQLite's INTEGER) can hold; the drivers overflow past it
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_ids(values, limit):
+    """``?ids=`` values to ``(ids, None, None)``, or ``(None, error, status)``
+
+    ``values`` is the list of ``ids`` arguments; each may hold several
+    comma-separated ids.
+    """
+    try:
+        ids = [int(part) for value in values for part in value.split(',') if part.strip()]
+    except ValueError:
+        ids = None
+    if not ids or min(ids) < 1 or max(ids) > MAX_ID:
+        return None, {
+            "success": False,
+            "error": "Invalid ids parameter",
+            "message": "Use: ids=1,2,3"
+        }, 400
+    if len(ids) > limit:
+        return None, {
+            "success": False,
+            "error": "Too many ids",
+            "message": f"At most {limit} ids per request"
+        }, 400
+    return ids, None, None
+
+
+class MultiGet:
+    """One ``IN`` query for a list of ids, and its payload in request order"""
+
+    def __init__(self, model, key, not_found):
+        self.model = model
+        self.key = key
+        self.not_found = not_found
+        self.serializer = serializer_for(model)
+
+    def statement(self, ids):
+        return self.serializer.select().where(self.model.id.in_(sorted(set(ids))))
+
+    def payload(self, ids, rows):
+        found = {item['id']: item for item in self.serializer.rows(rows)}
+        items, missing = [], []
+        for item_id in ids:
+            item = found.get(item_id)
+            if item is None:
+                missing.append(item_id)
+                item = {"id": item_id, "error": self.not_found}
+            items.append(item)
+        return {
+            "success": True,
+            "data": {
+                self.key: items,
+                "count": len(items),
+                "found": len(items) - len(missing),
+                "missing": missing
+            }
+        }
+
+
+INVENTORY = MultiGet(Inventory, 'inventory', 'Inventory item not found')
+MECHANICS = MultiGet(Mechanic, 'mechanics', 'Mechanic not found')
+CUSTOMERS = MultiGet(Customer, 'customers', 'Customer not found')
+
+
+def wants_multi_get(args=None):
+    return 'ids' in (request.args if args is None else args)
+
+
+def multi_get_response(multi_get):
+    """The Flask response for ``?ids=`` on ``multi_get``'s list view"""
+    from app import db
+
+    ids, error, status = parse_ids(request.args.getlist('ids'), current_app.config.get('MULTI_GET_MAX_IDS', 100))
+    if error is not None:
+        return jsonify(error), status
+    rows = db.session.execute(multi_get.statement(ids)).all()
+    return jsonify(multi_get.payload(ids, rows)), 200
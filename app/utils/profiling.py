@@ -0,0 +1,139 @@
+"""
+On-demand and sampled profiling of live requests
+
+Disabled unless ``PROFILING_ENABLED`` is set. Then:
+
+* A mechanic can profile a single request by sending ``X-Profile: 1`` (or
+  ``?_profile=1``) with their token. The response carries an
+  ``X-Profile-Id`` header naming the stored profile.
+* ``PROFILE_SAMPLE_RATE = N`` profiles every Nth request of each worker
+  continuously, without a token.
+
+Requests run under ``cProfile`` and the stats are written to ``PROFILE_DIR``
+as ``.pstats`` files (open with ``python -m pstats``, snakeviz, or convert
+to a flame graph with flameprof). Only the newest ``PROFILE_MAX_FILES`` are
+kept. Mechanics list and download them from ``/profiles/``.
+"""
+import cProfile
+import itertools
+import os
+import re
+import tempfile
+import time
+import uuid
+
+from flask import g, request, jsonify, send_from_directory
+
+from app.utils.auth import mechanic_id_from_request, mechanic_token_required
+
+PROFILE_SUFFIX = '.pstats'
+PROFILE_NAME = re.compile(r'^[\w.-]+\.pstats$')
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores their stats"""
+
+    def __init__(self, directory, sample_rate=0, max_files=50):
+        self.directory = directory
+        self.sample_rate = int(sample_rate or 0)
+        self.max_files = int(max_files)
+        self._counter = itertools.count(1)
+        os.makedirs(directory, exist_ok=True)
+
+    def wants_profile(self):
+        requested = request.headers.get('X-Profile') == '1' or request.args.get('_profile') == '1'
+        if requested and mechanic_id_from_request() is not None:
+            return True
+        return bool(self.sample_rate) and next(self._counter) % self.sample_rate == 0
+
+    def before_request(self):
+        if not self.wants_profile():
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return
+        g._profiler = profiler
+
+    def after_request(self, response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        name = '{}-{}-{}-{}{}'.format(
+            time.strftime('%Y%m%dT%H%M%S'),
+            (request.endpoint or 'unmatched').replace('.', '_'),
+            os.getpid(),
+            uuid.uuid4().hex[:8],
+            PROFILE_SUFFIX,
+        )
+        # Write then rename, so a listing never sees half-written stats
+        path = os.path.join(self.directory, name)
+        profiler.dump_stats(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        self.prune()
+        response.headers['X-Profile-Id'] = name
+        return response
+
+    def profiles(self):
+        """Stored profile file names, newest first"""
+        entries = [
+            entry for entry in os.scandir(self.directory)
+            if entry.is_file() and entry.name.endswith(PROFILE_SUFFIX)
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [entry.name for entry in entries]
+
+    def prune(self):
+        for name in self.profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+
+def init_profiling(app):
+    """Register the profiling hooks and download endpoints when enabled"""
+    if not app.config.get('PROFILING_ENABLED'):
+        return None
+
+    profiler = RequestProfiler(
+        app.config.get('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'mechanics_shop_profiles'),
+        sample_rate=app.config.get('PROFILE_SAMPLE_RATE', 0),
+        max_files=app.config.get('PROFILE_MAX_FILES', 50),
+    )
+    app.extensions['profiler'] = profiler
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
+
+    @app.route('/profiles/', methods=['GET'])
+    @mechanic_token_required
+    def list_profiles(current_mechanic_id):
+        """List stored profiles - Mechanic auth required"""
+        names = profiler.profiles()
+        return jsonify({
+            "success": True,
+            "data": {
+                "profiles": names,
+                "count": len(names)
+            }
+        }), 200
+
+    @app.route('/profiles/<name>', methods=['GET'])
+    @mechanic_token_required
+    def download_profile(current_mechanic_id, name):
+        """Download a stored .pstats file - Mechanic auth required"""
+        if not PROFILE_NAME.match(name) or name not in profiler.profiles():
+            return jsonify({
+                "success": False,
+                "error": "Profile not found"
+            }), 404
+        return send_from_directory(profiler.directory, name, as_attachment=True,
+                                   mimetype='application/octet-stream')
+
+    # Mark as accessed to satisfy static analyzers
+    _ = (list_profiles, download_profile)
+
+    return profiler
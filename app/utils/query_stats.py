@@ -0,0 +1,66 @@
+"""
+Per-request SQL statement counts and database time
+
+SQLAlchemy cursor events add every statement executed while a request is
+active to the request's running totals. The metrics middleware reads the
+time back with :func:`request_db_time`; in debug mode (or with
+``SQL_QUERY_HEADERS``) the totals are also returned to the client as
+``X-Query-Count`` and ``X-DB-Time-Ms`` headers, which makes N+1 query
+patterns visible while developing. ``tests/conftest.py`` builds a query
+budget check on top of :func:`request_query_count`.
+"""
+import time
+
+from flask import g, has_app_context
+from sqlalchemy import event
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_start'].pop()
+    if has_app_context():
+        g._db_time = g.get('_db_time', 0.0) + (time.perf_counter() - started)
+        g._db_queries = g.get('_db_queries', 0) + 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start'):
+        connection.info['query_start'].pop()
+
+
+def _reset_request_stats():
+    g._db_time = 0.0
+    g._db_queries = 0
+
+
+def _add_query_headers(response):
+    response.headers['X-Query-Count'] = str(request_query_count())
+    response.headers['X-DB-Time-Ms'] = f'{request_db_time() * 1000:.2f}'
+    return response
+
+
+def init_query_stats(app, *engines):
+    """Start counting and timing statements run on ``engines``"""
+    for engine in engines:
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
+    app.before_request(_reset_request_stats)
+    if app.debug or app.config.get('SQL_QUERY_HEADERS'):
+        app.after_request(_add_query_headers)
+
+
+def request_db_time():
+    """Seconds spent in the database so far during this request"""
+    return g.get('_db_time', 0.0)
+
+
+def request_query_count():
+    """SQL statements executed so far during this request"""
+    return g.get('_db_queries', 0)
@@ -0,0 +1,57 @@
+"""
+Flask-Limiter storage shared by all gunicorn workers on a host
+
+Importing this module registers the ``mmap://`` scheme with the ``limits``
+storage registry, so it can be selected through ``RATELIMIT_STORAGE_URI``:
+
+    RATELIMIT_STORAGE_URI = 'mmap:///tmp/mechanics_shop_ratelimit.bin?slots=65536'
+
+The counters live in a :class:`~app.utils.shared_counters.SharedCounters`
+table, so a limit of "5 per minute" means five requests across every
+worker instead of five per worker.
+"""
+import time
+from urllib.parse import urlparse, parse_qs
+
+from limits.storage import Storage
+
+from app.utils.shared_counters import SharedCounters, DEFAULT_SLOTS
+
+
+class MmapStorage(Storage):
+    """Fixed-window rate limit counters in a shared mmap'd file"""
+
+    STORAGE_SCHEME = ['mmap']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        parsed = urlparse(uri or 'mmap://')
+        query = parse_qs(parsed.query)
+        slots = int(options.get('slots') or query.get('slots', [DEFAULT_SLOTS])[0])
+        self.counters = SharedCounters(parsed.path or None, slots=slots)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, RuntimeError, ValueError)
+
+    def incr(self, key, expiry, amount=1):
+        return self.counters.incr(key, amount, expiry=expiry)
+
+    def get(self, key):
+        return self.counters.get(key)
+
+    def get_expiry(self, key):
+        return self.counters.get_expiry(key) or time.time()
+
+    def check(self):
+        try:
+            self.counters.get('__healthcheck__')
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        return self.counters.reset()
+
+    def clear(self, key):
+        self.counters.clear(key)
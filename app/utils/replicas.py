@@ -0,0 +1,227 @@
+"""
+Read-replica routing
+
+With ``SQLALCHEMY_REPLICA_URIS`` set, every replica becomes a
+Flask-SQLAlchemy bind (``replica_0``, ``replica_1``, ...) and
+:class:`RoutingSession` picks the engine per statement:
+
+* ``GET``/``HEAD``/``OPTIONS`` requests read from one replica, chosen at
+  random once per request so the request sees a single snapshot.
+* Functions decorated with :func:`read_only` (reports, CLI commands) read
+  from a replica wherever they are called from.
+* Everything else - other methods, flushes and INSERT/UPDATE/DELETE
+  statements in any request - goes to the primary.
+
+Replicas lag behind the primary, so a client that just wrote would not see
+its own change on its next GET. Once a request commits a write, the client
+(its ``Authorization`` header) is pinned to the primary for
+``REPLICA_STICKY_SECONDS``. The pin lives in the app cache, which
+production shares between gunicorn workers. Anonymous requests are not
+pinned: behind Render's proxy ``request.remote_addr`` is the proxy, so it
+would pin every anonymous client at once (keying on the client's address
+needs ``werkzeug.middleware.proxy_fix.ProxyFix``, which the app does not
+install). Anonymous clients only write to register or log in, and read
+their own data with a token afterwards.
+
+Pinned clients bypass the response cache, and responses read from a
+replica are cached apart from primary reads for at most
+``REPLICA_STICKY_SECONDS`` (see ``app/utils/response_cache.py``), so a
+replica-era body cached after a write never reaches the writer.
+
+Without replicas configured nothing is registered and every statement uses
+the primary as before. ``flask sync-replicas`` copies a SQLite primary into
+SQLite replica files, which is enough to try the routing locally.
+"""
+import hashlib
+import random
+import sqlite3
+from functools import wraps
+
+import click
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+BIND_PREFIX = 'replica_'
+WROTE = 'replica_routing_wrote'
+
+
+def replica_binds(config):
+    """``SQLALCHEMY_BINDS`` with one ``replica_<n>`` bind per replica URI"""
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(config.get('SQLALCHEMY_REPLICA_URIS') or ()):
+        binds[f'{BIND_PREFIX}{index}'] = uri
+    return binds
+
+
+class ReplicaRouter:
+    """Decides, once per app context, whether reads go to a replica"""
+
+    def __init__(self, engines, sticky_seconds):
+        self.engines = engines
+        self.sticky_seconds = sticky_seconds
+
+    def route(self):
+        """``'replica'`` or ``'primary'`` for the current app context"""
+        route = g.get('_db_route')
+        if route is None:
+            if has_request_context() and request.method in SAFE_METHODS and not self.is_pinned():
+                route = 'replica'
+            else:
+                route = 'primary'
+            g._db_route = route
+        return route
+
+    def replica(self):
+        """This context's replica engine, or ``None`` to use the primary"""
+        if self.route() != 'replica':
+            return None
+        engine = g.get('_db_replica')
+        if engine is None:
+            engine = g._db_replica = random.choice(self.engines)
+        return engine
+
+    def _client_key(self):
+        # None for anonymous clients (see the module docstring)
+        client = request.headers.get('Authorization')
+        if not client:
+            return None
+        return 'replica-pin:' + hashlib.sha1(client.encode()).hexdigest()
+
+    def is_pinned(self):
+        from app.extensions import cache
+        key = self._client_key()
+        return bool(self.sticky_seconds) and key is not None and cache.get(key) is not None
+
+    def pin(self):
+        from app.extensions import cache
+        key = self._client_key()
+        if self.sticky_seconds and key is not None:
+            cache.set(key, 1, timeout=self.sticky_seconds)
+
+
+def _router():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('replicas')
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends reads to a replica when allowed"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or self._flushing or isinstance(clause, UpdateBase):
+            return engine
+        router = _router()
+        # Only reads of the default bind are replicated
+        if router is None or engine is not self._db.engines.get(None):
+            return engine
+        return router.replica() or engine
+
+
+def read_only(func):
+    """Run ``func`` against a replica, even outside a GET request
+
+    The function must not write: its statements may be sent to a replica,
+    and it does not see the caller's uncommitted changes.
+    """
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        if _router() is None:
+            return func(*args, **kwargs)
+        previous = g.get('_db_route')
+        g._db_route = 'replica'
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g._db_route = previous
+    return decorated
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_flush(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _note_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _note_commit(session):
+    if session.info.pop(WROTE, False) and has_request_context():
+        g._db_wrote = True
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_write(session):
+    session.info.pop(WROTE, None)
+
+
+def _reset_route():
+    # Tests (and anything else holding an outer app context) share g
+    g.pop('_db_route', None)
+    g.pop('_db_replica', None)
+
+
+def _pin_writers(response):
+    if g.pop('_db_wrote', False):
+        current_app.extensions['replicas'].pin()
+    return response
+
+
+def _add_route_header(response):
+    route = g.get('_db_route')
+    if route is not None:
+        response.headers['X-DB-Route'] = route
+    return response
+
+
+def init_replicas(app, db):
+    """Route reads to the replica binds configured by :func:`replica_binds`"""
+    keys = sorted(key for key in app.config.get('SQLALCHEMY_BINDS') or {}
+                  if isinstance(key, str) and key.startswith(BIND_PREFIX))
+    for key in keys:
+        # Replicas own no tables; leave create_all()/drop_all() to the primary
+        # (``db.metadatas`` is shared by every app using this ``db``)
+        if key in db.metadatas and not db.metadatas[key].tables:
+            del db.metadatas[key]
+    if keys:
+        with app.app_context():
+            engines = [db.engines[key] for key in keys]
+        app.extensions['replicas'] = ReplicaRouter(
+            engines, int(app.config.get('REPLICA_STICKY_SECONDS', 5)),
+        )
+        app.before_request(_reset_route)
+        app.after_request(_pin_writers)
+        if app.debug or app.config.get('SQL_QUERY_HEADERS'):
+            app.after_request(_add_route_header)
+
+    @app.cli.command('sync-replicas')
+    def sync_replicas():
+        """Copy a SQLite primary into SQLite replica files (local testing)"""
+        with app.app_context():
+            source = db.engines[None].url
+            replicas = [db.engines[key] for key in keys]
+            if source.get_backend_name() != 'sqlite' or source.database in (None, '', ':memory:'):
+                raise click.ClickException('sync-replicas needs a SQLite file as the primary')
+            if not replicas:
+                raise click.ClickException('No SQLALCHEMY_REPLICA_URIS configured')
+            for engine in replicas:
+                target = engine.url
+                if target.get_backend_name() != 'sqlite' or target.database in (None, '', ':memory:'):
+                    raise click.ClickException(f'{target} is not a SQLite file')
+                # Close pooled replica connections before the file is replaced
+                engine.dispose()
+                src, dst = sqlite3.connect(source.database), sqlite3.connect(target.database)
+                try:
+                    src.backup(dst)
+                finally:
+                    src.close()
+                    dst.close()
+                click.echo(f'✅ {source.database} -> {target.database}')
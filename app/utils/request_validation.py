@@ -0,0 +1,263 @@
+"""
+Request body validation compiled from the OpenAPI spec
+
+``app/static/swagger.yaml`` is the contract for every JSON request body.
+At startup each object schema under ``components.schemas`` is compiled into
+a chain of small closures - one per property, holding only the checks that
+property declares (type, nullable, enum, bounds, lengths, email format) -
+so a request pays for a dict walk and a few ``isinstance`` calls rather than
+re-interpreting the schema.
+
+Routes opt in with ``@validate_json('SchemaName')`` placed below their auth
+decorator. Bodies that fail are answered with the usual
+``{"success": false, "error": ...}`` 400 before the view runs. Two vendor
+extensions keep the messages the login routes have always returned:
+``x-empty-message`` (body is ``{}``) and ``x-required-message`` (a required
+field is missing).
+
+Supported keywords: ``type``, ``nullable``, ``required``, ``properties``,
+``items``, ``enum``, ``minimum``, ``maximum``, ``minLength``, ``maxLength``,
+``format: email`` and local ``$ref``. Unknown properties are ignored, as the
+routes always have.
+"""
+import os
+import re
+from functools import wraps
+
+import yaml
+from flask import current_app, jsonify, request
+from werkzeug.exceptions import BadRequest
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _Loader = yaml.SafeLoader
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+_TYPES = {
+    'string': (str, 'a string'),
+    'integer': (int, 'an integer'),
+    'number': ((int, float), 'a number'),
+    'boolean': (bool, 'a boolean'),
+    'array': (list, 'an array'),
+    'object': (dict, 'an object'),
+}
+
+# Schema names used by @validate_json, checked against the spec at startup
+_used_schemas = set()
+
+
+def load_spec(path):
+    with open(path, encoding='utf-8') as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+class SpecError(ValueError):
+    """The spec cannot be compiled (bad $ref, unsupported type, missing schema)"""
+
+
+def _resolver(spec):
+    def resolve(schema):
+        seen = set()
+        while '$ref' in schema:
+            ref = schema['$ref']
+            if not ref.startswith('#/') or ref in seen:
+                raise SpecError(f"Unsupported $ref: {ref}")
+            seen.add(ref)
+            node = spec
+            for part in ref[2:].split('/'):
+                if part not in node:
+                    raise SpecError(f"Unresolvable $ref: {ref}")
+                node = node[part]
+            schema = node
+        return schema
+    return resolve
+
+
+def _combine(checks):
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check_all(value):
+        for check in checks:
+            message = check(value)
+            if message:
+                return message
+        return None
+    return check_all
+
+
+def compile_value(schema, resolve):
+    """``check(value) -> message | None`` for one property schema"""
+    schema = resolve(schema)
+    checks = []
+    kind = schema.get('type')
+    if kind is not None:
+        if kind not in _TYPES:
+            raise SpecError(f"Unsupported type: {kind}")
+        expected, label = _TYPES[kind]
+        message = f"must be {label}"
+        if kind in ('integer', 'number'):
+            # bool is an int subclass, but true is not a number
+            def check_type(value, expected=expected, message=message):
+                if not isinstance(value, expected) or isinstance(value, bool):
+                    return message
+                return None
+        else:
+            def check_type(value, expected=expected, message=message):
+                return None if isinstance(value, expected) else message
+        checks.append(check_type)
+
+    if 'enum' in schema:
+        allowed = frozenset(schema['enum'])
+        message = f"must be one of: {', '.join(map(str, schema['enum']))}"
+        checks.append(lambda value: None if value in allowed else message)
+    if 'minimum' in schema:
+        low = schema['minimum']
+        checks.append(lambda value: f"must be >= {low}" if value < low else None)
+    if 'maximum' in schema:
+        high = schema['maximum']
+        checks.append(lambda value: f"must be <= {high}" if value > high else None)
+    if 'minLength' in schema:
+        shortest = schema['minLength']
+        checks.append(lambda value: f"must be at least {shortest} characters"
+                      if len(value) < shortest else None)
+    if 'maxLength' in schema:
+        longest = schema['maxLength']
+        checks.append(lambda value: f"must be at most {longest} characters"
+                      if len(value) > longest else None)
+    if schema.get('format') == 'email':
+        match = EMAIL_RE.match
+        checks.append(lambda value: None if match(value) else "must be a valid email address")
+    if kind == 'array' and 'items' in schema:
+        item_check = compile_value(schema['items'], resolve)
+        if item_check is not None:
+            def check_items(value):
+                for index, item in enumerate(value):
+                    message = item_check(item)
+                    if message:
+                        return f"item {index} {message}"
+                return None
+            checks.append(check_items)
+    if kind == 'object' and 'properties' in schema:
+        nested = compile_object(schema, resolve)
+
+        def check_object(value):
+            missing, errors = nested(value)
+            if missing:
+                return f"missing {', '.join(missing)}"
+            if errors:
+                return '; '.join(f"{name} {message}" for name, message in errors.items())
+            return None
+        checks.append(check_object)
+
+    check = _combine(checks)
+    nullable = schema.get('nullable', False)
+
+    def check_value(value):
+        if value is None:
+            return None if nullable else "must not be null"
+        return check(value) if check is not None else None
+    return check_value
+
+
+def compile_object(schema, resolve):
+    """``validate(data) -> (missing, errors)`` for an object schema"""
+    schema = resolve(schema)
+    required = tuple(schema.get('required', ()))
+    properties = tuple(
+        (name, compile_value(prop, resolve)) for name, prop in schema.get('properties', {}).items()
+    )
+
+    def validate(data):
+        # A required field counts as missing when absent, null or ""
+        missing = [name for name in required if data.get(name) is None or data.get(name) == '']
+        errors = {}
+        for name, check in properties:
+            if name in data and name not in missing:
+                message = check(data[name])
+                if message:
+                    errors[name] = message
+        return missing, errors
+    return validate
+
+
+def compile_body(schema, resolve):
+    """``validate(data) -> (message, details) | None`` for a request body"""
+    schema = resolve(schema)
+    validate = compile_object(schema, resolve)
+    empty_message = schema.get('x-empty-message')
+    required_message = schema.get('x-required-message')
+
+    def validate_body(data):
+        if data is None:
+            return "No data provided", None
+        if not isinstance(data, dict):
+            return "Request body must be a JSON object", None
+        if not data and empty_message:
+            return empty_message, None
+        missing, errors = validate(data)
+        if missing:
+            return required_message or f"Missing required fields: {', '.join(missing)}", None
+        if errors:
+            summary = '; '.join(f"{name} {message}" for name, message in errors.items())
+            return f"Invalid fields: {summary}", errors
+        return None
+    return validate_body
+
+
+def compile_spec(spec):
+    """``{schema name: validate_body}`` for every object schema in the spec"""
+    resolve = _resolver(spec)
+    validators = {}
+    for name, schema in spec.get('components', {}).get('schemas', {}).items():
+        if resolve(schema).get('type') == 'object':
+            validators[name] = compile_body(schema, resolve)
+    return validators
+
+
+def validate_json(schema_name):
+    """Reject the request with a 400 unless its JSON body matches ``schema_name``"""
+    _used_schemas.add(schema_name)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not request.is_json:
+                return jsonify({
+                    "success": False,
+                    "error": "Missing JSON in request"
+                }), 400
+            try:
+                data = request.get_json()
+            except BadRequest:
+                return jsonify({
+                    "success": False,
+                    "error": "Malformed JSON in request"
+                }), 400
+
+            failure = current_app.extensions['request_validators'][schema_name](data)
+            if failure is not None:
+                message, details = failure
+                payload = {"success": False, "error": message}
+                if details:
+                    payload["details"] = details
+                return jsonify(payload), 400
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def init_request_validation(app, spec_path=None):
+    """Compile the spec's request schemas once, for ``@validate_json``"""
+    spec_path = spec_path or os.path.join(app.static_folder, 'swagger.yaml')
+    validators = compile_spec(load_spec(spec_path))
+    unknown = sorted(_used_schemas - set(validators))
+    if unknown:
+        raise SpecError(f"Schemas used by @validate_json are missing from {spec_path}: {', '.join(unknown)}")
+    app.extensions['request_validators'] = validators
+    return validators
@@ -0,0 +1,121 @@
+"""
+Tag-invalidated response caching for public GET endpoints
+
+Views opt in with :func:`cached_response`, naming the entity tags their
+output depends on. Tags may reference view arguments::
+
+    @inventory_bp.route('/<int:item_id>', methods=['GET'])
+    @cached_response('inventory:{item_id}')
+    def get_inventory_item(item_id): ...
+
+Write routes call :func:`invalidate_on_commit` with the tags they touch.
+The tags are bumped only once the session actually commits (and dropped on
+rollback), so a cached read can never outlive the write that changed it.
+
+Each tag has a version token in the cache; response keys embed the current
+tokens, so invalidating a tag simply makes every dependent key unreachable.
+
+With read replicas (``app/utils/replicas.py``), clients pinned to the
+primary after a write bypass the cache, and bodies read from a replica are
+stored under their own keys for at most ``REPLICA_STICKY_SECONDS``.
+"""
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import cache
+
+PENDING_TAGS = 'pending_cache_tags'
+
+
+def _tag_key(tag):
+    return f'tagver:{tag}'
+
+
+def _tag_versions(tags):
+    """Current version token per tag, creating tokens for unknown tags"""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(*keys)
+    for index, version in enumerate(versions):
+        if version is None:
+            # add() so concurrent workers agree on a single token
+            cache.add(keys[index], uuid.uuid4().hex[:12], timeout=0)
+            versions[index] = cache.get(keys[index])
+    return versions
+
+
+def bump_tags(*tags):
+    """Invalidate every cached response depending on any of ``tags``"""
+    for tag in tags:
+        cache.set(_tag_key(tag), uuid.uuid4().hex[:12], timeout=0)
+
+
+def invalidate_on_commit(*tags):
+    """Schedule ``tags`` to be invalidated when the current session commits"""
+    from app import db
+    db.session.info.setdefault(PENDING_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_pending_tags(session):
+    tags = session.info.pop(PENDING_TAGS, None)
+    if tags:
+        bump_tags(*sorted(tags))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending_tags(session):
+    session.info.pop(PENDING_TAGS, None)
+
+
+def _normalized_query():
+    return urlencode(sorted(request.args.items(multi=True)))
+
+
+def cached_response(*tags, timeout=None):
+    """Cache a view's 200 responses under its path, query string and tags"""
+    def decorator(view):
+        @wraps(view)
+        def decorated(*args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            ttl = timeout or current_app.config.get('RESPONSE_CACHE_TIMEOUT', 60)
+            router = current_app.extensions.get('replicas')
+            route = router.route() if router is not None else None
+            if route == 'primary':
+                # Pinned to the primary after a write: a cached body may
+                # predate the write (read from a lagging replica)
+                return view(*args, **kwargs)
+
+            resolved = [tag.format(**kwargs) for tag in tags]
+            versions = _tag_versions(resolved)
+            key = 'response:{}?{}|{}'.format(request.path, _normalized_query(), ','.join(versions))
+            if route == 'replica':
+                # A replica read may miss a write whose tags were already
+                # bumped; keep it apart and no longer than the replica lag
+                key += '|replica'
+                ttl = min(ttl, router.sticky_seconds or ttl)
+
+            cached = cache.get(key)
+            if cached is not None:
+                body, status, mimetype = cached
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(
+                    key,
+                    (response.get_data(), response.status_code, response.mimetype),
+                    timeout=ttl,
+                )
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,128 @@
+"""
+Schema fingerprint: skip DDL and reflection on deploys that change nothing
+
+The deploy scripts used to run ``db.create_all()`` and list every table on
+each deploy. Both reflect the live schema, which is slow on a large
+database and takes catalog locks while traffic is being served.
+
+Instead, a hash of the model metadata (tables, columns, types, keys,
+indexes) and the Alembic head revision is stored in the one-row
+``schema_fingerprint`` table. A deploy reads that row with a single
+``SELECT``; when it matches the code being deployed there is nothing to do.
+Only when it differs (or the table is missing) does ``sync_schema`` run
+``create_all`` and record the new fingerprint.
+
+The table lives on its own ``MetaData`` so ``db.create_all()`` /
+``db.drop_all()`` and Alembic autogenerate leave it alone.
+"""
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.exc import DBAPIError
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+VERSIONS_DIR = os.path.join(PROJECT_ROOT, 'migrations', 'versions')
+TABLE_NAME = 'schema_fingerprint'
+
+fingerprint_metadata = MetaData()
+fingerprint_table = Table(
+    TABLE_NAME, fingerprint_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('fingerprint', String(64), nullable=False),
+    Column('alembic_head', String(255)),
+    Column('updated_at', DateTime),
+)
+
+_REVISION = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+
+
+def alembic_heads(versions_dir=VERSIONS_DIR):
+    """Head revision ids of the migration scripts, read without importing Alembic"""
+    revisions, parents = set(), set()
+    if not os.path.isdir(versions_dir):
+        return []
+    for name in os.listdir(versions_dir):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(versions_dir, name), encoding='utf-8') as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down:
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down.group(1)))
+    return sorted(revisions - parents)
+
+
+def _describe_table(table):
+    columns = [
+        (column.name, repr(column.type), column.nullable, column.primary_key,
+         bool(column.unique), str(column.server_default.arg) if column.server_default else None,
+         sorted(fk.target_fullname for fk in column.foreign_keys))
+        for column in table.columns
+    ]
+    indexes = sorted((index.name or '', bool(index.unique), [c.name for c in index.columns])
+                     for index in table.indexes)
+    constraints = sorted((type(constraint).__name__, constraint.name or '',
+                          sorted(c.name for c in getattr(constraint, 'columns', [])))
+                         for constraint in table.constraints)
+    return repr((table.name, sorted(columns), indexes, constraints))
+
+
+def compute_fingerprint(metadata, heads=None):
+    """sha256 over the table definitions in ``metadata`` and the Alembic heads"""
+    heads = alembic_heads() if heads is None else heads
+    digest = hashlib.sha256()
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        digest.update(_describe_table(table).encode())
+    digest.update(repr(sorted(heads)).encode())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(engine):
+    """The recorded fingerprint, or None if there is none (or no table yet)"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                select(fingerprint_table.c.fingerprint).where(fingerprint_table.c.id == 1)
+            ).scalar()
+    except DBAPIError:
+        return None
+
+
+def record_fingerprint(engine, fingerprint, heads):
+    fingerprint_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(fingerprint_table.delete())
+        connection.execute(fingerprint_table.insert().values(
+            id=1, fingerprint=fingerprint, alembic_head=','.join(heads) or None,
+            updated_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        ))
+
+
+def sync_schema(db, force=False, echo=print):
+    """Create missing tables unless the stored fingerprint is current
+
+    Returns True when DDL was run, False when the schema was up to date.
+    """
+    heads = alembic_heads()
+    current = compute_fingerprint(db.metadata, heads)
+    if not force and stored_fingerprint(db.engine) == current:
+        echo(f"✅ Schema unchanged (fingerprint {current[:12]}), skipping create_all")
+        return False
+
+    echo("📊 Schema changed or not yet recorded, creating database tables...")
+    db.create_all()
+    tables = sorted(inspect(db.engine).get_table_names())
+    echo(f"📋 Database ready with {len(tables)} tables:")
+    for table in tables:
+        echo(f"   ✅ {table}")
+    record_fingerprint(db.engine, current, heads)
+    echo(f"🔖 Recorded schema fingerprint {current[:12]}")
+    return True
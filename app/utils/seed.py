@@ -0,0 +1,294 @@
+"""
+High-volume synthetic data for development, benchmarks and load tests
+
+``flask seed`` generates customers, mechanics, inventory parts and service
+tickets (with their mechanic and part links) that are referentially
+consistent and identical for the same ``--seed``. It is built to reach
+millions of tickets:
+
+* one password hash is computed up front and shared by every account, so
+  the key derivation function is not the bottleneck;
+* rows are streamed in batches through Core ``INSERT``s, or ``COPY FROM
+  STDIN`` on PostgreSQL;
+* ids are assigned explicitly, after any rows already in the tables.
+
+    flask --app flask_app seed --tickets 1000000 --seed 7
+"""
+import csv
+import io
+import random
+import time
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import func, select, text
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db, service_mechanic, ticket_inventory
+from app.models import Customer, Mechanic, ServiceTicket, Inventory
+
+DEFAULT_PASSWORD = 'password123'
+DEFAULT_BATCH_SIZE = 5000
+EPOCH = datetime(2024, 1, 1)
+
+FIRST_NAMES = ('James', 'Maria', 'Robert', 'Linda', 'Michael', 'Sofia', 'David', 'Aisha',
+               'Daniel', 'Emma', 'Kenji', 'Olivia', 'Carlos', 'Priya', 'Thomas', 'Grace')
+LAST_NAMES = ('Smith', 'Garcia', 'Johnson', 'Nguyen', 'Brown', 'Patel', 'Miller', 'Kim',
+              'Davis', 'Lopez', 'Wilson', 'Okafor', 'Moore', 'Silva', 'Taylor', 'Novak')
+VEHICLES = ('Toyota Camry', 'Honda Civic', 'Ford F-150', 'Chevrolet Silverado', 'Tesla Model 3',
+            'Subaru Outback', 'BMW 3 Series', 'Jeep Wrangler', 'Nissan Altima', 'Kia Sorento')
+ISSUES = ('Brake squeal when stopping', 'Check engine light on', 'Oil change and inspection',
+          'Battery not holding charge', 'Transmission slipping', 'AC blowing warm air',
+          'Steering pulls to the left', 'Coolant leak under engine', 'Tire rotation',
+          'Rough idle at stoplights')
+SPECIALIZATIONS = ('engine', 'brakes', 'electrical', 'transmission', 'suspension', 'general')
+CATEGORIES = ('filters', 'brakes', 'fluids', 'electrical', 'engine', 'suspension')
+PARTS = ('Oil Filter', 'Brake Pad Set', 'Spark Plug', 'Air Filter', 'Wiper Blade', 'Battery',
+         'Alternator', 'Serpentine Belt', 'Coolant', 'Brake Rotor', 'Headlight Bulb', 'Shock Absorber')
+STATUSES = ('open', 'in_progress', 'waiting_parts', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+
+
+def default_counts(tickets):
+    """Rows per table for ``tickets`` tickets in a busy shop"""
+    return {
+        'customer': max(10, tickets // 10),
+        'mechanic': max(5, tickets // 200),
+        'inventory': max(20, tickets // 100),
+    }
+
+
+# ----------------------------------------------------------------------
+# Writers
+# ----------------------------------------------------------------------
+class CoreWriter:
+    """Executemany INSERTs on the session's connection"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def write(self, table, rows):
+        self.connection.execute(table.insert(), rows)
+
+
+class CopyWriter:
+    """``COPY ... FROM STDIN`` through the psycopg2 cursor of the session"""
+
+    def __init__(self, connection):
+        self.cursor = connection.connection.dbapi_connection.cursor()
+
+    def write(self, table, rows):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f'COPY {table.name} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer
+        )
+
+
+def writer_for(connection):
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.name == 'postgresql' and hasattr(dbapi_connection.cursor(), 'copy_expert'):
+        return CopyWriter(connection)
+    return CoreWriter(connection)
+
+
+# ----------------------------------------------------------------------
+# Generator
+# ----------------------------------------------------------------------
+class Seeder:
+    """Streams deterministic rows for every table into a writer"""
+
+    def __init__(self, writer, seed=42, batch_size=DEFAULT_BATCH_SIZE, password=DEFAULT_PASSWORD,
+                 offsets=None, echo=None):
+        self.writer = writer
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.password_hash = generate_password_hash(password)
+        self.offsets = offsets or {}
+        self.echo = echo or (lambda message: None)
+        self.report = {}
+
+    def _write(self, table, rows):
+        """Write ``rows`` (an iterable of dicts) in batches and time it"""
+        start = time.perf_counter()
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.writer.write(table, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self.writer.write(table, batch)
+            written += len(batch)
+        elapsed = time.perf_counter() - start
+        rows_so_far, seconds = self.report.get(table.name, (0, 0.0))
+        self.report[table.name] = (rows_so_far + written, seconds + elapsed)
+        return written
+
+    def _ids(self, table, count):
+        first = self.offsets.get(table, 0) + 1
+        return range(first, first + count)
+
+    def _person(self):
+        return (self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES))
+
+    def customers(self, count):
+        for i in self._ids('customer', count):
+            first, last = self._person()
+            yield {
+                'id': i, 'first_name': first, 'last_name': last,
+                'email': f'customer{i}@seed.example', 'password_hash': self.password_hash,
+                'phone': f'555-{i % 10000000:07d}', 'address': f'{self.rng.randint(1, 9999)} Main St',
+                'created_at': EPOCH + timedelta(minutes=self.rng.randint(0, 525600)),
+            }
+
+    def mechanics(self, count):
+        for i in self._ids('mechanic', count):
+            first, last = self._person()
+            yield {
+                'id': i, 'first_name': first, 'last_name': last,
+                'email': f'mechanic{i}@seed.example', 'password_hash': self.password_hash,
+                'specialization': self.rng.choice(SPECIALIZATIONS),
+                'years_experience': self.rng.randint(0, 30),
+                'hourly_rate': float(self.rng.randint(30, 120)),
+                'is_active': self.rng.random() > 0.05,
+                'created_at': EPOCH,
+            }
+
+    def parts(self, count, prices):
+        for i in self._ids('inventory', count):
+            price = round(self.rng.uniform(2, 400), 2)
+            prices.append(price)
+            yield {
+                'id': i, 'part_name': f'{self.rng.choice(PARTS)} #{i}', 'part_number': f'SEED-{i:08d}',
+                'description': None, 'quantity': self.rng.randint(0, 500), 'price': price,
+                'category': self.rng.choice(CATEGORIES), 'supplier': None, 'min_stock_level': 5,
+                'created_at': EPOCH, 'updated_at': EPOCH,
+            }
+
+    def tickets(self, count, counts, prices, mechanic_links, part_links):
+        customer_ids = self._ids('customer', counts['customer'])
+        mechanic_ids = self._ids('mechanic', counts['mechanic'])
+        part_ids = self._ids('inventory', counts['inventory'])
+        for i in self._ids('service_ticket', count):
+            created = EPOCH + timedelta(minutes=i % 525600)
+            parts = self.rng.sample(part_ids, self.rng.randint(0, min(4, len(part_ids))))
+            mechanic_links.extend(
+                {'service_ticket_id': i, 'mechanic_id': mechanic_id}
+                for mechanic_id in self.rng.sample(mechanic_ids, self.rng.randint(1, min(3, len(mechanic_ids))))
+            )
+            part_links.extend({'service_ticket_id': i, 'inventory_id': part_id} for part_id in parts)
+            yield {
+                'id': i, 'customer_id': self.rng.choice(customer_ids),
+                'vehicle_info': f'{self.rng.randint(2005, 2024)} {self.rng.choice(VEHICLES)}',
+                'issue_description': self.rng.choice(ISSUES),
+                'status': self.rng.choice(STATUSES), 'priority': self.rng.choice(PRIORITIES),
+                'estimated_hours': self.rng.randint(1, 16) / 2,
+                'total_cost': round(sum(prices[p - part_ids.start] for p in parts), 2),
+                'created_at': created, 'updated_at': created,
+            }
+
+    def run(self, tickets, counts):
+        """Generate everything; returns {table: (rows, seconds)}"""
+        self.echo(f"Seeding {counts['customer']} customers, {counts['mechanic']} mechanics, "
+                  f"{counts['inventory']} parts, {tickets} tickets")
+        self._write(Customer.__table__, self.customers(counts['customer']))
+        self._write(Mechanic.__table__, self.mechanics(counts['mechanic']))
+        prices = []
+        self._write(Inventory.__table__, self.parts(counts['inventory'], prices))
+
+        # Tickets stream in chunks; their link rows follow each chunk so
+        # memory stays flat however many tickets are requested.
+        mechanic_links, part_links = [], []
+        ticket_stream = self.tickets(tickets, counts, prices, mechanic_links, part_links)
+        remaining = tickets
+        while remaining:
+            chunk = min(remaining, self.batch_size * 10)
+            self._write(ServiceTicket.__table__, (next(ticket_stream) for _ in range(chunk)))
+            self._write(service_mechanic, mechanic_links)
+            self._write(ticket_inventory, part_links)
+            mechanic_links.clear()
+            part_links.clear()
+            remaining -= chunk
+            self.echo(f"  {tickets - remaining}/{tickets} tickets")
+        return self.report
+
+
+def _max_ids():
+    return {
+        table.name: db.session.execute(select(func.max(table.c.id))).scalar() or 0
+        for table in (Customer.__table__, Mechanic.__table__, Inventory.__table__, ServiceTicket.__table__)
+    }
+
+
+def _reset_sequences(connection):
+    """Explicit ids bypass PostgreSQL sequences; move them past the new rows"""
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in ('customer', 'mechanic', 'inventory', 'service_ticket'):
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def seed_database(tickets, customers=None, mechanics=None, parts=None, seed=42,
+                  batch_size=DEFAULT_BATCH_SIZE, password=DEFAULT_PASSWORD, echo=None):
+    """Append a generated dataset to the current app's database and commit.
+
+    Returns ``{table name: (rows, seconds)}``.
+    """
+    counts = default_counts(tickets)
+    counts.update({name: value for name, value in
+                   (('customer', customers), ('mechanic', mechanics), ('inventory', parts))
+                   if value})
+    connection = db.session.connection()
+    seeder = Seeder(writer_for(connection), seed=seed, batch_size=batch_size, password=password,
+                    offsets=_max_ids(), echo=echo)
+    try:
+        report = seeder.run(tickets, counts)
+        _reset_sequences(connection)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
+
+
+def init_seed_command(app):
+    """Register ``flask seed``"""
+
+    @app.cli.command('seed')
+    @click.option('--tickets', default=1000, show_default=True, help='Service tickets to create.')
+    @click.option('--customers', type=int, help='Customers (default: tickets / 10).')
+    @click.option('--mechanics', type=int, help='Mechanics (default: tickets / 200).')
+    @click.option('--parts', type=int, help='Inventory parts (default: tickets / 100).')
+    @click.option('--seed', 'seed_value', default=42, show_default=True, help='Random seed.')
+    @click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True)
+    @click.option('--password', default=DEFAULT_PASSWORD, show_default=True,
+                  help='Password for every generated account.')
+    @click.option('--create-tables', is_flag=True, help='Run db.create_all() first.')
+    def seed_command(tickets, customers, mechanics, parts, seed_value, batch_size, password, create_tables):
+        """Generate a large synthetic dataset."""
+        if create_tables:
+            db.create_all()
+        start = time.perf_counter()
+        report = seed_database(tickets, customers, mechanics, parts, seed=seed_value,
+                               batch_size=batch_size, password=password, echo=click.echo)
+        elapsed = time.perf_counter() - start
+
+        total = 0
+        for table, (rows, seconds) in report.items():
+            total += rows
+            rate = rows / seconds if seconds else 0
+            click.echo(f"  {table:<16} {rows:>10} rows  {rate:>12,.0f} rows/sec")
+        click.echo(f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/sec)")
+
+    # Mark as accessed to satisfy static analyzers
+    _ = seed_command
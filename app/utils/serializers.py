@@ -0,0 +1,116 @@
+"""
+Model serializers generated from the mapper metadata
+
+``to_dict()`` runs once per row of every list response. The hand-written
+versions went through the instrumented attribute descriptors one field at a
+time, and ``ServiceTicket.to_dict`` also imported ``Query`` and inspected
+the type of its relationship collections on every call.
+
+For each mapped model, :class:`ModelSerializer` generates (``exec``) two
+straight-line functions from the table's columns, once:
+
+* ``one(obj)`` - an ORM instance to a dict. Loaded values are read from the
+  instance ``__dict__``; if any field is expired or not loaded, the same
+  dict is built through normal attribute access, which loads it.
+* ``row(row)`` - a Core ``Row`` (or any tuple) selected with
+  ``serializer.select()`` to a dict, by position. No ORM instance is built.
+
+A model can declare ``__serialize_exclude__`` (columns to leave out, e.g.
+password hashes) and ``__serialize_nested__`` (relationships to include,
+serialized with the related model's own serializer). Dynamic relationships
+are read with ``.all()``; that is decided when the code is generated, not per
+row. Row serializers cover columns only.
+"""
+import threading
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import configure_mappers
+
+_serializers = {}
+_lock = threading.RLock()  # nested serializers are built while holding it
+
+
+class ModelSerializer:
+    """Generated dict serializers for one mapped class"""
+
+    def __init__(self, model):
+        self.model = model
+        mapper = inspect(model)
+        exclude = set(getattr(model, '__serialize_exclude__', ()))
+        # (attribute name, Column) in table order
+        self.fields = []
+        for column in model.__table__.columns:
+            key = mapper.get_property_by_column(column).key
+            if key not in exclude:
+                self.fields.append((key, column))
+        self.columns = [column for _key, column in self.fields]
+        # (relationship name, related class, dynamic?)
+        self.nested = []
+        for name in getattr(model, '__serialize_nested__', ()):
+            relationship = mapper.relationships[name]
+            self.nested.append((name, relationship.mapper.class_, relationship.lazy == 'dynamic'))
+        self.one = self._compile_one()
+        self.row = self._compile_row()
+
+    def _compile_one(self):
+        namespace = {}
+        direct = [f"{key!r}: d[{key!r}]" for key, _column in self.fields]
+        loaded = [f"{key!r}: obj.{key}" for key, _column in self.fields]
+        for index, (name, target, dynamic) in enumerate(self.nested):
+            namespace[f'_nested{index}'] = serializer_for(target).one
+            collection = f"obj.{name}.all()" if dynamic else f"d[{name!r}]"
+            direct.append(f"{name!r}: [_nested{index}(item) for item in {collection}]")
+            collection = f"obj.{name}.all()" if dynamic else f"obj.{name}"
+            loaded.append(f"{name!r}: [_nested{index}(item) for item in {collection}]")
+        source = (
+            "def serialize(obj):\n"
+            "    d = obj.__dict__\n"
+            "    try:\n"
+            f"        return {{{', '.join(direct)}}}\n"
+            "    except KeyError:\n"
+            "        # expired after a commit, deferred or not loaded: go through the descriptors\n"
+            f"        return {{{', '.join(loaded)}}}\n"
+        )
+        return self._define('serialize', source, namespace)
+
+    def _compile_row(self):
+        items = ', '.join(f"{key!r}: row[{index}]" for index, (key, _column) in enumerate(self.fields))
+        return self._define('serialize_row', f"def serialize_row(row):\n    return {{{items}}}\n", {})
+
+    def _define(self, name, source, namespace):
+        exec(compile(source, f'<{name} {self.model.__name__}>', 'exec'), namespace)  # noqa: S102
+        function = namespace[name]
+        function.__source__ = source
+        return function
+
+    def select(self):
+        """``SELECT`` of exactly the serialized columns, in ``row()`` order"""
+        return select(*self.columns)
+
+    def many(self, objs):
+        one = self.one
+        return [one(obj) for obj in objs]
+
+    def rows(self, rows):
+        row = self.row
+        return [row(r) for r in rows]
+
+
+def serializer_for(model):
+    """The (cached) serializer for ``model``"""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        with _lock:
+            serializer = _serializers.get(model)
+            if serializer is None:
+                configure_mappers()
+                serializer = ModelSerializer(model)
+                _serializers[model] = serializer
+    return serializer
+
+
+def init_serializers(db):
+    """Generate the serializers of every mapped model up front"""
+    configure_mappers()
+    for mapper in db.Model.registry.mappers:
+        serializer_for(mapper.class_)
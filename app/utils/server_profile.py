@@ -0,0 +1,115 @@
+"""
+Production server profile: worker sizing, fork safety and warm-up
+
+Used by ``gunicorn.conf.py``:
+
+* :func:`available_cpus` - CPUs this process may actually use: the cgroup
+  CPU quota when the container has one (a 0.5 CPU instance on a 16 core
+  host is 1, not 16), else the scheduler affinity mask.
+* :func:`default_workers` / :func:`default_threads` - worker and thread
+  counts per worker class. ``gthread`` workers are mostly waiting on the
+  database, so they get ``2 * cpus + 1`` processes of 4 threads. ``gevent``
+  runs one process per CPU with many greenlets each.
+* :func:`dispose_engines` - for ``preload_app``. The app, and with it the
+  SQLAlchemy engine, is created once in the master and forked into every
+  worker. A pooled connection inherited that way would be one socket
+  shared by several processes, so each worker drops the inherited pool
+  (without closing the parent's connections) and starts its own.
+* :func:`warm_up` - run in each worker before it accepts traffic. It opens
+  the pool connections the worker's threads will need and sends a few
+  requests through the full stack, so the first real requests do not pay
+  for connects, statement compilation and empty caches.
+"""
+import math
+import os
+import time
+
+WORKER_CLASSES = ('gthread', 'gevent', 'sync')
+# Public, cacheable and cheap: safe to request at every worker start
+WARMUP_PATHS = ('/health', '/inventory/', '/mechanics/')
+
+
+def available_cpus(cgroup_root='/sys/fs/cgroup'):
+    """CPUs available to this process, honouring a cgroup (v2 or v1) quota"""
+    quota = None
+    try:
+        with open(os.path.join(cgroup_root, 'cpu.max')) as f:
+            limit, period = f.read().split()[:2]
+        if limit != 'max':
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_quota_us')) as f:
+                limit = int(f.read())
+            with open(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_period_us')) as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        cpus = os.cpu_count() or 1
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def default_workers(worker_class, cpus):
+    if worker_class == 'gevent':
+        return cpus
+    return 2 * cpus + 1
+
+
+def default_threads(worker_class):
+    return 4 if worker_class == 'gthread' else 1
+
+
+def dispose_engines(app):
+    """Give a forked worker its own connection pools (see the module docstring)"""
+    from app import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def warm_up(app, connections=1, paths=WARMUP_PATHS):
+    """Open ``connections`` pool connections and request ``paths``
+
+    Returns ``{'connections': n, 'requests': [(path, status, ms), ...],
+    'seconds': total}``. Failures are reported, not raised: a worker that
+    could not warm up still serves traffic.
+    """
+    from sqlalchemy import text
+
+    from app import db
+
+    start = time.perf_counter()
+    report = {'connections': 0, 'requests': []}
+    with app.app_context():
+        # All at once, so the pool really grows to `connections`
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = db.engine.connect()
+                opened.append(conn)
+                conn.execute(text('SELECT 1'))
+        except Exception as e:
+            app.logger.warning("Warm-up could not open a database connection: %s", e)
+        finally:
+            report['connections'] = len(opened)
+            for conn in opened:
+                conn.close()
+
+    client = app.test_client()
+    for path in paths:
+        request_start = time.perf_counter()
+        try:
+            status = client.get(path).status_code
+        except Exception as e:
+            app.logger.warning("Warm-up request to %s failed: %s", path, e)
+            status = None
+        report['requests'].append((path, status, round((time.perf_counter() - request_start) * 1000, 1)))
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
@@ -0,0 +1,269 @@
+"""
+Flask-Caching backend shared by all gunicorn workers on one host
+
+Entries live in a SQLite database in WAL mode, so every worker reads and
+writes the same store without an external service. Deleting a key (or
+clearing the cache) is therefore visible to all workers immediately.
+
+    CACHE_TYPE = 'app.utils.shared_cache.SQLiteCache'
+    CACHE_DIR = '/tmp'                    # or CACHE_SQLITE_PATH for a full path
+    CACHE_MAX_BYTES = 64 * 1024 * 1024    # LRU eviction above this budget
+
+With ``CACHE_IGNORE_ERRORS`` a locked or unreadable database file makes
+every operation behave like a cache miss (``None``/``False``) instead of
+raising into the request.
+"""
+import functools
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+
+from flask_caching.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILENAME = 'mechanics_shop_cache.sqlite'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Reads refresh an entry's LRU timestamp at most this often, so a hot key
+# doesn't turn every cache hit into a write.
+TOUCH_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key      TEXT PRIMARY KEY,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    expires  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entry_accessed ON cache_entry (accessed);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_stats (id, total_bytes) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry BEGIN
+    UPDATE cache_stats SET total_bytes = total_bytes + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry BEGIN
+    UPDATE cache_stats SET total_bytes = total_bytes - OLD.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_update AFTER UPDATE OF size ON cache_entry BEGIN
+    UPDATE cache_stats SET total_bytes = total_bytes - OLD.size + NEW.size WHERE id = 1;
+END;
+"""
+
+# An upsert (rather than INSERT OR REPLACE) so the size triggers see the
+# overwrite as an UPDATE and keep total_bytes exact.
+UPSERT = """
+INSERT INTO cache_entry (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value, size = excluded.size,
+    expires = excluded.expires, accessed = excluded.accessed
+"""
+
+
+def _ignorable(default):
+    """Return ``default`` instead of raising database errors when ``ignore_errors`` is set"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except (sqlite3.Error, OSError) as e:
+                if not self.ignore_errors:
+                    raise
+                logger.warning("Shared cache %s: %s failed: %s", self.path, method.__name__, e)
+                return default
+        return wrapper
+    return decorator
+
+
+class SQLiteCache(BaseCache):
+    """Multi-process cache with TTLs and an LRU byte budget"""
+
+    def __init__(self, path=None, default_timeout=300, max_bytes=DEFAULT_MAX_BYTES,
+                 key_prefix='', ignore_errors=False):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path or os.path.join(tempfile.gettempdir(), DEFAULT_FILENAME)
+        self.max_bytes = int(max_bytes)
+        self.key_prefix = key_prefix or ''
+        self.ignore_errors = ignore_errors
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        path = config.get('CACHE_SQLITE_PATH')
+        if not path and config.get('CACHE_DIR'):
+            path = os.path.join(config['CACHE_DIR'], DEFAULT_FILENAME)
+        kwargs.update(
+            path=path,
+            max_bytes=config.get('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+            key_prefix=config.get('CACHE_KEY_PREFIX', ''),
+            ignore_errors=config['CACHE_IGNORE_ERRORS'],
+        )
+        return cls(*args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    @property
+    def _conn(self):
+        """One connection per thread, reopened after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _key(self, key):
+        return self.key_prefix + key
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0.0
+
+    # ------------------------------------------------------------------
+    # Cache API
+    # ------------------------------------------------------------------
+    @_ignorable(None)
+    def get(self, key):
+        key = self._key(key)
+        now = time.time()
+        row = self._conn.execute(
+            'SELECT value, expires, accessed FROM cache_entry WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires, accessed = row
+        if expires and expires <= now:
+            self._conn.execute('DELETE FROM cache_entry WHERE key = ? AND expires = ?', (key, expires))
+            return None
+        if now - accessed > TOUCH_INTERVAL:
+            self._conn.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        try:
+            return pickle.loads(value)
+        except Exception:
+            return None
+
+    @_ignorable(False)
+    def has(self, key):
+        row = self._conn.execute(
+            'SELECT expires FROM cache_entry WHERE key = ?', (self._key(key),)
+        ).fetchone()
+        return row is not None and (not row[0] or row[0] > time.time())
+
+    def set(self, key, value, timeout=None):
+        return self._store(key, value, timeout, replace=True)
+
+    def add(self, key, value, timeout=None):
+        return self._store(key, value, timeout, replace=False)
+
+    @_ignorable(False)
+    def _store(self, key, value, timeout, replace):
+        key = self._key(key)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        now = time.time()
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if not replace:
+                row = conn.execute('SELECT expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+                if row is not None and (not row[0] or row[0] > now):
+                    conn.execute('COMMIT')
+                    return False
+            conn.execute(UPSERT, (key, blob, len(blob), self._expires(timeout), now))
+            self._evict(conn, now)
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones, until under budget"""
+        total = conn.execute('SELECT total_bytes FROM cache_stats WHERE id = 1').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        conn.execute('DELETE FROM cache_entry WHERE expires > 0 AND expires <= ?', (now,))
+        total = conn.execute('SELECT total_bytes FROM cache_stats WHERE id = 1').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims, excess = [], total - self.max_bytes
+        for key, size in conn.execute('SELECT key, size FROM cache_entry ORDER BY accessed'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM cache_entry WHERE key = ?', victims)
+
+    @_ignorable(False)
+    def delete(self, key):
+        cursor = self._conn.execute('DELETE FROM cache_entry WHERE key = ?', (self._key(key),))
+        return cursor.rowcount > 0
+
+    def delete_many(self, *keys):
+        deleted = []
+        for key in keys:
+            if self.delete(key):
+                deleted.append(key)
+        return deleted
+
+    @_ignorable(False)
+    def clear(self):
+        if self.key_prefix:
+            escaped = self.key_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            self._conn.execute("DELETE FROM cache_entry WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+        else:
+            self._conn.execute('DELETE FROM cache_entry')
+        return True
+
+    @_ignorable(None)
+    def inc(self, key, delta=1):
+        """Atomically increment an integer value (missing keys start at 0)"""
+        full_key = self._key(key)
+        now = time.time()
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entry WHERE key = ?', (full_key,)
+            ).fetchone()
+            current, expires = 0, self._expires(None)
+            if row is not None and (not row[1] or row[1] > now):
+                current, expires = pickle.loads(row[0]), row[1]
+            value = int(current) + delta
+            blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            conn.execute(UPSERT, (full_key, blob, len(blob), expires, now))
+            conn.execute('COMMIT')
+            return value
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def total_bytes(self):
+        """Bytes currently held, as tracked against the budget"""
+        return self._conn.execute('SELECT total_bytes FROM cache_stats WHERE id = 1').fetchone()[0]
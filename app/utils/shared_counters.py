@@ -0,0 +1,333 @@
+"""
+Shared integer counters for all worker processes on one host
+
+The counters live in a fixed-size, open-addressing hash table inside an
+mmap'd file. Every gunicorn worker maps the same file, so an increment in
+one worker is immediately visible to the others. Updates are serialized
+with an exclusive ``flock`` on the file (plus a thread lock for threads in
+the same worker), which keeps a read-modify-write in the low microseconds.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single process only
+    fcntl = None
+
+MAGIC = b'MSCNTR01'
+HEADER = struct.Struct('<8sII')
+HEADER_SIZE = 64
+
+# hash (8) | value (8) | expiry (8) | key length (1) | key bytes
+SLOT = struct.Struct('<QqdB')
+SLOT_SIZE = 128
+MAX_KEY_BYTES = SLOT_SIZE - SLOT.size
+
+DEFAULT_SLOTS = 65536
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'mechanics_shop_counters.bin')
+
+# Longest probe from a key's home slot; past this the table counts as full
+MAX_PROBE = 256
+
+EMPTY_SLOT = bytes(SLOT_SIZE)
+
+# Expiry marker for cleared slots: already in the past, so the slot is
+# swept out like any expired counter.
+TOMBSTONE = 1.0
+
+
+class TableFull(RuntimeError):
+    """No free slot for a new counter"""
+
+
+def _key_hash(key_bytes):
+    """Stable 64-bit hash (Python's hash() is randomized per process)"""
+    digest = hashlib.blake2b(key_bytes, digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class SharedCounters:
+    """Process-shared counter table backed by an mmap'd file"""
+
+    def __init__(self, path=None, slots=DEFAULT_SLOTS):
+        self.path = path or DEFAULT_PATH
+        self.requested_slots = int(slots)
+        self._thread_lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self.slots = 0
+
+    # ------------------------------------------------------------------
+    # File management
+    # ------------------------------------------------------------------
+    def _open(self):
+        """(Re)open the mapping; called lazily and again after a fork"""
+        self.close()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                size = os.fstat(fd).st_size
+                if size >= HEADER_SIZE:
+                    magic, slots, slot_size = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+                    if magic != MAGIC or slot_size != SLOT_SIZE:
+                        raise ValueError(f"{self.path} is not a shared counter file")
+                else:
+                    slots = self.requested_slots
+                    os.ftruncate(fd, HEADER_SIZE + slots * SLOT_SIZE)
+                    os.pwrite(fd, HEADER.pack(MAGIC, slots, SLOT_SIZE), 0)
+            finally:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        except Exception:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        self._map = mmap.mmap(fd, HEADER_SIZE + slots * SLOT_SIZE)
+        self.slots = slots
+        self._pid = os.getpid()
+
+    def close(self):
+        """Release the mapping and file descriptor"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _acquire(self):
+        self._thread_lock.acquire()
+        try:
+            # flock locks belong to the open file description, which a
+            # forked child shares with its parent - so each process opens
+            # its own descriptor.
+            if self._pid != os.getpid():
+                self._open()
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except Exception:
+            self._thread_lock.release()
+            raise
+
+    def _release(self):
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    # ------------------------------------------------------------------
+    # Hash table
+    # ------------------------------------------------------------------
+    def _encode(self, key):
+        key_bytes = key.encode('utf-8')
+        return key_bytes, _key_hash(key_bytes), key_bytes[:MAX_KEY_BYTES]
+
+    def _find(self, key_hash, stored_key, now):
+        """Return (slot offset, live) for the key, or the empty slot to insert into.
+
+        The offset is None when the key is missing and there is no room for it.
+
+        A key is never stored more than ``MAX_PROBE`` slots past its home
+        slot, so lookups stop there. Expired and cleared counters on the
+        way are swept out of the cluster before inserting, so probe chains
+        do not keep growing as rate-limit windows come and go.
+        """
+        index = key_hash % self.slots
+        for _ in range(min(MAX_PROBE, self.slots)):
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            slot_hash, _value, expiry, length = SLOT.unpack_from(self._map, offset)
+            if slot_hash == 0:
+                return offset, False
+            if 0 < expiry <= now:
+                self._compact(index, now)
+                return self._find(key_hash, stored_key, now)
+            if slot_hash == key_hash and self._map[offset + SLOT.size:offset + SLOT.size + length] == stored_key:
+                return offset, True
+            index = (index + 1) % self.slots
+        return None, False
+
+    def _find_or_insert(self, key_hash, stored_key, now):
+        offset, live = self._find(key_hash, stored_key, now)
+        if offset is None:
+            raise TableFull(f"Shared counter table {self.path} is full")
+        return offset, live
+
+    def _compact(self, index, now):
+        """Rebuild the cluster holding ``index`` without its expired slots.
+
+        A cluster is a run of used slots between two empty ones; no probe
+        chain crosses an empty slot, so it can be rebuilt on its own.
+        Re-inserting the live counters in slot order puts each one at or
+        before its old position, which keeps it within ``MAX_PROBE``.
+        ``index`` must be an expired slot: it is where a cluster spanning
+        the whole table is cut open.
+        """
+        start = index
+        for _ in range(self.slots - 1):
+            previous = (start - 1) % self.slots
+            if SLOT.unpack_from(self._map, HEADER_SIZE + previous * SLOT_SIZE)[0] == 0:
+                break
+            start = previous
+        else:
+            start = index
+
+        live = []
+        index = start
+        for _ in range(self.slots):
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            slot_hash, value, expiry, length = SLOT.unpack_from(self._map, offset)
+            if slot_hash == 0:
+                break
+            if not 0 < expiry <= now:
+                live.append((slot_hash, bytes(self._map[offset + SLOT.size:offset + SLOT.size + length]),
+                             value, expiry))
+            self._map[offset:offset + SLOT_SIZE] = EMPTY_SLOT
+            index = (index + 1) % self.slots
+
+        for slot_hash, stored_key, value, expiry in live:
+            index = slot_hash % self.slots
+            while SLOT.unpack_from(self._map, HEADER_SIZE + index * SLOT_SIZE)[0]:
+                index = (index + 1) % self.slots
+            self._write(HEADER_SIZE + index * SLOT_SIZE, slot_hash, stored_key, value, expiry)
+
+    def _write(self, offset, key_hash, stored_key, value, expiry):
+        SLOT.pack_into(self._map, offset, key_hash, value, expiry, len(stored_key))
+        self._map[offset + SLOT.size:offset + SLOT.size + len(stored_key)] = stored_key
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def incr(self, key, amount=1, expiry=None):
+        """Add ``amount`` to a counter and return the new value.
+
+        ``expiry`` (seconds) only applies when the counter is created, so a
+        window started by one worker ends at the same time for all of them.
+        """
+        _, key_hash, stored_key = self._encode(key)
+        self._acquire()
+        try:
+            now = time.time()
+            offset, live = self._find_or_insert(key_hash, stored_key, now)
+            if live:
+                value = SLOT.unpack_from(self._map, offset)[1] + amount
+                struct.pack_into('<q', self._map, offset + 8, value)
+            else:
+                value = amount
+                self._write(offset, key_hash, stored_key, value, now + expiry if expiry else 0.0)
+            return value
+        finally:
+            self._release()
+
+    def incr_many(self, amounts):
+        """Apply several increments under a single lock acquisition.
+
+        ``amounts`` is an iterable of ``(key, amount)`` pairs for counters
+        that never expire (metrics, not rate limits).
+        """
+        encoded = [(self._encode(key), amount) for key, amount in amounts]
+        self._acquire()
+        try:
+            now = time.time()
+            for (_, key_hash, stored_key), amount in encoded:
+                offset, live = self._find_or_insert(key_hash, stored_key, now)
+                if live:
+                    value = SLOT.unpack_from(self._map, offset)[1] + amount
+                    struct.pack_into('<q', self._map, offset + 8, value)
+                else:
+                    self._write(offset, key_hash, stored_key, amount, 0.0)
+        finally:
+            self._release()
+
+    def set(self, key, value, expiry=None):
+        """Overwrite a counter value"""
+        _, key_hash, stored_key = self._encode(key)
+        self._acquire()
+        try:
+            now = time.time()
+            offset, _live = self._find_or_insert(key_hash, stored_key, now)
+            self._write(offset, key_hash, stored_key, int(value), now + expiry if expiry else 0.0)
+        finally:
+            self._release()
+
+    def get(self, key):
+        """Current value of a counter (0 when missing or expired)"""
+        _, key_hash, stored_key = self._encode(key)
+        self._acquire()
+        try:
+            offset, live = self._find(key_hash, stored_key, time.time())
+            return SLOT.unpack_from(self._map, offset)[1] if live else 0
+        finally:
+            self._release()
+
+    def get_expiry(self, key):
+        """Absolute expiry timestamp of a counter (0.0 if it never expires)"""
+        _, key_hash, stored_key = self._encode(key)
+        self._acquire()
+        try:
+            offset, live = self._find(key_hash, stored_key, time.time())
+            return SLOT.unpack_from(self._map, offset)[2] if live else 0.0
+        finally:
+            self._release()
+
+    def clear(self, key):
+        """Remove a single counter"""
+        _, key_hash, stored_key = self._encode(key)
+        self._acquire()
+        try:
+            now = time.time()
+            offset, live = self._find(key_hash, stored_key, now)
+            if live:
+                self._write(offset, key_hash, stored_key, 0, TOMBSTONE)
+                self._compact((offset - HEADER_SIZE) // SLOT_SIZE, now)
+        finally:
+            self._release()
+
+    def items(self, prefix=''):
+        """Snapshot of all live (key, value) pairs starting with ``prefix``"""
+        prefix_bytes = prefix.encode('utf-8')
+        result = []
+        self._acquire()
+        try:
+            now = time.time()
+            for index in range(self.slots):
+                offset = HEADER_SIZE + index * SLOT_SIZE
+                slot_hash, value, expiry, length = SLOT.unpack_from(self._map, offset)
+                if slot_hash == 0 or 0 < expiry <= now:
+                    continue
+                key = bytes(self._map[offset + SLOT.size:offset + SLOT.size + length])
+                if key.startswith(prefix_bytes):
+                    result.append((key.decode('utf-8', 'replace'), value))
+        finally:
+            self._release()
+        return result
+
+    def reset(self):
+        """Drop every counter; returns how many live counters were removed"""
+        self._acquire()
+        try:
+            now = time.time()
+            removed = 0
+            for index in range(self.slots):
+                offset = HEADER_SIZE + index * SLOT_SIZE
+                slot_hash, _value, expiry, _length = SLOT.unpack_from(self._map, offset)
+                if slot_hash and not 0 < expiry <= now:
+                    removed += 1
+            self._map[HEADER_SIZE:] = bytes(self.slots * SLOT_SIZE)
+            return removed
+        finally:
+            self._release()
@@ -0,0 +1,105 @@
+"""
+Cold-start measurement: ``flask startup-profile``
+
+Starts a fresh interpreter that imports the WSGI module (``flask_app`` by
+default) and serves one ``/health`` request, and reports:
+
+* wall time from process start to the first served request, split into
+  interpreter start, import + ``create_app`` and the first request;
+* the packages and modules that dominate import time, from
+  ``python -X importtime``.
+
+Instances on plans that sleep when idle pay this on the first request
+after waking, so keep an eye on it when adding dependencies.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_CHILD = '''
+import importlib, json, sys, time
+started = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+app = getattr(module, 'app', None) or module.create_app()
+imported = time.perf_counter()
+status = app.test_client().get('/health').status_code
+served = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - started,
+    'first_request_s': served - imported,
+    'status': status,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def _run(args, env=None):
+    return subprocess.run([sys.executable, *args], cwd=PROJECT_ROOT, env=env,
+                          capture_output=True, text=True, check=False)
+
+
+def measure_cold_start(module='flask_app', env=None):
+    """Time a fresh process from start to its first served request"""
+    start = time.perf_counter()
+    result = _run(['-c', _CHILD, module], env=env)
+    total = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['total_s'] = total
+    report['interpreter_s'] = total - report['import_s'] - report['first_request_s']
+    return report
+
+
+def import_times(module='flask_app', env=None):
+    """``[(module, self_us, cumulative_us)]`` from ``python -X importtime``"""
+    result = _run(['-X', 'importtime', '-c', f'import {module}'], env=env)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def by_package(rows):
+    """Self time summed per top-level package, largest first"""
+    totals = {}
+    for name, self_us, _cumulative in rows:
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def init_startup_profile_command(app):
+    """Register ``flask startup-profile``"""
+
+    @app.cli.command('startup-profile')
+    @click.option('--module', default='flask_app', show_default=True, help='Module that builds the app.')
+    @click.option('--top', default=15, show_default=True, help='Rows per table.')
+    def startup_profile(module, top):
+        """Report cold-start time and the slowest imports."""
+        report = measure_cold_start(module)
+        click.echo(f"Cold start of {module}: {report['total_s'] * 1000:.0f} ms to first request")
+        click.echo(f"  interpreter      {report['interpreter_s'] * 1000:>8.0f} ms")
+        click.echo(f"  import + app     {report['import_s'] * 1000:>8.0f} ms")
+        click.echo(f"  first request    {report['first_request_s'] * 1000:>8.0f} ms  (status {report['status']})")
+
+        rows = import_times(module)
+        click.echo(f"\nImport time by package (self, {len(rows)} modules)")
+        for package, self_us in by_package(rows)[:top]:
+            click.echo(f"  {package:<28} {self_us / 1000:>8.1f} ms")
+
+        click.echo("\nSlowest modules (cumulative)")
+        for name, _self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+            click.echo(f"  {name:<44} {cumulative_us / 1000:>8.1f} ms")
+
+    # Mark as accessed to satisfy static analyzers
+    _ = startup_profile
@@ -0,0 +1,204 @@
+"""
+Ticket list documents built by the database (``SQL_JSON_TICKETS``)
+
+The ticket list endpoints spend most of their time building
+``ServiceTicket``, ``Mechanic`` and ``Inventory`` instances, only to turn
+them straight back into dicts and then JSON. With ``SQL_JSON_TICKETS`` on,
+each ticket document - nested mechanics and parts included - is built by
+the database instead:
+
+* SQLite: ``json_object`` / ``json_group_array`` (the JSON1 functions built
+  into every supported SQLite);
+* PostgreSQL: ``json_build_object`` / ``json_agg``.
+
+The rows are streamed into the response as they are, inside the usual
+``{"data": {"count": ..., "tickets": [...]}, "success": true}`` envelope.
+Nothing is parsed or re-encoded in Python. The count comes from a
+``count(*) OVER ()`` on the same query.
+
+The documents match ``ServiceTicket.to_dict()`` as the JSON provider
+writes it: the same fields (taken from the generated serializers), sorted
+keys, ISO 8601 timestamps, booleans as ``true``/``false``, and tickets,
+mechanics and parts ordered by id. On SQLite the body is byte-for-byte
+the ORM path's: SQLite's own JSON functions print REAL values with 15
+significant digits (``34.34`` for ``29.99 + 4.35``, which the ORM path
+writes as ``34.339999999999996``), so float columns are written by a
+``json_float`` SQL function registered on the connection that calls the
+response encoder (:func:`app.utils.json_provider.float_text`). PostgreSQL
+formats its ``json`` output with spaces and writes integral floats without
+``.0``, so there the body parses to the same document but differs in
+whitespace. Debug (pretty-printed) responses always take the ORM path.
+"""
+from flask import current_app, stream_with_context
+from sqlalchemy import (
+    Boolean, DateTime, Float, Integer, String, Text, bindparam, case, cast, func, literal, select, type_coerce,
+)
+
+from app import db
+from app.extensions import service_mechanic, ticket_inventory
+from app.models import Inventory, Mechanic, ServiceTicket
+from app.utils.json_provider import float_text
+from app.utils.serializers import serializer_for
+
+SUPPORTED_DIALECTS = ('sqlite', 'postgresql')
+CHUNK_ROWS = 500
+JSON_FLOAT = 'json_float'
+
+
+def _json_float(value):
+    return None if value is None else float_text(value)
+
+
+def _register_sqlite_functions(connection):
+    """Define ``json_float`` on the pooled SQLite connection, once"""
+    pooled = connection.connection
+    if not pooled.info.get(JSON_FLOAT):
+        pooled.driver_connection.create_function(JSON_FLOAT, 1, _json_float, deterministic=True)
+        pooled.info[JSON_FLOAT] = True
+
+
+def _sqlite_value(column):
+    if isinstance(column.type, DateTime):
+        raw = type_coerce(column, String)
+        # Stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]'; isoformat() drops a zero fraction
+        return case(
+            (func.substr(raw, 20) == '.000000', func.replace(func.substr(raw, 1, 19), ' ', 'T')),
+            else_=func.replace(raw, ' ', 'T'),
+        )
+    if isinstance(column.type, Boolean):
+        # Stored as 0/1; embed real JSON booleans
+        return func.json(case((column.is_(None), 'null'), (column != 0, 'true'), else_='false'))
+    if isinstance(column.type, Float):
+        # json_object would print 15 significant digits; embed the encoder's text
+        return func.json(func.json_float(column))
+    return column
+
+
+def _postgresql_value(column):
+    if isinstance(column.type, DateTime):
+        fraction = case(
+            (func.mod(cast(func.date_part('microseconds', column), Integer), 1000000) != 0,
+             func.to_char(column, '.US')),
+            else_='',
+        )
+        return func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS').concat(fraction)
+    return column
+
+
+class TicketDocuments:
+    """SQL that renders ticket documents for one dialect"""
+
+    def __init__(self, dialect):
+        if dialect not in SUPPORTED_DIALECTS:
+            raise ValueError(f"SQL-built JSON is not available on {dialect}")
+        self.dialect = dialect
+        self.value = _sqlite_value if dialect == 'sqlite' else _postgresql_value
+        self._statements = {}
+
+    def _object(self, model, extra=()):
+        pairs = [(key, self.value(column)) for key, column in serializer_for(model).fields]
+        pairs.extend(extra)
+        args = []
+        for key, value in sorted(pairs, key=lambda pair: pair[0]):
+            args.extend((literal(key), value))
+        build = func.json_object if self.dialect == 'sqlite' else func.json_build_object
+        return build(*args)
+
+    def _arrays(self, model, link, link_column, tickets):
+        """``(ticket id, JSON array of its model documents by id)`` for ``tickets``
+
+        One grouped pass over the link table; a correlated subquery per
+        ticket would rescan the (unindexed) link table for every row.
+        """
+        ticket_id = link.c.service_ticket_id
+        joined = (model.__table__.join(link, link.c[link_column] == model.id))
+        if self.dialect == 'sqlite':
+            ordered = (select(ticket_id.label('ticket_id'), self._object(model).label('doc'))
+                       .select_from(joined).where(ticket_id.in_(tickets))
+                       .order_by(ticket_id, model.id).subquery())
+            documents = func.json_group_array(func.json(ordered.c.doc))
+            return (select(ordered.c.ticket_id, documents.label('documents'))
+                    .group_by(ordered.c.ticket_id).subquery())
+        from sqlalchemy.dialects.postgresql import aggregate_order_by
+        documents = func.json_agg(aggregate_order_by(self._object(model), model.id))
+        return (select(ticket_id.label('ticket_id'), documents.label('documents'))
+                .select_from(joined).where(ticket_id.in_(tickets))
+                .group_by(ticket_id).subquery())
+
+    def _embed(self, arrays):
+        if self.dialect == 'sqlite':
+            return func.json(func.coalesce(arrays.c.documents, '[]'))
+        from sqlalchemy.dialects.postgresql import JSON
+        return func.coalesce(arrays.c.documents, cast(literal('[]'), JSON))
+
+    def statement(self, *filters):
+        """``(count, document)`` rows for the tickets whose ``filters`` columns
+        equal the bound parameters of the same names
+
+        Built once per set of filter columns: the statement is large enough
+        that constructing it and computing its cache key per request would
+        cost more than running it on a short list.
+        """
+        filters = tuple(sorted(filters))
+        statement = self._statements.get(filters)
+        if statement is None:
+            statement = self._statements[filters] = self._build(
+                [getattr(ServiceTicket, name) == bindparam(name) for name in filters])
+        return statement
+
+    def _build(self, criteria):
+        tickets = select(ServiceTicket.id).where(*criteria)
+        mechanics = self._arrays(Mechanic, service_mechanic, 'mechanic_id', tickets)
+        inventory = self._arrays(Inventory, ticket_inventory, 'inventory_id', tickets)
+        document = self._object(ServiceTicket, extra=(
+            ('mechanics', self._embed(mechanics)),
+            ('inventory', self._embed(inventory)),
+        ))
+        source = (ServiceTicket.__table__
+                  .outerjoin(mechanics, mechanics.c.ticket_id == ServiceTicket.id)
+                  .outerjoin(inventory, inventory.c.ticket_id == ServiceTicket.id))
+        return (select(func.count().over(), cast(document, Text))
+                .select_from(source)
+                .where(*criteria)
+                .order_by(ServiceTicket.id))
+
+
+_documents = {}
+
+
+def documents_for(dialect):
+    if dialect not in _documents:
+        _documents[dialect] = TicketDocuments(dialect)
+    return _documents[dialect]
+
+
+def _stream(result, first_chunk):
+    """The response body: envelope around the documents, CHUNK_ROWS at a time"""
+    count = first_chunk[0][0] if first_chunk else 0
+    yield b'{"data":{"count":%d,"tickets":[' % count
+    chunk, separator = first_chunk, b''
+    while chunk:
+        yield separator + b','.join(document.encode('utf-8') for _count, document in chunk)
+        separator = b','
+        chunk = result.fetchmany(CHUNK_ROWS)
+    yield b']},"success":true}\n'
+
+
+def ticket_list_response(**filters):
+    """Streamed SQL-built ticket list, or None when the ORM path must answer
+
+    ``filters`` are ``ServiceTicket`` column values to match, as for
+    ``filter_by``. The query runs (and its first rows are fetched) before this returns, so
+    database errors surface in the calling view, not mid-stream.
+    """
+    app = current_app._get_current_object()
+    dialect = db.engine.dialect.name
+    pretty = (app.json.compact is None and app.debug) or app.json.compact is False
+    if not app.config.get('SQL_JSON_TICKETS') or pretty or dialect not in SUPPORTED_DIALECTS:
+        return None
+    if dialect == 'sqlite':
+        _register_sqlite_functions(db.session.connection())
+    result = db.session.execute(documents_for(dialect).statement(*filters), filters)
+    first_chunk = result.fetchmany(CHUNK_ROWS)
+    body = stream_with_context(_stream(result, first_chunk))
+    return app.response_class(body, mimetype=app.json.mimetype)
@@ -0,0 +1,97 @@
+"""
+Compact ticket lists with side-loaded mechanics and parts (``?compact=1``)
+
+A full ticket list embeds every assigned mechanic and part inside every
+ticket, so a mechanic on 300 tickets is serialized and sent 300 times. In
+the compact mode (JSON:API style) each ticket carries only
+``mechanic_ids`` and ``part_ids``, and each referenced mechanic or part is
+serialized once into a top-level ``included`` map keyed by id::
+
+    {"success": true,
+     "data": {"count": 2, "tickets": [{..., "mechanic_ids": [1], "part_ids": [4, 7]}, ...]},
+     "included": {"mechanics": {"1": {...}}, "parts": {"4": {...}, "7": {...}}}}
+
+Nothing goes through the ORM: tickets, link rows and related rows are read
+as Core rows and serialized with the generated row serializers, so the
+cost per ticket is its columns plus a list of ids, and the cost of a
+related row is paid once however many tickets reference it. Five queries
+per list, whatever its size.
+
+:class:`TicketListQuery` keeps the statements apart from their execution,
+so the ASGI read endpoints (``app.utils.async_reads``) run the same ones
+on an async connection, and also build the embedded form from them.
+"""
+from flask import request
+from sqlalchemy import select
+
+from app import db
+from app.extensions import service_mechanic, ticket_inventory
+from app.models import Inventory, Mechanic, ServiceTicket
+from app.utils.serializers import serializer_for
+
+# (relationship, included key, ticket key, related model, link table, link column)
+SIDELOADED = (
+    ('mechanics', 'mechanics', 'mechanic_ids', Mechanic, service_mechanic, 'mechanic_id'),
+    ('inventory', 'parts', 'part_ids', Inventory, ticket_inventory, 'inventory_id'),
+)
+
+
+def wants_compact(args=None):
+    """Whether the request (or the query ``args``) asked for the compact, side-loaded list"""
+    if args is None:
+        args = request.args
+    return args.get('compact', '').lower() in ('1', 'true', 'yes')
+
+
+class TicketListQuery:
+    """The Core statements behind a ticket list, and the payloads built from their rows
+
+    ``filters`` are ``ServiceTicket`` column values, as for ``filter_by``.
+    Run every statement in :attr:`statements` order and pass the row lists
+    to :meth:`compact` or :meth:`embedded`. Tickets and every id list are
+    ordered by id.
+    """
+
+    def __init__(self, **filters):
+        criteria = [getattr(ServiceTicket, name) == value for name, value in filters.items()]
+        self.serializer = serializer_for(ServiceTicket)
+        self.statements = [self.serializer.select().where(*criteria).order_by(ServiceTicket.id)]
+        matching = select(ServiceTicket.id).where(*criteria)
+        for _name, _included, _key, model, link, link_column in SIDELOADED:
+            ticket_id, related_id = link.c.service_ticket_id, link.c[link_column]
+            self.statements.append(
+                select(ticket_id, related_id).where(ticket_id.in_(matching)).order_by(ticket_id, related_id)
+            )
+            referenced = select(related_id).where(ticket_id.in_(matching))
+            self.statements.append(
+                serializer_for(model).select().where(model.id.in_(referenced)).order_by(model.id)
+            )
+
+    def compact(self, results):
+        """``(data, included)``: tickets with id lists, related rows by id"""
+        tickets = self.serializer.rows(results[0])
+        included = {}
+        for index, (_name, name, key, model, _link, _column) in enumerate(SIDELOADED):
+            links, related_rows = results[1 + 2 * index], results[2 + 2 * index]
+            by_ticket = {}
+            for ticket, related in links:
+                by_ticket.setdefault(ticket, []).append(related)
+            for ticket in tickets:
+                ticket[key] = by_ticket.get(ticket['id'], [])
+            included[name] = {str(item['id']): item for item in serializer_for(model).rows(related_rows)}
+        return {'tickets': tickets, 'count': len(tickets)}, included
+
+    def embedded(self, results):
+        """The ``ServiceTicket.to_dict()`` form: related rows nested in every ticket"""
+        data, included = self.compact(results)
+        for name, included_name, key, _model, _link, _column in SIDELOADED:
+            related = included[included_name]
+            for ticket in data['tickets']:
+                ticket[name] = [related[str(related_id)] for related_id in ticket.pop(key)]
+        return data
+
+
+def compact_ticket_list(**filters):
+    """``(data, included)`` for the tickets matching ``filters``"""
+    query = TicketListQuery(**filters)
+    return query.compact([db.session.execute(statement).all() for statement in query.statements])
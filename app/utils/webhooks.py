@@ -0,0 +1,484 @@
+"""
+Outbound webhooks: a transactional outbox and a batching delivery worker
+
+Integrations (parts suppliers, the customer SMS service) want to hear about
+new tickets, status changes and stock movements without polling the API.
+
+* Routes call :func:`emit_event` next to the change. The event is written
+  to ``webhook_event`` by the same commit as the change (the outbox), so a
+  rolled-back request sends nothing and a committed one is never lost,
+  even if no worker is running. Nothing is written unless
+  ``WEBHOOKS_ENABLED`` is set.
+* ``flask webhooks deliver`` runs :class:`WebhookDispatcher` as its own
+  process. Each pass fans new events out into one ``webhook_delivery`` row
+  per matching subscription, leases the due deliveries (``SKIP LOCKED`` on
+  PostgreSQL, so several workers can run), and POSTs them batched per
+  subscription - up to ``WEBHOOK_BATCH_SIZE`` events in one
+  ``{"events": [...]}`` body - from a thread pool over keep-alive
+  connections.
+* A 2xx marks the batch delivered. Anything else is retried with
+  exponential backoff and jitter, up to ``WEBHOOK_MAX_ATTEMPTS`` attempts,
+  after which the deliveries are marked failed.
+
+Delivery is at least once: receivers should skip event ids they have seen.
+Every body is signed with the subscription's secret in
+``X-Webhook-Signature: t=<unix time>,v1=<hex HMAC-SHA256 of "<t>.<body>">``;
+:func:`verify_signature` checks one.
+"""
+import hashlib
+import hmac
+import http.client
+import json
+import random
+import secrets
+import signal
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import click
+from flask import current_app
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import WebhookDelivery, WebhookEvent, WebhookSubscription
+
+PENDING_EVENTS = 'webhook_events'
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+USER_AGENT = 'MechanicsShop-Webhooks/1.0'
+
+
+def _utcnow():
+    # Naive UTC, like the other DateTime columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def emit_event(event_type, build, *args):
+    """Write a ``event_type`` event with the current session's next commit
+
+    ``build(*args)`` returns the event's data. It runs just before the
+    commit, after a flush, so new rows already have their ids.
+    """
+    if not current_app.config.get('WEBHOOKS_ENABLED'):
+        return
+    db.session.info.setdefault(PENDING_EVENTS, []).append((event_type, build, args))
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_pending_events(session):
+    pending = session.info.pop(PENDING_EVENTS, None)
+    if not pending:
+        return
+    session.flush()
+    now = _utcnow()
+    session.add_all([
+        WebhookEvent(event_type=event_type, payload=current_app.json.dumps(build(*args)), created_at=now)
+        for event_type, build, args in pending
+    ])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending_events(session):
+    session.info.pop(PENDING_EVENTS, None)
+
+
+def ticket_payload(ticket, previous_status=None):
+    """Data for ``ticket.*`` events"""
+    data = {
+        "ticket_id": ticket.id,
+        "customer_id": ticket.customer_id,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "total_cost": ticket.total_cost,
+    }
+    if previous_status is not None:
+        data["previous_status"] = previous_status
+    return data
+
+
+def stock_payload(part, previous_quantity, reason, ticket_id=None):
+    """Data for ``inventory.stock_changed`` events"""
+    data = {
+        "part_id": part.id,
+        "part_number": part.part_number,
+        "part_name": part.part_name,
+        "quantity": part.quantity,
+        "previous_quantity": previous_quantity,
+        "change": part.quantity - previous_quantity,
+        "reason": reason,
+        "below_min_stock": part.quantity < (part.min_stock_level or 0),
+    }
+    if ticket_id is not None:
+        data["ticket_id"] = ticket_id
+    return data
+
+
+def sign(secret, body, timestamp=None):
+    """The ``X-Webhook-Signature`` value for ``body`` (bytes)"""
+    timestamp = int(time.time() if timestamp is None else timestamp)
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+def verify_signature(secret, body, header, tolerance=300, now=None):
+    """Whether ``header`` signs ``body`` with ``secret`` within ``tolerance`` seconds"""
+    try:
+        fields = dict(item.split('=', 1) for item in header.split(','))
+        timestamp = int(fields['t'])
+        signature = fields['v1']
+    except (AttributeError, KeyError, ValueError):
+        return False
+    now = time.time() if now is None else now
+    if abs(now - timestamp) > tolerance:
+        return False
+    expected = sign(secret, body, timestamp).rsplit('=', 1)[1]
+    return hmac.compare_digest(expected, signature)
+
+
+class ConnectionPool:
+    """Keep-alive ``http.client`` connections per origin, shared by the sender threads"""
+
+    def __init__(self, timeout=10, maxsize=4):
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.connects = 0
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _checkout(self, origin):
+        with self._lock:
+            if self._idle[origin]:
+                return self._idle[origin].pop(), True
+            self.connects += 1
+        scheme, host, port = origin
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def _checkin(self, origin, conn):
+        with self._lock:
+            if len(self._idle[origin]) < self.maxsize:
+                self._idle[origin].append(conn)
+                return
+        conn.close()
+
+    def post(self, url, body, headers):
+        """POST ``body`` to ``url``; returns ``(status, response body)``"""
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        while True:
+            conn, reused = self._checkout(origin)
+            try:
+                conn.request('POST', path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; use a new one
+                    continue
+                raise
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(origin, conn)
+            return response.status, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, defaultdict(list)
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class WebhookDispatcher:
+    """Fans out outbox events and delivers them in batches per subscription"""
+
+    def __init__(self, batch_size=50, max_attempts=8, backoff_base=2.0, backoff_max=3600,
+                 timeout=10, max_workers=4):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_workers = max_workers
+        # A claimed delivery is retried by another worker if this one dies
+        self.lease = timedelta(seconds=timeout * 2 + 30)
+        self.pool = ConnectionPool(timeout=timeout, maxsize=max_workers)
+        self.random = random.Random()
+        self._executor = None
+
+    def fan_out(self, limit=500):
+        """One pending delivery per new event and matching subscription; returns how many"""
+        events = db.session.execute(
+            select(WebhookEvent.id, WebhookEvent.event_type)
+            .where(WebhookEvent.dispatched.is_(False))
+            .order_by(WebhookEvent.id).limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not events:
+            db.session.commit()
+            return 0
+        subscriptions = db.session.execute(
+            select(WebhookSubscription).where(WebhookSubscription.active.is_(True))
+        ).scalars().all()
+        now = _utcnow()
+        rows = [
+            {"subscription_id": subscription.id, "event_id": event_id, "status": 'pending',
+             "attempts": 0, "next_attempt_at": now}
+            for event_id, event_type in events
+            for subscription in subscriptions if subscription.wants(event_type)
+        ]
+        if rows:
+            db.session.execute(insert(WebhookDelivery), rows)
+        db.session.execute(update(WebhookEvent).where(
+            WebhookEvent.id.in_([event_id for event_id, _ in events])
+        ).values(dispatched=True))
+        db.session.commit()
+        return len(rows)
+
+    def claim(self):
+        """Lease due deliveries; returns ``[(subscription_id, [(delivery_id, attempts)])]`` batches"""
+        now = _utcnow()
+        rows = db.session.execute(
+            select(WebhookDelivery.id, WebhookDelivery.subscription_id, WebhookDelivery.attempts)
+            .where(WebhookDelivery.status == 'pending', WebhookDelivery.next_attempt_at <= now)
+            .order_by(WebhookDelivery.next_attempt_at, WebhookDelivery.id)
+            .limit(self.batch_size * self.max_workers)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if rows:
+            db.session.execute(update(WebhookDelivery).where(
+                WebhookDelivery.id.in_([row.id for row in rows])
+            ).values(next_attempt_at=now + self.lease))
+        db.session.commit()
+
+        per_subscription = defaultdict(list)
+        for row in rows:
+            per_subscription[row.subscription_id].append((row.id, row.attempts))
+        return [
+            (subscription_id, deliveries[start:start + self.batch_size])
+            for subscription_id, deliveries in per_subscription.items()
+            for start in range(0, len(deliveries), self.batch_size)
+        ]
+
+    def _request(self, subscription, delivery_ids):
+        events = db.session.execute(
+            select(WebhookEvent.id, WebhookEvent.event_type, WebhookEvent.payload, WebhookEvent.created_at)
+            .join(WebhookDelivery, WebhookDelivery.event_id == WebhookEvent.id)
+            .where(WebhookDelivery.id.in_(delivery_ids))
+            .order_by(WebhookEvent.id)
+        ).all()
+        # Payloads are stored as JSON already; splice them in rather than re-encode
+        body = '{"events":[%s]}' % ','.join(
+            '{"id":%d,"type":%s,"created_at":%s,"data":%s}' % (
+                row.id, json.dumps(row.event_type), json.dumps(row.created_at.isoformat() + 'Z'), row.payload,
+            ) for row in events
+        )
+        body = body.encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': USER_AGENT,
+            SIGNATURE_HEADER: sign(subscription.secret, body),
+        }
+        return subscription.url, body, headers
+
+    def _send(self, request):
+        url, body, headers = request
+        try:
+            status, data = self.pool.post(url, body, headers)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            return f'{type(e).__name__}: {e}'
+        if 200 <= status < 300:
+            return None
+        return f'HTTP {status}: {data[:200].decode("utf-8", "replace")}'
+
+    def backoff(self, attempts):
+        """Seconds before retry number ``attempts``: doubling, capped, with jitter"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay / 2 + self.random.uniform(0, delay / 2)
+
+    def deliver(self, batches):
+        """POST ``batches`` (from :meth:`claim`) and record the outcomes"""
+        subscriptions = {
+            subscription.id: subscription for subscription in db.session.execute(
+                select(WebhookSubscription).where(
+                    WebhookSubscription.id.in_({subscription_id for subscription_id, _ in batches})
+                )
+            ).scalars()
+        }
+        # A subscription removed since the claim took its deliveries with it
+        batches = [batch for batch in batches if batch[0] in subscriptions]
+        requests = [
+            self._request(subscriptions[subscription_id], [delivery_id for delivery_id, _ in deliveries])
+            for subscription_id, deliveries in batches
+        ]
+        db.session.commit()
+        # Only the HTTP calls run on the pool; the session stays on this thread
+        if len(requests) > 1 and self.max_workers > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='webhook')
+            errors = list(self._executor.map(self._send, requests))
+        else:
+            errors = [self._send(request) for request in requests]
+
+        now = _utcnow()
+        stats = {"delivered": 0, "retrying": 0, "failed": 0}
+        updates = []
+        for (_subscription_id, deliveries), error in zip(batches, errors):
+            for delivery_id, attempts in deliveries:
+                attempts += 1
+                if error is None:
+                    stats["delivered"] += 1
+                    updates.append({"id": delivery_id, "status": 'delivered', "attempts": attempts,
+                                    "delivered_at": now, "last_error": None})
+                elif attempts >= self.max_attempts:
+                    stats["failed"] += 1
+                    updates.append({"id": delivery_id, "status": 'failed', "attempts": attempts,
+                                    "last_error": error[:500]})
+                else:
+                    stats["retrying"] += 1
+                    updates.append({"id": delivery_id, "attempts": attempts, "last_error": error[:500],
+                                    "next_attempt_at": now + timedelta(seconds=self.backoff(attempts))})
+        if updates:
+            db.session.execute(update(WebhookDelivery), updates)
+        db.session.commit()
+        return stats
+
+    def run_once(self):
+        """Fan out new events and deliver everything due; returns counts"""
+        stats = {"fanned_out": self.fan_out(), "delivered": 0, "retrying": 0, "failed": 0}
+        batches = self.claim()
+        if batches:
+            for key, count in self.deliver(batches).items():
+                stats[key] += count
+        return stats
+
+    def run(self, interval=1.0, stop=None):
+        """Deliver until ``stop`` (a ``threading.Event``) is set, idling ``interval`` between empty passes"""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                stats = self.run_once()
+                if stats["delivered"] or stats["retrying"] or stats["failed"]:
+                    click.echo(f"📤 {stats['delivered']} delivered, {stats['retrying']} to retry, "
+                               f"{stats['failed']} failed")
+                if not any(stats.values()):
+                    stop.wait(interval)
+        finally:
+            self.close()
+
+    def purge(self, older_than):
+        """Delete delivered deliveries and finished events older than ``older_than``"""
+        cutoff = _utcnow() - older_than
+        deliveries = db.session.execute(delete(WebhookDelivery).where(
+            WebhookDelivery.status == 'delivered', WebhookDelivery.delivered_at < cutoff,
+        )).rowcount
+        events = db.session.execute(delete(WebhookEvent).where(
+            WebhookEvent.dispatched.is_(True), WebhookEvent.created_at < cutoff,
+            ~select(WebhookDelivery.id).where(WebhookDelivery.event_id == WebhookEvent.id).exists(),
+        )).rowcount
+        db.session.commit()
+        return deliveries, events
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.pool.close()
+
+
+def init_webhooks(app):
+    """Create the dispatcher and the ``flask webhooks`` commands"""
+    dispatcher = WebhookDispatcher(
+        batch_size=app.config.get('WEBHOOK_BATCH_SIZE', 50),
+        max_attempts=app.config.get('WEBHOOK_MAX_ATTEMPTS', 8),
+        backoff_base=app.config.get('WEBHOOK_BACKOFF_SECONDS', 2.0),
+        backoff_max=app.config.get('WEBHOOK_BACKOFF_MAX_SECONDS', 3600),
+        timeout=app.config.get('WEBHOOK_TIMEOUT', 10),
+        max_workers=app.config.get('WEBHOOK_MAX_WORKERS', 4),
+    )
+    app.extensions['webhooks'] = dispatcher
+
+    @app.cli.group('webhooks')
+    def webhooks():
+        """Manage webhook subscriptions and deliver events."""
+
+    @webhooks.command('add')
+    @click.argument('url')
+    @click.option('--events', default='*', show_default=True,
+                  help='Comma-separated event types; patterns like ticket.* allowed')
+    @click.option('--secret', help='Signing secret (generated when omitted)')
+    def add(url, events, secret):
+        """Subscribe URL to events."""
+        if urlsplit(url).scheme not in ('http', 'https'):
+            raise click.BadParameter('must be an http:// or https:// URL', param_hint='URL')
+        subscription = WebhookSubscription(url=url, events=events, secret=secret or secrets.token_hex(32))
+        db.session.add(subscription)
+        db.session.commit()
+        click.echo(f"✅ Subscription {subscription.id} -> {url} ({events})")
+        click.echo(f"   Signing secret: {subscription.secret}")
+
+    @webhooks.command('list')
+    def list_subscriptions():
+        """List subscriptions with their delivery counts."""
+        counts = defaultdict(dict)
+        for subscription_id, status, count in db.session.execute(
+            select(WebhookDelivery.subscription_id, WebhookDelivery.status, db.func.count())
+            .group_by(WebhookDelivery.subscription_id, WebhookDelivery.status)
+        ):
+            counts[subscription_id][status] = count
+        for subscription in WebhookSubscription.query.order_by(WebhookSubscription.id):
+            state = 'active' if subscription.active else 'paused'
+            summary = ', '.join(f'{n} {status}' for status, n in sorted(counts[subscription.id].items()))
+            click.echo(f"{subscription.id:>4} {state:<7} {subscription.url} [{subscription.events}]"
+                       f"{' ' + summary if summary else ''}")
+
+    @webhooks.command('remove')
+    @click.argument('subscription_id', type=int)
+    def remove(subscription_id):
+        """Delete a subscription and its deliveries."""
+        db.session.execute(delete(WebhookDelivery).where(WebhookDelivery.subscription_id == subscription_id))
+        removed = db.session.execute(
+            delete(WebhookSubscription).where(WebhookSubscription.id == subscription_id)
+        ).rowcount
+        db.session.commit()
+        if not removed:
+            raise click.ClickException(f"No subscription {subscription_id}")
+        click.echo(f"🗑️  Removed subscription {subscription_id}")
+
+    @webhooks.command('deliver')
+    @click.option('--once', is_flag=True, help='Deliver what is due and exit')
+    @click.option('--interval', default=1.0, show_default=True, help='Seconds to idle when nothing is due')
+    def deliver(once, interval):
+        """Run the delivery worker (a separate process from the web server)."""
+        if once:
+            stats = dispatcher.run_once()
+            dispatcher.close()
+            click.echo(f"📤 {stats['fanned_out']} fanned out, {stats['delivered']} delivered, "
+                       f"{stats['retrying']} to retry, {stats['failed']} failed")
+            return
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        click.echo(f"🚚 Delivering webhooks (batches of {dispatcher.batch_size}, "
+                   f"{dispatcher.max_workers} workers); Ctrl+C to stop")
+        try:
+            dispatcher.run(interval, stop)
+        except KeyboardInterrupt:
+            pass
+
+    @webhooks.command('purge')
+    @click.option('--days', default=7, show_default=True, help='Keep delivered events this long')
+    def purge(days):
+        """Delete delivered webhook events older than --days."""
+        deliveries, events = dispatcher.purge(timedelta(days=days))
+        click.echo(f"🧹 Deleted {deliveries} deliveries and {events} events")
+
+    return dispatcher
@@ -0,0 +1,13 @@
+"""
+ASGI entry point for Mechanics Shop API
+
+Serves the same app as ``flask_app.py``, with the hot read endpoints
+answered asynchronously (see ``app/utils/async_reads.py``):
+
+    uvicorn asgi:app --host 0.0.0.0 --port 10000 --workers 2
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+from app.utils.async_reads import create_asgi_app
+from flask_app import app as flask_app
+
+app = create_asgi_app(flask_app)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent-connection capacity: sync gunicorn workers vs ASGI
+
+Serves the same seeded dataset with ``gunicorn flask_app:app`` (``--workers``
+x ``--threads`` sync request slots) and with ``uvicorn asgi:app`` (the same
+number of workers, async reads), with every SQL statement delayed by
+``--db-latency-ms`` to stand in for a remote database. Each server is then
+driven by ``benchmarks/loadgen.py`` users at every ``--concurrency`` level,
+on the async read endpoints only.
+
+A sync worker serves at most ``--threads`` requests at a time, however
+many connections are open; the ASGI worker keeps taking requests until its
+connection pool (``--pool-size`` + ``--max-overflow``) is busy.
+
+    python benchmarks/bench_asgi.py --concurrency 8 32 128 --db-latency-ms 50
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import loadgen
+from benchmarks.datasets import dataset_counts, dataset_path, load_dataset
+
+MODES = (('sync', False), ('asgi', True))
+
+
+def server_args(args, asgi):
+    return argparse.Namespace(
+        asgi=asgi, werkzeug=False, workers=args.workers, threads=args.threads, timeout=args.timeout,
+        rate_limits=False, pool_size=args.pool_size, max_overflow=args.max_overflow, pool_timeout=args.timeout,
+        db_latency_ms=args.db_latency_ms, db_jitter_ms=0.0, db_connect_ms=0.0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per level')
+    parser.add_argument('--mix', default='poll_open_tickets=1,poll_mechanics=1')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='sync worker threads')
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--max-overflow', type=int, default=10)
+    parser.add_argument('--db-latency-ms', type=float, default=50.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    mix = loadgen.parse_mix(args.mix)
+    counts = dict(dataset_counts(args.tickets), service_ticket=args.tickets)
+    load_dataset(args.tickets, args.seed)
+
+    results = {}
+    for mode, asgi in MODES:
+        workdir = tempfile.mkdtemp(prefix='mechanics_shop_bench_asgi_')
+        db_file = os.path.join(workdir, 'bench.sqlite')
+        shutil.copyfile(dataset_path(args.tickets, args.seed), db_file)
+        process, url = loadgen.start_server(db_file, server_args(args, asgi), workdir)
+        try:
+            for concurrency in args.concurrency:
+                rows, elapsed = asyncio.run(loadgen.run_load(
+                    url, counts, mix, concurrency, args.duration, args.timeout, seed=args.seed,
+                ))
+                reads = {name: row for name, row in rows.items() if name in mix}
+                results[mode, concurrency] = (
+                    sum(row['requests'] for row in reads.values()) / elapsed,
+                    max(row['p50_ms'] for row in reads.values()),
+                    max(row['p95_ms'] for row in reads.values()),
+                    sum(row['errors'] for row in reads.values()),
+                )
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n📊 {args.mix}, {args.tickets} tickets, +{args.db_latency_ms:.0f} ms per statement, "
+          f"{args.workers} workers ({args.threads} threads sync, pool {args.pool_size}+{args.max_overflow})")
+    print(f"{'users':>6} {'mode':<5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7} {'vs sync':>8}")
+    for concurrency in args.concurrency:
+        for mode, _asgi in MODES:
+            rps, p50, p95, errors = results[mode, concurrency]
+            ratio = rps / max(results['sync', concurrency][0], 1e-9)
+            print(f"{concurrency:>6} {mode:<5} {rps:>8.1f} {p50:>9.1f} {p95:>9.1f} {errors:>7} {ratio:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot API endpoints against a seeded dataset
+
+Seeds (or reuses) a file-backed SQLite dataset of the requested size, then
+drives each endpoint through the Flask test client and reports latency
+percentiles, throughput and SQL statements per request. The response cache
+and rate limiter are off so every request exercises the database path.
+
+Results are compared with ``benchmarks/baseline.json``; the script exits
+non-zero when an endpoint regresses past the threshold, or issues more
+queries than the baseline recorded. Latency baselines are only meaningful
+on the machine that recorded them; query counts are portable.
+
+    python benchmarks/bench_endpoints.py --tickets 1000
+    python benchmarks/bench_endpoints.py --tickets 100000 --requests 20
+    python benchmarks/bench_endpoints.py --tickets 1000 --update-baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+
+from app.utils import auth
+from benchmarks.datasets import load_dataset
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# name -> (path, token type)
+ENDPOINTS = {
+    'tickets_list': ('/tickets/', 'mechanic'),
+    'customer_tickets': ('/customers/me/tickets', 'customer'),
+    'mechanic_tickets': ('/mechanics/1/tickets', 'mechanic'),
+    'mechanics_ranking': ('/mechanics/ranking', None),
+    'inventory_list': ('/inventory/', None),
+}
+
+# Latency metrics compared against the baseline; throughput follows p50
+COMPARED = ('p50_ms', 'p95_ms')
+
+
+def bearer(kind, user_id=1):
+    payload = {
+        'type': kind,
+        f'{kind}_id': user_id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    return {'Authorization': f'Bearer {jwt.encode(payload, auth.SECRET_KEY, algorithm="HS256")}'}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def measure(client, path, headers, requests, warmup):
+    """Time ``requests`` sequential GETs; returns a result dict"""
+    for _ in range(warmup):
+        client.get(path, headers=headers)
+
+    timings, queries = [], []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+        queries.append(int(response.headers.get('X-Query-Count', 0)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'rps': round(requests / elapsed, 1),
+        'queries': max(queries),
+        'bytes': len(response.data),
+    }
+
+
+def run(tickets, requests, warmup, seed, only=None, rebuild=False):
+    app = load_dataset(tickets, seed, rebuild=rebuild)
+    client = app.test_client()
+    results = {}
+    for name, (path, kind) in ENDPOINTS.items():
+        if only and name not in only:
+            continue
+        headers = bearer(kind) if kind else {}
+        results[name] = measure(client, path, headers, requests, warmup)
+    return results
+
+
+def compare(results, baseline, threshold, slack_ms=2.0):
+    """Return a list of human readable regressions
+
+    A latency regression must exceed both the relative ``threshold`` and
+    ``slack_ms``, so jitter on millisecond endpoints does not fail a run.
+    """
+    regressions = []
+    for name, current in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if current['queries'] > expected['queries']:
+            regressions.append(
+                f"{name}: {current['queries']} queries per request (baseline {expected['queries']})"
+            )
+        for metric in COMPARED:
+            limit = max(expected[metric] * (1 + threshold), expected[metric] + slack_ms)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.2f} > {limit:.2f} "
+                    f"(baseline {expected[metric]:.2f})"
+                )
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(baseline, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def print_results(tickets, results):
+    print(f"\n📊 {tickets} tickets")
+    print(f"{'endpoint':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'queries':>8} {'bytes':>11}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+              f"{r['rps']:>9.1f} {r['queries']:>8} {r['bytes']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, nargs='+', default=[1000],
+                        help='dataset sizes, e.g. 1000 100000 1000000')
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS),
+                        help='only benchmark this endpoint (repeatable)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed latency regression as a fraction (default 0.25)')
+    parser.add_argument('--slack-ms', type=float, default=2.0,
+                        help='latency changes below this are never regressions (default 2.0)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='record these results as the new baseline')
+    parser.add_argument('--rebuild', action='store_true', help='reseed the dataset')
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    failed = False
+    for tickets in args.tickets:
+        results = run(tickets, args.requests, args.warmup, args.seed,
+                      only=args.endpoint, rebuild=args.rebuild)
+        print_results(tickets, results)
+
+        key = str(tickets)
+        if args.update_baseline:
+            baseline.setdefault(key, {}).update(results)
+            continue
+        if key not in baseline:
+            print("⚠️  No baseline for this size (run with --update-baseline)")
+            continue
+        regressions = compare(results, baseline[key], args.threshold, args.slack_ms)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            failed = True
+        else:
+            print("✅ Within baseline")
+
+    if args.update_baseline:
+        save_baseline(baseline)
+        print(f"\n💾 Baseline written to {BASELINE_PATH}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of the /tickets/ response payload
+
+Builds the exact payload ``GET /tickets/`` returns for a seeded dataset and
+times three encoders over it:
+
+* ``stdlib``  - Flask's DefaultJSONProvider, formatting dates first the
+  way ``to_dict()`` used to (the previous response path)
+* ``fast/stdlib`` - FastJSONProvider without orjson installed
+* ``fast/orjson`` - FastJSONProvider with orjson
+
+The date pre-pass of the ``stdlib`` row walks the payload once more than
+the old inline ``isoformat()`` calls did, so read its gap to
+``fast/stdlib`` as an upper bound.
+
+    python benchmarks/bench_json.py --tickets 5000 --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import db
+from app.models import ServiceTicket
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+from benchmarks.datasets import load_dataset
+
+
+def _preformat(value):
+    """Turn dates into strings, like the old to_dict() implementations"""
+    if isinstance(value, dict):
+        return {key: _preformat(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_preformat(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def tickets_payload(app):
+    with app.app_context():
+        tickets = ServiceTicket.with_relations().all()
+        payload = {
+            "success": True,
+            "data": {
+                "tickets": [ticket.to_dict() for ticket in tickets],
+                "count": len(tickets)
+            }
+        }
+        db.session.remove()
+    return payload
+
+
+def time_response(provider, app, payload, repeat, prepare=lambda payload: payload):
+    """Mean milliseconds per provider.response(prepare(payload))"""
+    with app.test_request_context():
+        provider.response(prepare(payload))  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            body = provider.response(prepare(payload)).get_data()
+        elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = load_dataset(args.tickets)
+    app.debug = False  # compact output, as in production
+    payload = tickets_payload(app)
+
+    results = {}
+    results['stdlib'] = time_response(DefaultJSONProvider(app), app, payload, args.repeat, _preformat)
+    fast = FastJSONProvider(app)
+    orjson = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        results['fast/stdlib'] = time_response(fast, app, payload, args.repeat)
+    finally:
+        json_provider.orjson = orjson
+    if orjson is not None:
+        results['fast/orjson'] = time_response(fast, app, payload, args.repeat)
+    else:
+        print("⚠️  orjson not installed; skipping fast/orjson")
+
+    baseline = results['stdlib'][0]
+    print(f"\n📊 /tickets/ payload, {args.tickets} tickets")
+    print(f"{'encoder':<14} {'ms/response':>12} {'MB':>8} {'speedup':>9}")
+    for name, (millis, size) in results.items():
+        print(f"{name:<14} {millis:>12.2f} {size / 1e6:>8.2f} {baseline / millis:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
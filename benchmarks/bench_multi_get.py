@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark fetching parts by id: one GET per id vs one ?ids= multi-get
+
+For each id count, fetches that many inventory items with
+``GET /inventory/<id>`` calls and with a single ``GET /inventory/?ids=``,
+checks both return the same items, and reports the time per batch of ids,
+the SQL statements run and the requests made. Every call here is
+in-process; over a real network each saved request also saves a round
+trip.
+
+    python benchmarks/bench_multi_get.py --ids 10 50 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_endpoints import percentile
+from benchmarks.datasets import dataset_counts, load_dataset
+
+
+def one_by_one(client, ids):
+    items, queries = [], 0
+    for item_id in ids:
+        response = client.get(f'/inventory/{item_id}')
+        items.append(response.get_json()['data'])
+        queries += int(response.headers['X-Query-Count'])
+    return items, queries, len(ids)
+
+
+def multi_get(client, ids):
+    response = client.get('/inventory/?ids=' + ','.join(map(str, ids)))
+    return response.get_json()['data']['inventory'], int(response.headers['X-Query-Count']), 1
+
+
+def measure(fetch, client, ids, repeats):
+    fetch(client, ids)  # warm up
+    samples, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fetch(client, ids)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=1000, help='dataset size')
+    parser.add_argument('--ids', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = load_dataset(args.tickets, args.seed)
+    client = app.test_client()
+    parts = dataset_counts(args.tickets)['inventory']
+    rng = random.Random(args.seed)
+
+    print(f"\n📊 Inventory items by id, {args.repeats} repeats, {parts} parts")
+    print(f"{'ids':>5} {'mode':<10} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'requests':>9} {'speedup':>8}")
+    for count in args.ids:
+        ids = [rng.randint(1, parts) for _ in range(count)]  # repeats allowed, as on a ticket
+        results = {mode: measure(fetch, client, ids, args.repeats)
+                   for mode, fetch in (('per-id', one_by_one), ('multi-get', multi_get))}
+        if results['per-id'][1][0] != results['multi-get'][1][0]:
+            raise SystemExit(f"❌ {count} ids: the multi-get returned different items")
+        for mode, (samples, (_items, queries, requests)) in results.items():
+            speedup = percentile(results['per-id'][0], 50) / percentile(samples, 50)
+            print(f"{count:>5} {mode:<10} {percentile(samples, 50):>9.2f} {percentile(samples, 95):>9.2f} "
+                  f"{queries:>8} {requests:>9} {speedup:>7.1f}x")
+    print("\n✅ Multi-gets return the same items as per-id calls")
+
+
+if __name__ == '__main__':
+    main()
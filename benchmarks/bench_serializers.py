@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-row serialization: generated serializers vs hand-written to_dict
+
+Loads a seeded dataset (100k tickets by default) and times, per row:
+
+* ``handwritten``  - the previous ``to_dict()`` implementations, kept here
+  for comparison
+* ``compiled``     - ``serializer_for(Model).one`` on the same ORM instances
+  (what ``to_dict()`` now calls)
+* ``compiled/row`` - ``serializer_for(Model).row`` on Core rows from
+  ``serializer.select()``; columns only, so ServiceTicket is compared
+  against its flat columns
+
+Serialization is timed over objects that are already loaded. The ``fetch``
+columns add the query time, for ORM instances vs Core rows.
+
+    python benchmarks/bench_serializers.py --tickets 100000
+"""
+import argparse
+import os
+import sys
+import time
+from collections.abc import Iterable
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import db
+from app.models import Customer, Inventory, Mechanic, ServiceTicket
+from app.utils.serializers import serializer_for
+from benchmarks.datasets import load_dataset
+
+
+def legacy_customer(self):
+    return {
+        'id': self.id, 'first_name': self.first_name, 'last_name': self.last_name,
+        'email': self.email, 'phone': self.phone, 'address': self.address,
+        'created_at': self.created_at,
+    }
+
+
+def legacy_mechanic(self):
+    return {
+        'id': self.id, 'first_name': self.first_name, 'last_name': self.last_name,
+        'email': self.email, 'specialization': self.specialization,
+        'years_experience': self.years_experience, 'hourly_rate': self.hourly_rate,
+        'is_active': self.is_active, 'created_at': self.created_at,
+    }
+
+
+def legacy_inventory(self):
+    return {
+        'id': self.id, 'part_name': self.part_name, 'part_number': self.part_number,
+        'description': self.description, 'quantity': self.quantity, 'price': self.price,
+        'category': self.category, 'supplier': self.supplier,
+        'min_stock_level': self.min_stock_level, 'created_at': self.created_at,
+        'updated_at': self.updated_at,
+    }
+
+
+def legacy_ticket(self):
+    try:
+        from sqlalchemy.orm.query import Query
+    except Exception:
+        Query = tuple()
+
+    def to_list(attr):
+        if 'Query' in str(type(attr)) or (Query and isinstance(attr, Query)):
+            return attr.all()
+        return list(attr) if isinstance(attr, Iterable) else []
+
+    mechanics_list = to_list(getattr(self, 'mechanics', []))
+    inventory_list = to_list(getattr(self, 'inventory', []))
+    return {
+        'id': self.id, 'customer_id': self.customer_id, 'vehicle_info': self.vehicle_info,
+        'issue_description': self.issue_description, 'status': self.status,
+        'priority': self.priority, 'estimated_hours': self.estimated_hours,
+        'total_cost': self.total_cost, 'created_at': self.created_at,
+        'updated_at': self.updated_at,
+        'mechanics': [legacy_mechanic(m) for m in mechanics_list] if mechanics_list else [],
+        'inventory': [legacy_inventory(i) for i in inventory_list] if inventory_list else [],
+    }
+
+
+def legacy_ticket_columns(self):
+    ticket = legacy_ticket(self)
+    del ticket['mechanics'], ticket['inventory']
+    return ticket
+
+
+CASES = (
+    (Customer, legacy_customer, lambda: Customer.query),
+    (Mechanic, legacy_mechanic, lambda: Mechanic.query),
+    (Inventory, legacy_inventory, lambda: Inventory.query),
+    (ServiceTicket, legacy_ticket, ServiceTicket.with_relations),
+)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def per_row_us(seconds, rows):
+    return seconds / max(rows, 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs.')
+    args = parser.parse_args()
+
+    app = load_dataset(args.tickets)
+    print(f"\n📊 Per-row cost, {args.tickets} tickets (µs/row, best of {args.repeat})")
+    print(f"{'model':<15} {'rows':>8} {'handwritten':>12} {'compiled':>9} {'row':>7} "
+          f"{'speedup':>8} {'fetch orm':>10} {'fetch row':>10}")
+    with app.app_context():
+        for model, legacy, query in CASES:
+            serializer = serializer_for(model)
+            objs, fetch_orm = timed(lambda: query().all())
+            rows, fetch_core = timed(lambda: db.session.execute(serializer.select()).all())
+            count = len(objs)
+
+            old = min(timed(lambda: [legacy(o) for o in objs])[1] for _ in range(args.repeat))
+            new = min(timed(serializer.many, objs)[1] for _ in range(args.repeat))
+            raw = min(timed(serializer.rows, rows)[1] for _ in range(args.repeat))
+
+            assert [legacy(o) for o in objs[:50]] == serializer.many(objs[:50])
+            flat = legacy_ticket_columns if model is ServiceTicket else legacy
+            assert [flat(o) for o in objs[:50]] == serializer.rows(rows[:50])
+
+            print(f"{model.__name__:<15} {count:>8} {per_row_us(old, count):>12.2f} "
+                  f"{per_row_us(new, count):>9.2f} {per_row_us(raw, count):>7.2f} {old / new:>7.1f}x "
+                  f"{per_row_us(fetch_orm, count):>10.2f} {per_row_us(fetch_core, count):>10.2f}")
+            db.session.expunge_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark ticket lists: embedded relationships vs side-loaded (?compact=1)
+
+For each dataset size, requests ``/tickets/`` in the full form (mechanics
+and parts embedded in every ticket) and the compact form (``mechanic_ids``
+/ ``part_ids`` plus a top-level ``included`` map). Checks that expanding
+the compact payload gives the full one, then reports latency, body size
+and how many related rows were serialized.
+
+    python benchmarks/bench_sideload.py --tickets 1000 5000 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_endpoints import bearer, percentile
+from benchmarks.datasets import load_dataset
+
+FORMS = (('full', '/tickets/'), ('compact', '/tickets/?compact=1'))
+
+
+def expand(payload):
+    """The full ticket list rebuilt from a compact payload"""
+    included = payload['included']
+    tickets = []
+    for ticket in payload['data']['tickets']:
+        ticket = dict(ticket)
+        ticket['mechanics'] = [included['mechanics'][str(i)] for i in ticket.pop('mechanic_ids')]
+        ticket['inventory'] = [included['parts'][str(i)] for i in ticket.pop('part_ids')]
+        tickets.append(ticket)
+    return tickets
+
+
+def measure(client, url, headers, requests):
+    client.get(url, headers=headers)  # warm up
+    samples, body = [], None
+    for _ in range(requests):
+        start = time.perf_counter()
+        body = client.get(url, headers=headers).get_data()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--requests', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"\n📊 /tickets/ full vs compact, {args.requests} requests each")
+    print(f"{'tickets':>8} {'form':<8} {'p50 ms':>9} {'MB':>7} {'KB/ticket':>10} {'related':>8} {'speedup':>8}")
+    for tickets in args.tickets:
+        app = load_dataset(tickets)
+        client = app.test_client()
+        with app.app_context():
+            headers = bearer('mechanic')
+        results = {form: measure(client, url, headers, args.requests) for form, url in FORMS}
+
+        full, compact = (json.loads(results[form][1]) for form, _url in FORMS)
+        if expand(compact) != full['data']['tickets']:
+            raise SystemExit(f"❌ {tickets} tickets: compact payload does not expand to the full one")
+
+        embedded = sum(len(t['mechanics']) + len(t['inventory']) for t in full['data']['tickets'])
+        related = {'full': embedded, 'compact': sum(len(rows) for rows in compact['included'].values())}
+        for form, (samples, body) in results.items():
+            speedup = percentile(results['full'][0], 50) / percentile(samples, 50)
+            print(f"{tickets:>8} {form:<8} {percentile(samples, 50):>9.1f} {len(body) / 1e6:>7.2f} "
+                  f"{len(body) / 1e3 / max(tickets, 1):>10.2f} {related[form]:>8} {speedup:>7.1f}x")
+    print("\n✅ Compact payloads expand to the full ones")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ticket list endpoints: ORM path vs SQL-built JSON
+
+Requests each endpoint through the test client with ``SQL_JSON_TICKETS``
+off (ORM instances -> to_dict -> JSON provider) and on (documents built by
+the database and streamed as they are), checks the two bodies are
+identical, and reports latency and queries per request.
+
+    python benchmarks/bench_ticket_json.py --tickets 5000 --requests 10
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_endpoints import bearer, percentile
+from benchmarks.datasets import load_dataset
+
+ENDPOINTS = (
+    ('tickets_list', '/tickets/', 'mechanic'),
+    ('tickets_open', '/tickets/?status=open', 'mechanic'),
+    ('customer_tickets', '/customers/me/tickets', 'customer'),
+)
+
+
+def measure(client, url, headers, requests):
+    samples, body, queries = [], None, None
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        body = response.get_data()
+        samples.append((time.perf_counter() - start) * 1000)
+        queries = response.headers.get('X-Query-Count')
+    return sorted(samples), body, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=10)
+    args = parser.parse_args()
+
+    app = load_dataset(args.tickets)
+    client = app.test_client()
+    print(f"\n📊 Ticket lists, {args.tickets} tickets, {args.requests} requests each")
+    print(f"{'endpoint':<18} {'path':<5} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'MB':>7} {'speedup':>8}")
+    with app.app_context():
+        headers = {kind: bearer(kind) for kind in ('mechanic', 'customer')}
+    for name, url, kind in ENDPOINTS:
+        results = {}
+        for path, enabled in (('orm', False), ('sql', True)):
+            app.config['SQL_JSON_TICKETS'] = enabled
+            client.get(url, headers=headers[kind])  # warm up
+            results[path] = measure(client, url, headers[kind], args.requests)
+        if results['orm'][1] != results['sql'][1]:
+            raise SystemExit(f"❌ {name}: SQL-built body differs from the ORM path")
+        for path, (samples, body, queries) in results.items():
+            speedup = percentile(results['orm'][0], 50) / percentile(samples, 50)
+            print(f"{name:<18} {path:<5} {percentile(samples, 50):>9.1f} {percentile(samples, 95):>9.1f} "
+                  f"{queries or '-':>8} {len(body) / 1e6:>7.2f} {speedup:>7.1f}x")
+    print("\n✅ Bodies identical on every endpoint")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark webhook delivery: one POST per event vs batched, pooled delivery
+
+Queues a number of outbox events for one subscription, then drains them
+with the delivery worker twice against a local receiver that adds a fixed
+latency per request (standing in for the network and the receiver's work):
+once one event per POST on a new connection each time, once in batches of
+``--batch-size`` over keep-alive connections from ``--workers`` threads.
+Reports the time to drain, events per second, POSTs and TCP connections.
+
+    python benchmarks/bench_webhooks.py --events 500 --latency-ms 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert, update
+
+from app import create_app, db
+from app.models import WebhookDelivery, WebhookEvent, WebhookSubscription
+from app.utils.webhooks import WebhookDispatcher, _utcnow
+from benchmarks.datasets import benchmark_config
+
+
+class Receiver(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency):
+        self.latency, self.posts, self.clients = latency, 0, set()
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), Handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.posts += 1
+            self.server.clients.add(self.client_address)
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def drain(dispatcher, receiver, events):
+    db.session.execute(delete(WebhookDelivery))
+    db.session.execute(update(WebhookEvent).values(dispatched=False))
+    db.session.commit()
+    receiver.posts, receiver.clients = 0, set()
+
+    start = time.perf_counter()
+    delivered = 0
+    while delivered < events:
+        delivered += dispatcher.run_once()['delivered']
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+    return elapsed, receiver.posts, len(receiver.clients)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='receiver time per request')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    receiver = Receiver(args.latency_ms / 1000)
+    threading.Thread(target=receiver.serve_forever, args=(0.05,), daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(benchmark_config(os.path.join(tmp, 'webhooks.sqlite')))
+        with app.app_context():
+            db.create_all()
+            db.session.add(WebhookSubscription(
+                url=f'http://127.0.0.1:{receiver.server_address[1]}/hooks', secret='bench'))
+            now = _utcnow()
+            db.session.execute(insert(WebhookEvent), [
+                {"event_type": 'inventory.stock_changed', "created_at": now, "dispatched": False,
+                 "payload": f'{{"part_id":{i},"quantity":{i % 40},"change":-1,"reason":"used"}}'}
+                for i in range(args.events)
+            ])
+            db.session.commit()
+
+            unpooled = WebhookDispatcher(batch_size=1, max_workers=1)
+            unpooled.pool.maxsize = 0  # close every connection after its request
+            modes = (
+                ('per-event', unpooled),
+                ('batched', WebhookDispatcher(batch_size=args.batch_size, max_workers=args.workers)),
+            )
+            print(f"\n📊 Delivering {args.events} events, receiver latency {args.latency_ms:g} ms")
+            print(f"{'mode':<10} {'seconds':>8} {'events/s':>9} {'POSTs':>6} {'conns':>6} {'speedup':>8}")
+            baseline = None
+            for mode, dispatcher in modes:
+                elapsed, posts, conns = drain(dispatcher, receiver, args.events)
+                baseline = baseline or elapsed
+                print(f"{mode:<10} {elapsed:>8.2f} {args.events / elapsed:>9.0f} {posts:>6} {conns:>6} "
+                      f"{baseline / elapsed:>7.1f}x")
+            db.session.remove()
+            db.engine.dispose()
+
+    receiver.shutdown()
+    print("\n✅ All events delivered in both modes")
+
+
+if __name__ == '__main__':
+    main()
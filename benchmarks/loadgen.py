@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP load generator for scripted API scenarios
+
+Serves a copy of a seeded benchmark dataset, then runs virtual users on
+asyncio keep-alive connections. Each user logs in as a seeded customer
+and mechanic (users on the same accounts share one login, so ramp-up
+stays short at high concurrency) and loops over a weighted mix of
+scenarios until the duration is up. Reports per-scenario latency
+percentiles, throughput and error rates.
+
+The server is ``gunicorn flask_app:app``; the werkzeug server with
+``--werkzeug`` or when gunicorn is not installed; or ``uvicorn asgi:app``
+with ``--asgi``. gunicorn runs with its defaults rather than
+``gunicorn.conf.py``, so results stay comparable with earlier baselines.
+``--url`` targets an already running server instead.
+
+``--db-latency-ms`` / ``--db-connect-ms`` enable the app's DB fault
+injection, which makes pool exhaustion and ``DB_POOL_TIMEOUT`` behaviour
+reproducible against local SQLite.
+
+    python benchmarks/loadgen.py --concurrency 50 --duration 30
+    python benchmarks/loadgen.py --workers 2 --threads 4 --db-latency-ms 50 \\
+        --pool-size 2 --max-overflow 0 --pool-timeout 1
+    python benchmarks/loadgen.py --url http://127.0.0.1:10000 --mix poll_inventory=1
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.datasets import PASSWORD, dataset_counts, dataset_path, load_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = 'poll_inventory=4,poll_tickets=3,poll_ranking=2,create_ticket=2,add_part=2,login=1'
+
+
+# ----------------------------------------------------------------------
+# Minimal HTTP/1.1 keep-alive client
+# ----------------------------------------------------------------------
+class HttpConnection:
+    """One persistent connection; reconnects when the server closes it"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Send a request and return ``(status, body bytes)``"""
+        payload = json.dumps(body).encode() if body is not None else b''
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                 f'Content-Length: {len(payload)}']
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        raw = ('\r\n'.join(lines) + '\r\n\r\n').encode() + payload
+
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(raw)
+                await self.writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Server closed an idle keep-alive connection; retry once
+                await self.close()
+                if attempt == 2:
+                    raise
+            except asyncio.TimeoutError:
+                await self.close()
+                raise
+
+    async def _read_response(self):
+        status_line = await self.reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            data = b''.join(chunks)
+        elif 'content-length' in headers:
+            data = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            data = await self.reader.read()
+
+        if headers.get('connection', '').lower() == 'close' or 'content-length' not in headers \
+                and 'transfer-encoding' not in headers:
+            await self.close()
+        return status, data
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+class VirtualUser:
+    """Per-user state shared by the scenarios"""
+
+    def __init__(self, index, conn, counts, rng):
+        self.conn = conn
+        self.rng = rng
+        self.counts = counts
+        self.customer_email = f'customer{index % counts["customer"] + 1}@seed.example'
+        self.mechanic_email = f'mechanic{index % counts["mechanic"] + 1}@seed.example'
+        self.customer_headers = {}
+        self.mechanic_headers = {}
+        self.ticket_ids = []
+
+    async def login(self):
+        status, data = await self.conn.request('POST', '/auth/customer/login', {
+            'email': self.customer_email, 'password': PASSWORD,
+        })
+        if status == 200:
+            self.customer_headers = {'Authorization': f'Bearer {json.loads(data)["token"]}'}
+        return status
+
+    async def mechanic_login(self):
+        status, data = await self.conn.request('POST', '/auth/mechanic/login', {
+            'email': self.mechanic_email, 'password': PASSWORD,
+        })
+        if status == 200:
+            self.mechanic_headers = {'Authorization': f'Bearer {json.loads(data)["token"]}'}
+        return status
+
+    async def create_ticket(self):
+        status, data = await self.conn.request('POST', '/tickets/', {
+            'vehicle_info': f'Load test vehicle {self.rng.randint(1, 999)}',
+            'issue_description': 'Generated by loadgen',
+            'priority': self.rng.choice(('low', 'medium', 'high')),
+        }, self.customer_headers)
+        if status == 201:
+            self.ticket_ids.append(json.loads(data)['data']['id'])
+        return status
+
+    async def add_part(self):
+        ticket_id = self.rng.choice(self.ticket_ids) if self.ticket_ids else \
+            self.rng.randint(1, self.counts['service_ticket'])
+        status, _ = await self.conn.request('POST', f'/tickets/{ticket_id}/add-part', {
+            'part_id': self.rng.randint(1, self.counts['inventory']), 'quantity': 1,
+        }, self.mechanic_headers)
+        return status
+
+    async def poll_tickets(self):
+        return (await self.conn.request('GET', '/customers/me/tickets', headers=self.customer_headers))[0]
+
+    async def poll_inventory(self):
+        return (await self.conn.request('GET', '/inventory/'))[0]
+
+    async def poll_ranking(self):
+        return (await self.conn.request('GET', '/mechanics/ranking'))[0]
+
+    async def poll_open_tickets(self):
+        return (await self.conn.request('GET', '/tickets/?status=open', headers=self.mechanic_headers))[0]
+
+    async def poll_mechanics(self):
+        return (await self.conn.request('GET', '/mechanics/'))[0]
+
+
+SCENARIOS = ('login', 'create_ticket', 'add_part', 'poll_tickets', 'poll_inventory', 'poll_ranking',
+             'poll_open_tickets', 'poll_mechanics')
+
+
+def parse_mix(text):
+    """'a=3,b=1' -> {'a': 3.0, 'b': 1.0}"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+class Stats:
+    """Latency samples and outcome counts per scenario"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.failures = {}
+
+    def record(self, scenario, seconds, status=None, failure=None):
+        self.latencies.setdefault(scenario, []).append(seconds * 1000)
+        if failure is not None:
+            self.failures.setdefault(scenario, {}).setdefault(failure, 0)
+            self.failures[scenario][failure] += 1
+        else:
+            by_status = self.statuses.setdefault(scenario, {})
+            by_status[status] = by_status.get(status, 0) + 1
+
+    def errors(self, scenario):
+        """Transport failures, timeouts and 5xx responses"""
+        server_errors = sum(n for status, n in self.statuses.get(scenario, {}).items() if status >= 500)
+        return server_errors + sum(self.failures.get(scenario, {}).values())
+
+    def summary(self, elapsed):
+        rows = {}
+        for scenario, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+
+            def pct(p):
+                return ordered[max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))]
+            statuses = self.statuses.get(scenario, {})
+            rows[scenario] = {
+                'requests': len(ordered),
+                'rps': round(len(ordered) / elapsed, 1),
+                'p50_ms': round(pct(50), 2),
+                'p95_ms': round(pct(95), 2),
+                'p99_ms': round(pct(99), 2),
+                'max_ms': round(ordered[-1], 2),
+                'client_errors': sum(n for s, n in statuses.items() if 400 <= s < 500),
+                'errors': self.errors(scenario),
+                'error_rate': round(self.errors(scenario) / len(ordered), 4),
+                'failures': self.failures.get(scenario, {}),
+            }
+        return rows
+
+
+async def _timed(stats, scenario, action):
+    start = time.perf_counter()
+    try:
+        status = await action()
+    except asyncio.TimeoutError:
+        stats.record(scenario, time.perf_counter() - start, failure='timeout')
+    except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError) as e:
+        stats.record(scenario, time.perf_counter() - start, failure=type(e).__name__)
+    else:
+        stats.record(scenario, time.perf_counter() - start, status=status)
+
+
+async def _log_in(stats, user):
+    await _timed(stats, 'login', user.login)
+    await _timed(stats, 'login', user.mechanic_login)
+    return user.customer_headers, user.mechanic_headers
+
+
+async def _user(index, base, counts, mix, deadline, stats, timeout, think, seed, sessions):
+    rng = random.Random(seed * 100003 + index)
+    conn = HttpConnection(base.hostname, base.port or 80, timeout)
+    user = VirtualUser(index, conn, counts, rng)
+    names, weights = list(mix), list(mix.values())
+    try:
+        accounts = (user.customer_email, user.mechanic_email)
+        if accounts not in sessions:
+            sessions[accounts] = asyncio.ensure_future(_log_in(stats, user))
+        user.customer_headers, user.mechanic_headers = await sessions[accounts]
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, weights)[0]
+            await _timed(stats, scenario, getattr(user, scenario))
+            if think:
+                await asyncio.sleep(rng.uniform(0, 2 * think))
+    finally:
+        await conn.close()
+
+
+async def run_load(url, counts, mix, concurrency=10, duration=10.0, timeout=30.0,
+                   think_ms=0.0, seed=42):
+    """Run ``concurrency`` virtual users for ``duration`` seconds.
+
+    ``counts`` are the dataset row counts (see ``dataset_counts``), used to
+    pick valid logins, tickets and parts. Returns ``(summary, elapsed)``.
+    """
+    base = urlsplit(url)
+    stats = Stats()
+    started = time.perf_counter()
+    deadline = started + duration
+    sessions = {}  # (customer email, mechanic email) -> login task
+    await asyncio.gather(*(
+        _user(i, base, counts, mix, deadline, stats, timeout, think_ms / 1000, seed, sessions)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return stats.summary(elapsed), elapsed
+
+
+# ----------------------------------------------------------------------
+# Local server
+# ----------------------------------------------------------------------
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(port, args):
+    """uvicorn for --asgi; gunicorn when installed, otherwise werkzeug's threaded server"""
+    if args.asgi:
+        return [sys.executable, '-m', 'uvicorn', 'asgi:app',
+                '--host', '127.0.0.1', '--port', str(port), '--workers', str(args.workers),
+                '--log-level', 'warning']
+    if importlib.util.find_spec('gunicorn') and not args.werkzeug:
+        # Not gunicorn.conf.py: its preload, warm-up and max_requests worker
+        # recycling would make runs incomparable with earlier baselines
+        return [sys.executable, '-m', 'gunicorn', 'flask_app:app', '--config', os.devnull,
+                '--bind', f'127.0.0.1:{port}', '--workers', str(args.workers),
+                '--threads', str(args.threads), '--timeout', str(int(args.timeout) + 30),
+                '--log-level', 'warning']
+    return [sys.executable, '-c',
+            'from werkzeug.serving import run_simple; from flask_app import app; '
+            f'run_simple("127.0.0.1", {port}, app, threaded=True)']
+
+
+def start_server(db_file, args, workdir):
+    port = _free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{db_file}',
+        SECRET_KEY='loadgen-secret-key',
+        RATELIMIT_ENABLED='true' if args.rate_limits else 'false',
+        RATELIMIT_STORAGE_URI='memory://',
+        METRICS_PATH=os.path.join(workdir, 'metrics.bin'),
+        CACHE_DIR=workdir,
+        DB_FAULT_LATENCY_MS=str(args.db_latency_ms),
+        DB_FAULT_JITTER_MS=str(args.db_jitter_ms),
+        DB_FAULT_CONNECT_MS=str(args.db_connect_ms),
+    )
+    env.pop('FLASK_ENV', None)
+    for option, name in (('pool_size', 'DB_POOL_SIZE'), ('max_overflow', 'DB_MAX_OVERFLOW'),
+                         ('pool_timeout', 'DB_POOL_TIMEOUT')):
+        if getattr(args, option) is not None:
+            env[name] = str(getattr(args, option))
+
+    process = subprocess.Popen(server_command(port, args), cwd=ROOT, env=env)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f'{url}/health', timeout=2):
+                return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 30s")
+
+
+def print_summary(rows, elapsed):
+    print(f"\n📊 {elapsed:.1f}s")
+    print(f"{'scenario':<16} {'reqs':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'4xx':>6} {'errors':>7}")
+    total = errors = 0
+    for name, r in rows.items():
+        total += r['requests']
+        errors += r['errors']
+        print(f"{name:<16} {r['requests']:>7} {r['rps']:>8.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['max_ms']:>9.2f} {r['client_errors']:>6} {r['errors']:>7}")
+        for failure, count in r['failures'].items():
+            print(f"   ⚠️  {failure}: {count}")
+    rate = errors / total if total else 0.0
+    print(f"{'total':<16} {total:>7} {total / elapsed:>8.1f}   error rate {rate:.2%}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help='target an already running server instead of starting one')
+    parser.add_argument('--tickets', type=int, default=1000, help='seeded dataset size')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'weighted scenarios (default {DEFAULT_MIX})')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='mean pause between requests')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help='exit non-zero above this error rate (default 0.01)')
+    parser.add_argument('--json', dest='json_path', help='also write the summary to this file')
+    server = parser.add_argument_group('local server')
+    server.add_argument('--workers', type=int, default=2)
+    server.add_argument('--threads', type=int, default=4)
+    server.add_argument('--werkzeug', action='store_true', help='use werkzeug even if gunicorn is installed')
+    server.add_argument('--asgi', action='store_true',
+                        help='serve asgi:app with uvicorn (async reads; --threads is ignored)')
+    server.add_argument('--rate-limits', action='store_true',
+                        help='keep the per-IP rate limits on (every user shares one IP)')
+    server.add_argument('--pool-size', type=int)
+    server.add_argument('--max-overflow', type=int)
+    server.add_argument('--pool-timeout', type=float)
+    server.add_argument('--db-latency-ms', type=float, default=0.0, help='injected delay per SQL statement')
+    server.add_argument('--db-jitter-ms', type=float, default=0.0, help='extra random delay per statement')
+    server.add_argument('--db-connect-ms', type=float, default=0.0, help='injected delay per new connection')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    counts = dict(dataset_counts(args.tickets), service_ticket=args.tickets)
+    process = workdir = None
+    url = args.url
+    if url is None:
+        load_dataset(args.tickets, args.seed)
+        workdir = tempfile.mkdtemp(prefix='mechanics_shop_loadgen_')
+        # Scenarios write, so run on a copy and keep the cached dataset pristine
+        db_file = os.path.join(workdir, 'loadgen.sqlite')
+        shutil.copyfile(dataset_path(args.tickets, args.seed), db_file)
+        process, url = start_server(db_file, args, workdir)
+        print(f"🚀 Server up at {url} ({' '.join(server_command(0, args)[2:4])})")
+
+    try:
+        print(f"🔥 {args.concurrency} users for {args.duration:.0f}s against {url}")
+        rows, elapsed = asyncio.run(run_load(
+            url, counts, mix, args.concurrency, args.duration, args.timeout, args.think_ms, args.seed,
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    rate = print_summary(rows, elapsed)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'elapsed': elapsed, 'scenarios': rows}, f, indent=2)
+    return 1 if rate > args.max_error_rate else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,19 +15,26 @@ def cleanup_database():
         from app import create_app, db
         from config import ProductionConfig
         from app.models.service_ticket import ServiceTicket
+        from app.extensions import service_mechanic, ticket_inventory
         
         app = create_app(ProductionConfig)
         
         with app.app_context():
-            # Find and delete service tickets with NULL customer_id
-            bad_tickets = ServiceTicket.query.filter(ServiceTicket.customer_id == None).all()
+            # Find and delete service tickets with NULL customer_id. Set-based
+            # statements: no ORM objects are loaded, however many rows match.
+            orphaned = db.select(ServiceTicket.id).where(ServiceTicket.customer_id.is_(None))
+            bad_tickets = db.session.execute(
+                db.select(ServiceTicket.id, ServiceTicket.vehicle_info).where(ServiceTicket.customer_id.is_(None))
+            ).all()
             
             if bad_tickets:
                 print(f"❌ Found {len(bad_tickets)} service tickets with NULL customer_id")
                 
-                for ticket in bad_tickets:
-                    print(f"🗑️  Deleting ticket ID {ticket.id}: {ticket.vehicle_info}")
-                    db.session.delete(ticket)
+                for ticket_id, vehicle_info in bad_tickets:
+                    print(f"🗑️  Deleting ticket ID {ticket_id}: {vehicle_info}")
+                for link in (service_mechanic, ticket_inventory):
+                    db.session.execute(link.delete().where(link.c.service_ticket_id.in_(orphaned)))
+                db.session.execute(db.delete(ServiceTicket).where(ServiceTicket.customer_id.is_(None)))
                 
                 db.session.commit()
                 print("✅ Cleanup completed successfully")
@@ -2,6 +2,7 @@
 Configuration settings for the Flask application - UPDATED FOR PRODUCTION
 """
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -9,6 +10,27 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    # Read replicas (comma-separated URLs): GET requests read from them, and a
+    # client that just wrote reads from the primary for REPLICA_STICKY_SECONDS
+    SQLALCHEMY_REPLICA_URIS = [url.strip() for url in (os.environ.get('DATABASE_REPLICA_URLS') or '').split(',')
+                               if url.strip()]
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS') or 5)
+
+    # Async engine for the ASGI read endpoints (derived from the URI above when unset)
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    
+    # Artificial DB latency for load tests (milliseconds, 0 = off)
+    DB_FAULT_LATENCY_MS = float(os.environ.get('DB_FAULT_LATENCY_MS') or 0)
+    DB_FAULT_JITTER_MS = float(os.environ.get('DB_FAULT_JITTER_MS') or 0)
+    DB_FAULT_CONNECT_MS = float(os.environ.get('DB_FAULT_CONNECT_MS') or 0)
     
     # JWT settings
     JWT_SECRET_KEY = SECRET_KEY
@@ -17,9 +39,60 @@ class Config:
     # Caching
     CACHE_TYPE = 'SimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT') or 60)
+    
+    # Build ticket list JSON in the database instead of through the ORM
+    SQL_JSON_TICKETS = os.environ.get('SQL_JSON_TICKETS', 'false').lower() == 'true'
+    
+    # ?ids=1,2,3 multi-gets on the inventory, mechanics and customers lists
+    MULTI_GET_MAX_IDS = int(os.environ.get('MULTI_GET_MAX_IDS') or 100)
+    
+    # Idempotency-Key on retried POSTs: stored responses live for the TTL; a
+    # duplicate waits up to IDEMPOTENCY_WAIT_SECONDS for the first request
+    IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS') or 86400)
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS') or 5)
+    IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS') or 60)
+    
+    # POST /batch: operations per batch, threads for "parallel": true reads
+    BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS') or 20)
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS') or 4)
+    
+    # Outbound webhooks: routes write events to an outbox table, and
+    # `flask webhooks deliver` POSTs them in batches per subscription,
+    # retrying with exponential backoff up to WEBHOOK_MAX_ATTEMPTS times
+    WEBHOOKS_ENABLED = os.environ.get('WEBHOOKS_ENABLED', 'false').lower() == 'true'
+    WEBHOOK_BATCH_SIZE = int(os.environ.get('WEBHOOK_BATCH_SIZE') or 50)
+    WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS') or 8)
+    WEBHOOK_BACKOFF_SECONDS = float(os.environ.get('WEBHOOK_BACKOFF_SECONDS') or 2)
+    WEBHOOK_BACKOFF_MAX_SECONDS = int(os.environ.get('WEBHOOK_BACKOFF_MAX_SECONDS') or 3600)
+    WEBHOOK_TIMEOUT = float(os.environ.get('WEBHOOK_TIMEOUT') or 10)
+    WEBHOOK_MAX_WORKERS = int(os.environ.get('WEBHOOK_MAX_WORKERS') or 4)
+    
+    # Response compression (gzip, or brotli when installed)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 500)
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 6)
+    COMPRESS_BR_QUALITY = int(os.environ.get('COMPRESS_BR_QUALITY') or 4)
+    
+    # Rate limiting (off under TESTING=1 unless RATELIMIT_ENABLED says otherwise)
+    RATELIMIT_ENABLED = os.environ.get(
+        'RATELIMIT_ENABLED', 'false' if os.environ.get('TESTING') else 'true'
+    ).lower() == 'true'
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or 'memory://'
+    RATELIMIT_LOGIN = os.environ.get('RATELIMIT_LOGIN') or '10 per minute'
+    
+    # Metrics: every worker must map the same file to aggregate
+    METRICS_ENABLED = True
+    METRICS_PATH = os.environ.get('METRICS_PATH') or \
+        os.path.join(tempfile.gettempdir(), 'mechanics_shop_metrics.bin')
     
-    # Rate limiting
-    RATELIMIT_STORAGE_URL = 'memory://'
+    # Profiling (X-Profile: 1 with a mechanic token, or every Nth request)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or \
+        os.path.join(tempfile.gettempdir(), 'mechanics_shop_profiles')
+    PROFILE_SAMPLE_RATE = int(os.environ.get('PROFILE_SAMPLE_RATE') or 0)
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES') or 50)
     
     # CORS
     CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000']
@@ -34,6 +107,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     DEBUG = True
+    RATELIMIT_STORAGE_URI = 'memory://'
+    METRICS_PATH = None  # private file per app
     # Disable CSRF protection for testing
     WTF_CSRF_ENABLED = False
 
@@ -43,4 +118,13 @@ class ProductionConfig(Config):
     TESTING = False
     # Use PostgreSQL from environment variable - Render provides DATABASE_URL
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
-    CACHE_TYPE = "SimpleCache"
\ No newline at end of file
+    # Managed Postgres drops idle connections; recycle well before that
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 280)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    # One cache for every gunicorn worker on the host
+    CACHE_TYPE = 'app.utils.shared_cache.SQLiteCache'
+    CACHE_DIR = os.environ.get('CACHE_DIR') or tempfile.gettempdir()
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES') or 64 * 1024 * 1024)
+    # Shared by every gunicorn worker on the host
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or \
+        'mmap://' + os.path.join(tempfile.gettempdir(), 'mechanics_shop_ratelimit.bin')
\ No newline at end of file
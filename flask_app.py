@@ -4,8 +4,10 @@ Production entry point for Mechanics Shop API - UPDATED FOR PRODUCTION
 import os
 import sys
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add the current directory to Python path (gunicorn usually has it already)
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
 
 # Only load .env in development, not production
 if os.environ.get('FLASK_ENV') == 'development':
@@ -0,0 +1,83 @@
+"""
+gunicorn settings for the Mechanics Shop API
+
+gunicorn reads ``gunicorn.conf.py`` from the working directory, so a plain
+``gunicorn flask_app:app`` (or just ``gunicorn``) uses it; command line
+flags still win. Every value can be overridden from the environment:
+
+* ``GUNICORN_WORKER_CLASS`` - ``gthread`` (default), ``gevent`` or ``sync``
+* ``GUNICORN_WORKERS`` / ``WEB_CONCURRENCY`` - default from the CPUs
+  available to the container (see ``app/utils/server_profile.py``)
+* ``GUNICORN_THREADS`` - threads per gthread worker (default 4)
+* ``GUNICORN_PRELOAD`` - import the app once in the master (default true)
+* ``GUNICORN_MAX_REQUESTS`` / ``GUNICORN_MAX_REQUESTS_JITTER`` - recycle
+  each worker after 1000 +- 100 requests, which bounds slow memory growth
+* ``GUNICORN_TIMEOUT``, ``GUNICORN_GRACEFUL_TIMEOUT``, ``GUNICORN_KEEPALIVE``
+* ``GUNICORN_WARMUP`` - warm each worker up before it takes traffic
+  (default true)
+"""
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS') or 'gthread'
+if worker_class == 'gevent':
+    # Patch before anything else is imported - app.utils.server_profile
+    # below loads the app package (Flask, SQLAlchemy, ssl, threading) - so
+    # the locks, sockets and ssl the preloaded app uses are cooperative too
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:  # optional: without it psycopg2 calls block the worker
+        pass
+
+from app.utils.server_profile import (  # noqa: E402 (after the gevent patch)
+    WORKER_CLASSES, available_cpus, default_threads, default_workers, dispose_engines, warm_up,
+)
+
+if worker_class not in WORKER_CLASSES:
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {worker_class!r}")
+
+wsgi_app = 'flask_app:app'
+bind = os.environ.get('GUNICORN_BIND') or f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+
+cpus = available_cpus()
+workers = int(os.environ.get('GUNICORN_WORKERS') or os.environ.get('WEB_CONCURRENCY')
+              or default_workers(worker_class, cpus))
+threads = int(os.environ.get('GUNICORN_THREADS') or default_threads(worker_class))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS') or 1000)  # gevent
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS') or 1000)
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER') or 100)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 30)
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT') or 30)
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE') or 5)
+
+warmup = os.environ.get('GUNICORN_WARMUP', 'true').lower() == 'true'
+
+
+def when_ready(server):
+    server.log.info("Serving with %d %s workers x %d threads (%d CPUs available), preload %s",
+                    server.cfg.workers, server.cfg.worker_class_str, server.cfg.threads, cpus,
+                    'on' if server.cfg.preload_app else 'off')
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        # The engine came from the master; start this worker on its own pool
+        dispose_engines(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    """Runs in the worker after the app is loaded, before it accepts connections"""
+    if not warmup:
+        return
+    cfg = worker.cfg
+    app = worker.wsgi
+    concurrency = cfg.worker_connections if cfg.worker_class_str == 'gevent' else cfg.threads
+    connections = max(1, min(concurrency, app.config.get('DB_POOL_SIZE', 5)))
+    report = warm_up(app, connections=connections)
+    worker.log.info("Worker %s warmed up in %.0f ms: %d connections, %s", worker.pid,
+                    report['seconds'] * 1000, report['connections'],
+                    ', '.join(f'{path} {status} ({ms} ms)' for path, status, ms in report['requests']))
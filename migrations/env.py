@@ -84,9 +84,15 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # the deploy scripts' schema_fingerprint bookkeeping table is not a model
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (type_ == 'table' and name == 'schema_fingerprint')
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -17,6 +17,7 @@ def setup_database():
         
         from app import create_app, db
         from config import ProductionConfig
+        from app.utils.schema_fingerprint import sync_schema
         
         app = create_app(ProductionConfig)
         
@@ -26,19 +27,8 @@ def setup_database():
             db.session.execute(text('SELECT 1'))
             print("✅ Database connection successful")
             
-            # Create tables
-            print("📊 Creating database tables...")
-            db.create_all()
-            print("✅ Tables created/verified")
-            
-            # List tables for verification
-            from sqlalchemy import inspect
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            
-            print(f"📋 Database ready with {len(tables)} tables:")
-            for table in sorted(tables):
-                print(f"   ✅ {table}")
+            # Create tables only when the models or migrations changed
+            sync_schema(db, force='--force' in sys.argv)
                 
             print("🎉 Pre-deploy database setup completed successfully!")
             
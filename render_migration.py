@@ -15,6 +15,7 @@ def migrate_database():
     try:
         from app import create_app, db
         from config import ProductionConfig
+        from app.utils.schema_fingerprint import sync_schema
         
         app = create_app(ProductionConfig)
         
@@ -23,19 +24,8 @@ def migrate_database():
             db.session.execute(text('SELECT 1'))
             print("✅ Database connection successful")
             
-            # Create all tables
-            print("📊 Creating database tables...")
-            db.create_all()
-            print("✅ Tables created successfully")
-            
-            # Verify tables
-            from sqlalchemy import inspect
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            
-            print(f"📋 Found {len(tables)} tables:")
-            for table in sorted(tables):
-                print(f"   ✅ {table}")
+            # Create tables only when the models or migrations changed
+            sync_schema(db, force='--force' in sys.argv)
                 
             print("🎉 Database migration completed successfully!")
             
@@ -2,12 +2,20 @@
 Pytest configuration and fixtures
 """
 import pytest
+import jwt
+from datetime import datetime, timezone, timedelta
+from flask import request as flask_request, request_finished
 from app import create_app, db
+from app.utils import auth
+from app.utils.query_stats import request_query_count
 from app.models.customer import Customer
 from app.models.mechanic import Mechanic
 from app.models.inventory import Inventory
 from config import TestingConfig
 
+# pytester runs the query_budget fixture against a test that exceeds it
+pytest_plugins = ['pytester']
+
 @pytest.fixture
 def app():
     """Create application for testing"""
@@ -55,4 +63,51 @@ def client(app):
 @pytest.fixture
 def runner(app):
     """Create CLI runner"""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
+
+@pytest.fixture
+def mechanic_headers(app):
+    """Authorization header for the seeded mechanic"""
+    mechanic = Mechanic.query.filter_by(email="mechanic@example.com").first()
+    token = jwt.encode({
+        'mechanic_id': mechanic.id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+        'type': 'mechanic'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def customer_headers(app):
+    """Authorization header for the seeded customer"""
+    customer = Customer.query.filter_by(email="test@example.com").first()
+    token = jwt.encode({
+        'customer_id': customer.id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+        'type': 'customer'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture(autouse=True)
+def query_budget(request):
+    """Fail a test marked @pytest.mark.query_budget(n) if any request runs more than n queries"""
+    marker = request.node.get_closest_marker('query_budget')
+    if marker is None:
+        yield None
+        return
+
+    budget = marker.args[0]
+    over_budget = []
+
+    def check_budget(sender, response, **extra):
+        count = request_query_count()
+        if count > budget:
+            over_budget.append(f"{flask_request.method} {flask_request.full_path}: {count} queries")
+
+    request_finished.connect(check_budget)
+    try:
+        yield budget
+    finally:
+        request_finished.disconnect(check_budget)
+
+    if over_budget:
+        pytest.fail(f"Query budget of {budget} exceeded:\n  " + "\n  ".join(over_budget))
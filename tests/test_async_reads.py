@@ -0,0 +1,171 @@
+"""
+Tests for the ASGI app and its async read endpoints
+"""
+import asyncio
+import gzip
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+
+from app import create_app, db
+from app.utils import auth
+from app.utils.async_reads import async_database_url, create_asgi_app
+from app.utils.fault_injection import LatencyInjector
+from app.utils.seed import seed_database
+from config import TestingConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'async.sqlite'}"
+        DEBUG = False
+        RESPONSE_CACHE_ENABLED = False
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+        seed_database(60, seed=3)
+        yield app
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def asgi(app):
+    application = create_asgi_app(app)
+    yield application
+    asyncio.run(application.engine.dispose())
+
+
+@pytest.fixture
+def mechanic_headers():
+    token = jwt.encode({
+        'mechanic_id': 1,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+        'type': 'mechanic'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return {'Authorization': f'Bearer {token}'}
+
+
+async def request(application, path, method='GET', headers=None, body=b''):
+    """``(status, headers, body)`` from one request through the ASGI app"""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'client': ('127.0.0.1', 5000), 'server': ('testserver', 80),
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    start = sent[0]
+    return (start['status'], {k.decode().lower(): v.decode() for k, v in start['headers']},
+            b''.join(message.get('body', b'') for message in sent[1:]))
+
+
+def call(application, path, **kwargs):
+    return asyncio.run(request(application, path, **kwargs))
+
+
+@pytest.mark.parametrize('path', [
+    '/tickets/', '/tickets/?status=open', '/tickets/?priority=high&compact=1', '/inventory/', '/mechanics/',
+    '/inventory/?ids=3,1,999', '/mechanics/?ids=2&ids=1',
+])
+def test_async_endpoints_match_flask_views(app, asgi, mechanic_headers, path):
+    expected = app.test_client().get(path, headers=mechanic_headers)
+    status, headers, body = call(asgi, path, headers=mechanic_headers)
+
+    assert status == expected.status_code == 200
+    assert body == expected.get_data()
+    assert headers['content-type'] == expected.content_type
+
+
+@pytest.mark.parametrize('path', ['/inventory/?ids=x', '/inventory/?ids=99999999999999999999'])
+def test_invalid_ids_match_flask_views(app, asgi, path):
+    expected = app.test_client().get(path)
+    status, _headers, body = call(asgi, path)
+    assert (status, body) == (expected.status_code, expected.get_data()) and status == 400
+
+
+def test_token_errors_match_flask_views(app, asgi):
+    for headers in ({}, {'Authorization': 'Token abc'}, {'Authorization': 'Bearer not-a-jwt'}):
+        expected = app.test_client().get('/tickets/', headers=headers)
+        status, _headers, body = call(asgi, '/tickets/', headers=headers)
+        assert (status, body) == (expected.status_code, expected.get_data())
+
+
+def test_responses_are_compressed(asgi, mechanic_headers):
+    status, headers, body = call(asgi, '/tickets/', headers=dict(mechanic_headers, **{'Accept-Encoding': 'gzip'}))
+    assert status == 200
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert gzip.decompress(body).startswith(b'{"data":')
+
+
+def test_other_requests_fall_through_to_flask(app, asgi):
+    status, _headers, body = call(asgi, '/health')
+    assert status == 200 and b'"healthy"' in body
+
+    status, _headers, body = call(asgi, '/auth/mechanic/login', method='POST',
+                                  headers={'Content-Type': 'application/json'}, body=b'{}')
+    assert status == 400
+
+
+def test_default_rate_limits_cover_async_endpoints(tmp_path):
+    class LimitedConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'limited.sqlite'}"
+        RATELIMIT_ENABLED = True
+        RATELIMIT_STORAGE_URI = 'memory://'
+
+    app = create_app(LimitedConfig)
+    with app.app_context():
+        db.create_all()
+        application = create_asgi_app(app)
+        client = app.test_client()
+        # "50 per hour", counted together with the Flask view
+        statuses = [client.get('/inventory/').status_code for _ in range(20)]
+        statuses += [call(application, '/inventory/')[0] for _ in range(30)]
+        assert statuses == [200] * 50
+
+        status, headers, _body = call(application, '/inventory/')
+        flask_response = client.get('/inventory/')
+        assert status == flask_response.status_code == 429
+        assert headers['content-type'] == flask_response.content_type
+        # Limits are per endpoint, like the Flask views'
+        assert call(application, '/mechanics/')[0] == 200
+
+        asyncio.run(application.engine.dispose())
+        db.engine.dispose()
+
+
+def test_db_latency_does_not_block_the_loop(asgi):
+    LatencyInjector(latency_ms=150).attach(asgi.engine.sync_engine)
+
+    async def concurrently():
+        return await asyncio.gather(*(request(asgi, '/mechanics/') for _ in range(5)))
+
+    start = time.perf_counter()
+    responses = asyncio.run(concurrently())
+    elapsed = time.perf_counter() - start
+
+    assert [status for status, _headers, _body in responses] == [200] * 5
+    assert elapsed < 0.6  # five 150 ms statements, overlapped rather than one after another
+
+
+def test_async_database_urls():
+    assert str(async_database_url('sqlite:///app.db')) == 'sqlite+aiosqlite:///app.db'
+    assert str(async_database_url('postgres://u:p@db/shop')).startswith('postgresql+asyncpg://u:')
+    assert async_database_url('postgresql+psycopg2://db/shop').drivername == 'postgresql+asyncpg'
+    with pytest.raises(ValueError):
+        async_database_url('sqlite:///:memory:')
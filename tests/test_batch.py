@@ -0,0 +1,131 @@
+"""
+Tests for POST /batch
+"""
+import time
+
+import pytest
+from flask import g, request
+
+from app import create_app, db
+from app.utils import auth
+from app.utils.seed import seed_database
+from config import TestingConfig
+
+
+def batch(client, operations, headers=None, **options):
+    return client.post('/batch', headers=headers, json=dict(options, requests=operations))
+
+
+def test_batch_matches_individual_calls(client, mechanic_headers):
+    response = batch(client, [
+        {'id': 'parts', 'method': 'GET', 'path': '/inventory/'},
+        {'id': 'mechanics', 'method': 'GET', 'path': '/mechanics/'},
+        {'method': 'GET', 'path': '/tickets/?status=open'},
+    ], headers=mechanic_headers)
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['count'] == 3
+    assert [result.get('id') for result in data['responses']] == ['parts', 'mechanics', None]
+    for result, path in zip(data['responses'], ('/inventory/', '/mechanics/', '/tickets/?status=open')):
+        expected = client.get(path, headers=mechanic_headers)
+        assert (result['status'], result['body']) == (expected.status_code, expected.get_json())
+
+
+def test_each_operation_is_authorized(client, customer_headers):
+    results = batch(client, [
+        {'method': 'GET', 'path': '/inventory/'},
+        {'method': 'GET', 'path': '/tickets/'},
+        {'method': 'GET', 'path': '/tickets/my-tickets'},
+        {'method': 'GET', 'path': '/nowhere'},
+    ], headers=customer_headers).get_json()['data']['responses']
+    assert [result['status'] for result in results] == [200, 403, 200, 404]
+
+
+def test_operations_run_in_order_and_see_earlier_writes(client, mechanic_headers):
+    results = batch(client, [
+        {'method': 'POST', 'path': '/inventory/', 'body': {'part_name': 'Rotor', 'price': 80}},
+        {'method': 'POST', 'path': '/inventory/', 'body': {'price': 80}},
+        {'method': 'GET', 'path': '/inventory/'},
+    ], headers=mechanic_headers, parallel=True).get_json()['data']['responses']
+
+    assert [result['status'] for result in results] == [201, 400, 200]
+    assert 'Rotor' in {item['part_name'] for item in results[2]['body']['data']['inventory']}
+
+
+def test_token_is_verified_once_per_batch(client, mechanic_headers, monkeypatch):
+    calls = []
+    decode = auth.jwt.decode
+    monkeypatch.setattr(auth.jwt, 'decode', lambda *args, **kwargs: calls.append(1) or decode(*args, **kwargs))
+
+    response = batch(client, [{'method': 'GET', 'path': '/tickets/'}] * 3, headers=mechanic_headers)
+    assert [result['status'] for result in response.get_json()['data']['responses']] == [200] * 3
+    assert len(calls) == 1
+
+
+def test_operations_start_with_a_fresh_g(app, client, mechanic_headers):
+    seen = []
+
+    @app.before_request
+    def record_g():
+        if request.path == '/batch':
+            g.batch_only = True
+        else:
+            seen.append(set(vars(g)))
+
+    batch(client, [{'method': 'GET', 'path': '/inventory/'}] * 2, headers=mechanic_headers)
+    assert len(seen) == 2
+    assert all('batch_only' not in keys and '_verified_tokens' in keys for keys in seen)
+
+
+def test_query_count_covers_every_operation(client, mechanic_headers):
+    single = int(client.get('/tickets/', headers=mechanic_headers).headers['X-Query-Count'])
+    response = batch(client, [{'method': 'GET', 'path': '/tickets/'}] * 2, headers=mechanic_headers)
+    assert single > 0
+    assert int(response.headers['X-Query-Count']) == 2 * single
+
+
+@pytest.mark.parametrize('body', [
+    {'requests': [{'method': 'GET', 'path': '/inventory/'}] * 21},
+    {'requests': [{'method': 'GET', 'path': '/batch'}]},
+    {'requests': [{'method': 'GET', 'path': 'inventory'}]},
+    {'requests': [{'method': 'GET'}]},
+    {'requests': [{'method': 'TRACE', 'path': '/inventory/'}]},
+    {},
+])
+def test_invalid_batches_are_rejected(client, body):
+    response = client.post('/batch', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+@pytest.fixture
+def slow_app(tmp_path):
+    class SlowConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'batch.sqlite'}"
+        DB_FAULT_LATENCY_MS = 100
+        RESPONSE_CACHE_ENABLED = False
+
+    app = create_app(SlowConfig)
+    with app.app_context():
+        db.create_all()
+        seed_database(5, seed=1)
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_parallel_reads_overlap(slow_app):
+    client = slow_app.test_client()
+    operations = [{'method': 'GET', 'path': path} for path in ('/mechanics/', '/inventory/', '/mechanics/ranking')]
+
+    start = time.perf_counter()
+    sequential = batch(client, operations).get_json()['data']['responses']
+    sequential_time = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = batch(client, operations, parallel=True).get_json()['data']['responses']
+    parallel_time = time.perf_counter() - start
+
+    assert parallel == sequential
+    assert [result['status'] for result in parallel] == [200] * 3
+    assert parallel_time < sequential_time * 0.75
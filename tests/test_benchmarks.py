@@ -0,0 +1,51 @@
+"""
+Tests for the endpoint benchmark harness
+"""
+import os
+
+from app import create_app, db
+from app.models import ServiceTicket
+from benchmarks import bench_endpoints
+from benchmarks.datasets import benchmark_config, seed
+
+
+def test_seed_is_deterministic(tmp_path):
+    snapshots = []
+    for name in ('a.sqlite', 'b.sqlite'):
+        app = create_app(benchmark_config(os.path.join(tmp_path, name)))
+        with app.app_context():
+            db.create_all()
+            counts = seed(200, seed=7)
+            tickets = ServiceTicket.query.order_by(ServiceTicket.id).all()
+            snapshots.append([
+                (t.customer_id, t.status, sorted(m.id for m in t.mechanics), sorted(p.id for p in t.inventory))
+                for t in tickets
+            ])
+            db.session.remove()
+            db.engine.dispose()
+    assert counts['service_ticket'] == 200
+    assert snapshots[0] == snapshots[1]
+
+
+def test_run_reports_query_counts(tmp_path, monkeypatch):
+    monkeypatch.setattr('benchmarks.datasets.DATA_DIR', str(tmp_path))
+    results = bench_endpoints.run(50, requests=3, warmup=1, seed=1)
+    assert set(results) == set(bench_endpoints.ENDPOINTS)
+    assert results['inventory_list']['queries'] == 1
+    assert all(r['p50_ms'] <= r['p99_ms'] for r in results.values())
+
+
+def test_compare_flags_regressions():
+    baseline = {'inventory_list': {'p50_ms': 10.0, 'p95_ms': 20.0, 'queries': 1}}
+    within = {'inventory_list': {'p50_ms': 11.0, 'p95_ms': 21.5, 'queries': 1}}
+    assert bench_endpoints.compare(within, baseline, threshold=0.25) == []
+
+    slower = {'inventory_list': {'p50_ms': 30.0, 'p95_ms': 20.0, 'queries': 3}}
+    regressions = bench_endpoints.compare(slower, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert any('queries' in r for r in regressions)
+
+    # Sub-millisecond jitter never counts, whatever the percentage
+    tiny = {'inventory_list': {'p50_ms': 0.2, 'p95_ms': 0.4, 'queries': 1}}
+    jitter = {'inventory_list': {'p50_ms': 0.9, 'p95_ms': 1.5, 'queries': 1}}
+    assert bench_endpoints.compare(jitter, tiny, threshold=0.25) == []
@@ -0,0 +1,122 @@
+"""
+Tests for gzip/brotli response compression
+"""
+import gzip
+import zlib
+
+import pytest
+from flask import stream_with_context
+
+from app import create_app, db
+from app.models.inventory import Inventory
+from app.utils import compression
+from config import TestingConfig
+
+
+class CompressedConfig(TestingConfig):
+    RESPONSE_CACHE_ENABLED = False
+    COMPRESS_MIN_SIZE = 1000
+
+
+@pytest.fixture
+def app():
+    app = create_app(CompressedConfig)
+
+    @app.route('/stream-test')
+    def stream_test():
+        def generate():
+            for i in range(50):
+                yield f'{{"line": {i}, "text": "repetitive streamed payload"}}\n'
+        return app.response_class(stream_with_context(generate()), mimetype='application/json')
+    _ = stream_test
+
+    with app.app_context():
+        db.create_all()
+        for i in range(20):
+            db.session.add(Inventory(part_name=f'Brake Pad {i}', part_number=f'BP-{i:03d}', price=10.0))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_gzip_when_accepted(client):
+    plain = client.get('/inventory/')
+    compressed = client.get('/inventory/', headers={'Accept-Encoding': 'gzip'})
+
+    assert plain.headers.get('Content-Encoding') is None
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    assert int(compressed.headers['Content-Length']) < len(plain.data) / 3
+
+
+@pytest.mark.skipif(compression.brotli is None, reason='brotli not installed')
+def test_brotli_preferred_when_available(client):
+    response = client.get('/inventory/', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert compression.brotli.decompress(response.data) == client.get('/inventory/').data
+
+
+def test_quality_values_are_honoured(client):
+    response = client.get('/inventory/', headers={'Accept-Encoding': 'br;q=0, gzip;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    response = client.get('/inventory/', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert response.headers.get('Content-Encoding') is None
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get('/inventory/1', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') is None
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_streamed_responses_are_compressed_incrementally(client):
+    response = client.get('/stream-test', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+
+    decompressor = zlib.decompressobj(31)
+    chunks = [decompressor.decompress(chunk) for chunk in response.response]
+    # Every input line was flushed as soon as it was produced
+    assert all(chunk.endswith(b'\n') for chunk in chunks if chunk)
+    body = b''.join(chunks) + decompressor.flush()
+    assert body.count(b'\n') == 50
+
+
+def test_static_spec_is_precompressed_at_startup(app, client):
+    compressor = app.extensions['compression']
+    assert any(path.endswith('swagger.yaml') for path in compressor.static.entries)
+
+    response = client.get('/static/swagger.yaml', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'application/yaml'
+    assert gzip.decompress(response.data).startswith(b'openapi')
+
+    etag = response.headers['ETag']
+    assert etag.endswith('-gzip"')
+    cached = client.get('/static/swagger.yaml', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert cached.status_code == 304
+
+
+def test_swagger_ui_assets_compressed_once(app, client):
+    compressor = app.extensions['compression']
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/docs/swagger-ui.css', headers=headers)
+    assert first.headers['Content-Encoding'] == 'gzip'
+    path, entry = next((p, e) for p, e in compressor.static.entries.items() if p.endswith('swagger-ui.css'))
+
+    second = client.get('/docs/swagger-ui.css', headers=headers)
+    assert second.data == first.data
+    assert compressor.static.entries[path] is entry
+
+
+def test_range_requests_bypass_precompressed_copy(client):
+    response = client.get('/static/swagger.yaml', headers={'Accept-Encoding': 'gzip', 'Range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert response.headers.get('Content-Encoding') is None
@@ -0,0 +1,55 @@
+"""
+Test connection pool configuration and pool statistics
+"""
+from app import create_app
+from app.utils.db_pool import engine_options, InstrumentedQueuePool
+from config import TestingConfig
+
+
+def test_engine_options_per_config():
+    """Sizing applies to pooled databases, not in-memory SQLite"""
+    memory = engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'DB_POOL_RECYCLE': 60})
+    assert memory == {'pool_pre_ping': True, 'pool_recycle': 60}
+
+    postgres = engine_options({
+        'SQLALCHEMY_DATABASE_URI': 'postgresql://u:p@db/shop',
+        'DB_POOL_SIZE': 8,
+        'DB_MAX_OVERFLOW': 2,
+        'DB_POOL_TIMEOUT': 5,
+        'DB_POOL_PRE_PING': False,
+    })
+    assert postgres['poolclass'] is InstrumentedQueuePool
+    assert postgres['pool_size'] == 8
+    assert postgres['max_overflow'] == 2
+    assert postgres['pool_timeout'] == 5.0
+    assert postgres['pool_pre_ping'] is False
+
+
+def test_health_basic_has_no_pool():
+    app = create_app(TestingConfig)
+    with app.test_client() as client:
+        data = client.get('/health').get_json()
+    assert 'database_pool' not in data
+
+
+def test_health_detailed_pool_stats(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path}/pool.db"
+        DB_POOL_SIZE = 3
+        DB_MAX_OVERFLOW = 1
+
+    app = create_app(FileConfig)
+    with app.test_client() as client:
+        client.get('/health')
+        data = client.get('/health?detailed=1').get_json()
+
+    pool = data['database_pool']
+    assert pool['class'] == 'InstrumentedQueuePool'
+    assert pool['size'] == 3
+    assert pool['max_overflow'] == 1
+    assert pool['pre_ping'] is True
+    assert pool['checkouts'] >= 2
+    assert pool['connects'] >= 1
+    histogram = pool['checkout_latency_ms']
+    assert histogram['count'] >= 2
+    assert histogram['buckets']['+Inf'] == histogram['count']
@@ -0,0 +1,199 @@
+"""
+Tests for Idempotency-Key support on the ticket write routes
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+
+from app import create_app, db
+from app.models import Customer, IdempotencyKey, Inventory, ServiceTicket
+from app.utils import auth
+from app.utils.idempotency import _utcnow
+from config import TestingConfig
+
+TICKET = {'vehicle_info': '2018 Civic', 'issue_description': 'Brakes squeal'}
+
+
+def create_ticket(client, headers, key=None, body=TICKET):
+    if key is not None:
+        headers = dict(headers, **{'Idempotency-Key': key})
+    return client.post('/tickets/', headers=headers, json=body)
+
+
+def test_retry_replays_the_stored_response(client, customer_headers):
+    first = create_ticket(client, customer_headers, 'abc-1')
+    retry = create_ticket(client, customer_headers, 'abc-1')
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_data() == first.get_data()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert ServiceTicket.query.count() == 1
+
+
+def test_retry_after_logging_in_again_replays(client, customer_headers):
+    customer = Customer.query.filter_by(email='test@example.com').one()
+    fresh_token = jwt.encode({
+        'customer_id': customer.id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=2),
+        'type': 'customer'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    assert f'Bearer {fresh_token}' != customer_headers['Authorization']
+
+    first = create_ticket(client, customer_headers, 'relogin')
+    retry = create_ticket(client, {'Authorization': f'Bearer {fresh_token}'}, 'relogin')
+
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_data() == first.get_data()
+    assert ServiceTicket.query.count() == 1
+
+
+def test_keys_are_scoped_to_the_principal(client, customer_headers):
+    other = Customer(first_name='Other', last_name='Customer', email='other@example.com')
+    other.set_password('password123')
+    db.session.add(other)
+    db.session.commit()
+    other_token = jwt.encode({
+        'customer_id': other.id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+        'type': 'customer'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+
+    create_ticket(client, customer_headers, 'same')
+    response = create_ticket(client, {'Authorization': f'Bearer {other_token}'}, 'same')
+    assert 'Idempotent-Replayed' not in response.headers
+    assert ServiceTicket.query.count() == 2
+
+
+def test_requests_without_a_key_are_not_deduplicated(client, customer_headers):
+    create_ticket(client, customer_headers, 'shared')
+    create_ticket(client, customer_headers)
+    create_ticket(client, customer_headers)
+    assert ServiceTicket.query.count() == 3
+
+
+def test_retried_add_part_takes_stock_once(client, customer_headers, mechanic_headers):
+    ticket_id = create_ticket(client, customer_headers).get_json()['data']['id']
+    part = Inventory.query.filter_by(part_number='TEST-001').first()
+    headers = dict(mechanic_headers, **{'Idempotency-Key': 'part-1'})
+
+    responses = [client.post(f'/tickets/{ticket_id}/add-part', headers=headers,
+                             json={'part_id': part.id, 'quantity': 3}) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200] * 3
+    db.session.refresh(part)
+    assert part.quantity == 7
+
+
+def test_reused_key_with_another_body_is_rejected(client, customer_headers):
+    create_ticket(client, customer_headers, 'abc-2')
+    response = create_ticket(client, customer_headers, 'abc-2', dict(TICKET, vehicle_info='Other'))
+    assert response.status_code == 422
+    assert ServiceTicket.query.count() == 1
+
+
+def test_invalid_keys_are_rejected(client, customer_headers):
+    assert create_ticket(client, customer_headers, ' ').status_code == 400
+    assert create_ticket(client, customer_headers, 'k' * 256).status_code == 400
+
+
+def test_client_errors_are_stored_and_server_errors_release_the_key(app, client, customer_headers):
+    assert create_ticket(client, customer_headers, 'bad', {}).status_code == 400
+    assert create_ticket(client, customer_headers, 'bad', {}).headers['Idempotent-Replayed'] == 'true'
+
+    store = app.extensions['idempotency']
+    assert store.claim('k' * 64, 'f') is None
+    store.save('k' * 64, app.response_class('oops', status=503))
+    assert db.session.get(IdempotencyKey, 'k' * 64) is None
+
+
+def test_in_flight_duplicate_gets_409_after_waiting(app, client, customer_headers, monkeypatch):
+    monkeypatch.setattr(app.extensions['idempotency'], 'wait', 0)
+    original = app.extensions['idempotency'].claim
+
+    def claim_taken(key, fingerprint):
+        # Another worker claimed the key a moment ago and is still running
+        now = _utcnow()
+        db.session.add(IdempotencyKey(key=key, fingerprint=fingerprint, created_at=now,
+                                      expires_at=now + timedelta(days=1)))
+        db.session.commit()
+        return original(key, fingerprint)
+
+    monkeypatch.setattr(app.extensions['idempotency'], 'claim', claim_taken)
+    response = create_ticket(client, customer_headers, 'busy')
+    assert response.status_code == 409
+    assert response.headers['Retry-After'] == '1'
+    assert ServiceTicket.query.count() == 0
+
+
+def test_stale_and_expired_keys_are_taken_over(app):
+    store = app.extensions['idempotency']
+    now = _utcnow()
+    db.session.add_all([
+        IdempotencyKey(key='a' * 64, fingerprint='x', created_at=now - timedelta(hours=1),
+                       expires_at=now + timedelta(days=1)),
+        IdempotencyKey(key='b' * 64, fingerprint='x', status_code=201, body=b'{}',
+                       created_at=now - timedelta(days=2), expires_at=now - timedelta(days=1)),
+    ])
+    db.session.commit()
+
+    assert store.claim('a' * 64, 'y') is None
+    assert store.claim('b' * 64, 'y') is None
+
+
+def test_purge_command_deletes_expired_keys(app, runner):
+    now = _utcnow()
+    db.session.add_all([
+        IdempotencyKey(key='old', fingerprint='x', status_code=201, created_at=now, expires_at=now - timedelta(seconds=1)),
+        IdempotencyKey(key='new', fingerprint='x', status_code=201, created_at=now, expires_at=now + timedelta(days=1)),
+    ])
+    db.session.commit()
+
+    result = runner.invoke(args=['purge-idempotency-keys'])
+    assert 'Deleted 1 expired' in result.output
+    assert [row.key for row in IdempotencyKey.query.all()] == ['new']
+
+
+@pytest.fixture
+def slow_app(tmp_path):
+    class SlowConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'idempotency.sqlite'}"
+        DB_FAULT_LATENCY_MS = 20
+
+    app = create_app(SlowConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_concurrent_duplicates_run_once(slow_app):
+    customer = Customer(first_name="Race", last_name="Condition", email="race@example.com")
+    customer.set_password("password123")
+    db.session.add(customer)
+    db.session.commit()
+    token = jwt.encode({
+        'customer_id': customer.id,
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+        'type': 'customer'
+    }, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    headers = {'Authorization': f'Bearer {token}', 'Idempotency-Key': 'race'}
+
+    responses = []
+
+    def post():
+        responses.append(slow_app.test_client().post('/tickets/', headers=headers, json=TICKET))
+
+    threads = [threading.Thread(target=post) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [response.status_code for response in responses] == [201] * 3
+    assert len({response.get_data() for response in responses}) == 1
+    assert sum(response.headers.get('Idempotent-Replayed') == 'true' for response in responses) == 2
+    assert ServiceTicket.query.count() == 1
@@ -0,0 +1,75 @@
+"""
+Tests for the JSON provider
+"""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.utils import json_provider
+
+PAYLOAD = {
+    'b': 1,
+    'a': datetime(2024, 5, 6, 7, 8, 9, 123456),
+    'when': date(2024, 1, 2),
+    'aware': datetime(2024, 1, 1, tzinfo=timezone.utc),
+    'price': Decimal('9.50'),
+    'nested': [{'z': None, 'y': 29.99}],
+}
+EXPECTED = {
+    'b': 1,
+    'a': '2024-05-06T07:08:09.123456',
+    'when': '2024-01-02',
+    'aware': '2024-01-01T00:00:00+00:00',
+    'price': '9.50',
+    'nested': [{'z': None, 'y': 29.99}],
+}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def provider(request, app, monkeypatch):
+    if request.param == 'orjson':
+        if json_provider.orjson is None:
+            pytest.skip('orjson not installed')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    return app.json
+
+
+def test_app_uses_fast_provider(app):
+    assert isinstance(app.json, json_provider.FastJSONProvider)
+
+
+def test_dumps_dates_as_iso_and_sorts_keys(provider):
+    text = provider.dumps(PAYLOAD)
+    assert json.loads(text) == EXPECTED
+    assert text.index('"a"') < text.index('"b"')
+
+
+def test_sort_keys_can_be_disabled(provider, monkeypatch):
+    monkeypatch.setattr(provider, 'sort_keys', False)
+    text = provider.dumps({'b': 1, 'a': 2})
+    assert text.index('"b"') < text.index('"a"')
+
+
+def test_response_matches_stdlib_output(provider, app):
+    with app.test_request_context():
+        body = provider.response(PAYLOAD).get_data()
+    assert json.loads(body) == EXPECTED
+    assert body.endswith(b'\n')
+
+
+def test_loads_round_trip(provider):
+    assert provider.loads(b'{"x": [1, 2.5, "\\u00e9"]}') == {'x': [1, 2.5, 'é']}
+
+
+def test_unserializable_raises_type_error(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({'x': object()})
+
+
+def test_api_dates_are_iso_strings(client):
+    response = client.get('/inventory/1')
+    created_at = response.get_json()['data']['created_at']
+    assert datetime.fromisoformat(created_at)
@@ -0,0 +1,76 @@
+"""
+Tests for DB latency fault injection and the load generator
+"""
+import asyncio
+import os
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from app import create_app, db
+from app.utils import auth
+from benchmarks import loadgen
+from benchmarks.datasets import benchmark_config, dataset_counts, seed
+from config import Config, TestingConfig
+
+
+class SlowDatabaseConfig(TestingConfig):
+    DB_FAULT_LATENCY_MS = 30
+
+
+def test_fault_injection_delays_every_statement():
+    app = create_app(SlowDatabaseConfig)
+    assert 'db_fault_injection' in app.extensions
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    start = time.perf_counter()
+    response = client.get('/inventory/')
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    queries = int(response.headers['X-Query-Count'])
+    assert elapsed >= queries * 0.03
+
+
+def test_fault_injection_off_by_default(app):
+    assert 'db_fault_injection' not in app.extensions
+
+
+def test_parse_mix():
+    assert loadgen.parse_mix('poll_inventory=3, login') == {'poll_inventory': 3.0, 'login': 1.0}
+    try:
+        loadgen.parse_mix('nope=1')
+    except ValueError as e:
+        assert 'nope' in str(e)
+    else:
+        raise AssertionError('unknown scenario accepted')
+
+
+def test_run_load_against_live_server(tmp_path, monkeypatch):
+    # Login tokens are signed with Config.SECRET_KEY
+    monkeypatch.setattr(auth, 'SECRET_KEY', Config.SECRET_KEY)
+    app = create_app(benchmark_config(os.path.join(tmp_path, 'load.sqlite')))
+    with app.app_context():
+        db.create_all()
+        seed(100, seed=3)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        counts = dict(dataset_counts(100), service_ticket=100)
+        mix = loadgen.parse_mix('poll_inventory=2,create_ticket=1,add_part=1')
+        rows, _ = asyncio.run(loadgen.run_load(
+            f'http://127.0.0.1:{server.server_port}', counts, mix, concurrency=3, duration=2.5,
+        ))
+    finally:
+        server.shutdown()
+
+    assert rows['login']['requests'] == 6
+    assert rows['login']['client_errors'] == 0
+    for scenario in ('poll_inventory', 'create_ticket', 'add_part'):
+        assert rows[scenario]['requests'] > 0
+        assert rows[scenario]['errors'] == 0
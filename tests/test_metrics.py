@@ -0,0 +1,87 @@
+"""
+Test the Prometheus /metrics endpoint
+"""
+import multiprocessing
+
+from app import create_app
+from app.utils.shared_counters import SharedCounters
+from config import TestingConfig
+
+
+def _serve_requests(config_class, count):
+    app = create_app(config_class)
+    with app.test_client() as client:
+        for _ in range(count):
+            client.get('/health')
+
+
+def _sample(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def test_metrics_exposition(client):
+    """Requests show up as counters and histograms"""
+    client.get('/mechanics/')
+    client.get('/mechanics/')
+    client.get('/no-such-page')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    text = response.get_data(as_text=True)
+
+    labels = 'endpoint="mechanics.get_mechanics",method="GET"'
+    assert _sample(text, f'http_requests_total{{{labels},status="200"}}') == 2
+    assert _sample(text, 'http_requests_total{endpoint="unmatched",method="GET",status="404"}') == 1
+    assert _sample(text, f'http_request_duration_seconds_count{{{labels}}}') == 2
+    assert _sample(text, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 2
+    assert _sample(text, f'http_request_db_seconds_sum{{{labels}}}') > 0
+    assert _sample(text, f'http_response_size_bytes_count{{{labels}}}') == 2
+    # completed requests leave the gauge back at zero
+    assert _sample(text, f'http_requests_in_flight{{{labels}}}') == 0
+    assert '# TYPE http_request_duration_seconds histogram' in text
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    """Workers sharing METRICS_PATH export combined totals"""
+    class SharedConfig(TestingConfig):
+        METRICS_PATH = str(tmp_path / 'metrics.bin')
+
+    ctx = multiprocessing.get_context('fork')
+    workers = [ctx.Process(target=_serve_requests, args=(SharedConfig, 5)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    app = create_app(SharedConfig)
+    with app.test_client() as client:
+        text = client.get('/metrics').get_data(as_text=True)
+    assert _sample(text, 'http_requests_total{endpoint="health_check",method="GET",status="200"}') == 15
+
+
+def test_unknown_methods_share_one_series(app, client):
+    """Made-up methods cannot add series or break the exposition"""
+    for method in ('PROPFIND', 'AA|B', 'X' * 40):
+        client.open('/no-such-page', method=method)
+    client.open('/mechanics/', method='BREW')
+    # a key left behind by a version that did not check labels
+    app.extensions['metrics'].counters.incr_many([('r|unmatched|AA|B|405', 1)])
+
+    text = client.get('/metrics').get_data(as_text=True)
+    assert _sample(text, 'http_requests_total{endpoint="unmatched",method="OTHER",status="404"}') == 3
+    assert _sample(text, 'http_requests_total{endpoint="unmatched",method="OTHER",status="405"}') == 1
+    assert 'AA' not in text and 'PROPFIND' not in text
+
+
+def test_full_table_drops_samples_instead_of_failing(app, client, tmp_path):
+    metrics = app.extensions['metrics']
+    metrics.counters = SharedCounters(str(tmp_path / 'tiny.bin'), slots=2)
+
+    assert client.get('/health').status_code == 200
+    assert client.get('/mechanics/').status_code == 200
+    assert metrics.table_full
+    assert client.get('/metrics').status_code == 200
@@ -0,0 +1,62 @@
+"""
+Tests for ?ids= multi-gets on the inventory, mechanics and customers lists
+"""
+import pytest
+
+from app import db
+from app.models.inventory import Inventory
+from app.models.mechanic import Mechanic
+
+
+@pytest.fixture
+def part_ids(app):
+    parts = [Inventory(part_name=f"Part {i}", part_number=f"MG-{i}", price=10 + i, quantity=i) for i in range(3)]
+    db.session.add_all(parts)
+    db.session.commit()
+    return [part.id for part in parts]
+
+
+@pytest.mark.query_budget(1)
+def test_inventory_in_request_order_with_missing_markers(client, part_ids):
+    first, second, third = part_ids
+    response = client.get(f'/inventory/?ids={third},999,{first},{third}')
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert [item['id'] for item in data['inventory']] == [third, 999, first, third]
+    assert data['inventory'][0] == client.get(f'/inventory/{third}').get_json()['data']
+    assert data['inventory'][1] == {'id': 999, 'error': 'Inventory item not found'}
+    assert (data['count'], data['found'], data['missing']) == (4, 3, [999])
+
+
+def test_repeated_ids_arguments_are_combined(client, part_ids):
+    query = '&'.join(f'ids={part_id}' for part_id in part_ids)
+    data = client.get(f'/inventory/?{query}').get_json()['data']
+    assert [item['id'] for item in data['inventory']] == part_ids
+
+
+def test_mechanics_by_ids(client):
+    mechanic = Mechanic.query.filter_by(email="mechanic@example.com").first()
+    data = client.get(f'/mechanics/?ids={mechanic.id},404').get_json()['data']
+    assert data['mechanics'][0] == client.get(f'/mechanics/{mechanic.id}').get_json()['data']
+    assert data['mechanics'][1] == {'id': 404, 'error': 'Mechanic not found'}
+
+
+def test_customers_by_ids_are_mechanic_only(client, mechanic_headers, customer_headers):
+    assert client.get('/customers/?ids=1').status_code == 401
+    assert client.get('/customers/?ids=1', headers=customer_headers).status_code == 403
+
+    response = client.get('/customers/?ids=1,2', headers=mechanic_headers)
+    assert response.status_code == 200
+    customers = response.get_json()['data']['customers']
+    assert customers[0]['email'] == 'test@example.com'
+    assert 'password_hash' not in customers[0]
+    assert customers[1] == {'id': 2, 'error': 'Customer not found'}
+
+
+@pytest.mark.parametrize('query', ['ids=', 'ids=a,b', 'ids=0', 'ids=1,-2', 'ids=' + ','.join(['1'] * 101),
+                                   'ids=99999999999999999999', f'ids=1,{2 ** 63}'])
+def test_invalid_ids_are_rejected(client, query):
+    response = client.get(f'/inventory/?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
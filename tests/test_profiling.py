@@ -0,0 +1,61 @@
+"""
+Test on-demand and sampled request profiling
+"""
+import pstats
+
+import pytest
+
+from app import create_app, db
+from config import TestingConfig
+
+
+@pytest.fixture
+def profiling_app(tmp_path):
+    class ProfilingConfig(TestingConfig):
+        PROFILING_ENABLED = True
+        PROFILE_DIR = str(tmp_path / 'profiles')
+        PROFILE_MAX_FILES = 2
+
+    app = create_app(ProfilingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+def token_headers():
+    import jwt
+    from app.utils import auth
+    token = jwt.encode({'mechanic_id': 1, 'type': 'mechanic'}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_disabled_by_default(client, mechanic_headers):
+    response = client.get('/mechanics/', headers={**mechanic_headers, 'X-Profile': '1'})
+    assert 'X-Profile-Id' not in response.headers
+    assert client.get('/profiles/', headers=mechanic_headers).status_code == 404
+
+
+def test_profile_requires_mechanic_token(profiling_app):
+    client = profiling_app.test_client()
+    assert 'X-Profile-Id' not in client.get('/mechanics/?_profile=1').headers
+
+    response = client.get('/mechanics/?_profile=1', headers=token_headers())
+    name = response.headers['X-Profile-Id']
+
+    download = client.get(f'/profiles/{name}', headers=token_headers())
+    assert download.status_code == 200
+    path = profiling_app.extensions['profiler'].directory + '/' + name
+    assert pstats.Stats(path).total_calls > 0
+    assert client.get(f'/profiles/{name}').status_code == 401
+    assert client.get('/profiles/..%2Fconfig.py', headers=token_headers()).status_code == 404
+
+
+def test_sampling_with_bounded_storage(profiling_app):
+    profiler = profiling_app.extensions['profiler']
+    profiler.sample_rate = 2
+    client = profiling_app.test_client()
+
+    profiled = ['X-Profile-Id' in client.get('/health').headers for _ in range(8)]
+
+    assert profiled == [False, True] * 4
+    assert len(profiler.profiles()) == 2
@@ -0,0 +1,91 @@
+"""
+Test per-request query counting and the query_budget marker
+"""
+from pathlib import Path
+
+import pytest
+
+from app import db
+from app.models.customer import Customer
+from app.models.inventory import Inventory
+from app.models.mechanic import Mechanic
+from app.models.service_ticket import ServiceTicket
+
+
+def seed_tickets(count, start=0):
+    """Add ``count`` tickets, each with its own mechanic and part"""
+    customer = Customer.query.first()
+    for i in range(start, start + count):
+        mechanic = Mechanic(first_name='M', last_name=str(i), email=f'm{i}@example.com',
+                            password_hash='x')
+        part = Inventory(part_name=f'Part {i}', part_number=f'P-{i}', price=1.0, quantity=5)
+        ticket = ServiceTicket(customer_id=customer.id, vehicle_info='Car', issue_description='Fix')
+        ticket.mechanics.append(mechanic)
+        ticket.inventory.append(part)
+        db.session.add(ticket)
+    db.session.commit()
+
+
+def query_count(response):
+    return int(response.headers['X-Query-Count'])
+
+
+def test_debug_headers(client):
+    """Debug mode reports statement count and DB time"""
+    response = client.get('/mechanics/')
+    assert query_count(response) == 1
+    assert float(response.headers['X-DB-Time-Ms']) >= 0
+
+
+@pytest.mark.query_budget(3)
+def test_ticket_list_query_count_is_flat(client, mechanic_headers):
+    """Ticket lists load relations in bulk, not per ticket"""
+    seed_tickets(1)
+    small = query_count(client.get('/tickets/', headers=mechanic_headers))
+    seed_tickets(30, start=1)
+    response = client.get('/tickets/', headers=mechanic_headers)
+
+    assert response.get_json()['data']['count'] == 31
+    assert query_count(response) == small
+
+
+@pytest.mark.query_budget(1)
+def test_ranking_single_query(client):
+    seed_tickets(20)
+    response = client.get('/mechanics/ranking')
+    assert len(response.get_json()['data']['ranking']) == 21
+
+
+@pytest.mark.query_budget(4)
+def test_mechanic_tickets_query_count(client):
+    seed_tickets(10)
+    mechanic_id = Mechanic.query.filter_by(email='m3@example.com').first().id
+    response = client.get(f'/mechanics/{mechanic_id}/tickets')
+    assert response.get_json()['data']['count'] == 1
+
+
+
+def test_budget_overrun_fails_the_test(pytester):
+    """The query_budget fixture fails a test whose requests go over budget"""
+    pytester.makeconftest(Path(__file__).with_name('conftest.py').read_text())
+    pytester.makeini("""
+        [pytest]
+        markers =
+            query_budget(n): query budget
+    """)
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.mark.query_budget(0)
+        def test_over_budget(client):
+            client.get('/mechanics/')
+
+        @pytest.mark.query_budget(1)
+        def test_within_budget(client):
+            client.get('/mechanics/')
+    """)
+    result = pytester.runpytest()
+
+    # The check runs in fixture teardown, so an overrun is reported as an error
+    result.assert_outcomes(passed=2, errors=1)
+    result.stdout.fnmatch_lines(['*Query budget of 0 exceeded*', '*GET /mechanics/?: 1 queries*'])
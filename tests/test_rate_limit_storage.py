@@ -0,0 +1,145 @@
+"""
+Test the shared mmap rate limit storage
+"""
+import multiprocessing
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+from limits.storage import storage_from_string
+
+from app import create_app
+from app.utils import shared_counters
+from app.utils.shared_counters import HEADER_SIZE, SLOT, SLOT_SIZE, SharedCounters, TableFull
+from config import TestingConfig
+
+
+def _used_slots(counters):
+    return sum(1 for index in range(counters.slots)
+               if SLOT.unpack_from(counters._map, HEADER_SIZE + index * SLOT_SIZE)[0])
+
+
+def _hammer(path, key, count):
+    counters = SharedCounters(path, slots=64)
+    for _ in range(count):
+        counters.incr(key, expiry=60)
+
+
+class TestSharedCounters:
+    """Test the mmap'd counter table"""
+
+    def test_incr_get_clear(self, tmp_path):
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=64)
+        assert counters.get('a') == 0
+        assert counters.incr('a', expiry=60) == 1
+        assert counters.incr('a', 4, expiry=60) == 5
+        assert counters.get_expiry('a') > time.time()
+
+        counters.clear('a')
+        assert counters.get('a') == 0
+        assert counters.incr('a', expiry=60) == 1
+
+    def test_expired_counter_restarts(self, tmp_path):
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=64)
+        counters.incr('window', expiry=0.01)
+        time.sleep(0.02)
+        assert counters.get('window') == 0
+        assert counters.incr('window', expiry=60) == 1
+
+    def test_colliding_keys_survive_clear(self, tmp_path):
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=4)
+        for key in ('a', 'b', 'c', 'd'):
+            counters.incr(key)
+        counters.clear('a')
+        assert [counters.get(key) for key in ('b', 'c', 'd')] == [1, 1, 1]
+        assert sorted(counters.items()) == [('b', 1), ('c', 1), ('d', 1)]
+
+    def test_expired_and_cleared_slots_are_reclaimed(self, tmp_path, monkeypatch):
+        clock = SimpleNamespace(time=lambda: now)
+        monkeypatch.setattr(shared_counters, 'time', clock)
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=64)
+        now = 1000.0
+        for window in range(20):
+            for user in range(40):
+                counters.incr(f'{window}:{user}', expiry=1)
+            now += 2
+        counters.incr('kept')
+        for user in range(10):
+            counters.incr(f'gone:{user}')
+            counters.clear(f'gone:{user}')
+
+        # Old windows were swept back to empty slots, not left in the chains
+        assert _used_slots(counters) < 64
+        counters.incr('last', expiry=1)
+        assert counters.get('kept') == 1 and counters.get('19:0') == 0
+
+    def test_probe_length_is_capped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(shared_counters, 'MAX_PROBE', 4)
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=64)
+        with pytest.raises(TableFull):
+            for key in range(64):
+                counters.incr(str(key))
+        assert _used_slots(counters) < 64
+
+    def test_random_operations_match_a_dict(self, tmp_path, monkeypatch):
+        clock = SimpleNamespace(time=lambda: now)
+        monkeypatch.setattr(shared_counters, 'time', clock)
+        monkeypatch.setattr(shared_counters, 'MAX_PROBE', 8)
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots=32)
+        expected, now, rng = {}, 0.0, random.Random(7)
+        for _ in range(3000):
+            now += rng.random()
+            expected = {key: entry for key, entry in expected.items() if not 0 < entry[1] <= now}
+            key = f'k{rng.randrange(40)}'
+            if rng.random() < 0.2:
+                counters.clear(key)
+                expected.pop(key, None)
+                continue
+            expiry = rng.choice([None, 1, 5])
+            try:
+                value = counters.incr(key, expiry=expiry)
+            except TableFull:
+                assert key not in expected
+                continue
+            if key in expected:
+                expected[key] = (expected[key][0] + 1, expected[key][1])
+            else:
+                expected[key] = (1, now + expiry if expiry else 0.0)
+            assert value == expected[key][0]
+            assert sorted(counters.items()) == sorted((k, v) for k, (v, _) in expected.items())
+
+    def test_counters_shared_across_processes(self, tmp_path):
+        path = str(tmp_path / 'counters.bin')
+        ctx = multiprocessing.get_context('fork')
+        workers = [ctx.Process(target=_hammer, args=(path, 'login', 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert SharedCounters(path).get('login') == 800
+
+
+class TestMmapStorage:
+    """Test the limits storage backend and login limits"""
+
+    def test_storage_from_uri(self, tmp_path):
+        storage = storage_from_string(f"mmap://{tmp_path}/limits.bin?slots=128")
+        assert storage.incr('k', 60) == 1
+        assert storage.counters.slots == 128
+        assert storage.get('k') == 1
+        assert storage.check() is True
+        assert storage.reset() == 1
+
+    def test_login_limit_shared_storage(self, tmp_path):
+        class LimitedConfig(TestingConfig):
+            RATELIMIT_ENABLED = True
+            RATELIMIT_STORAGE_URI = f"mmap://{tmp_path}/limits.bin"
+            RATELIMIT_LOGIN = '2 per minute'
+
+        app = create_app(LimitedConfig)
+        with app.test_client() as client:
+            statuses = [client.post('/auth/mechanic/login', json={}).status_code for _ in range(3)]
+
+        assert statuses == [400, 400, 429]
@@ -0,0 +1,123 @@
+"""
+Tests for read-replica routing, against two SQLite files
+"""
+import pytest
+
+from app import create_app, db
+from app.extensions import cache
+from app.models.customer import Customer
+from app.models.inventory import Inventory
+from app.models.mechanic import Mechanic
+from app.utils.replicas import read_only, replica_binds
+from config import TestingConfig
+
+
+@pytest.fixture
+def response_cache():
+    return False
+
+
+@pytest.fixture
+def app(tmp_path, response_cache):
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.sqlite'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.sqlite'}"]
+        RESPONSE_CACHE_ENABLED = response_cache
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        customer = Customer(first_name="Test", last_name="Customer", email="test@example.com")
+        customer.set_password("password123")
+        mechanic = Mechanic(first_name="Test", last_name="Mechanic", email="mechanic@example.com")
+        mechanic.set_password("mechanic123")
+        db.session.add_all([customer, mechanic, Inventory(part_name="Brake Pad", price=29.99, quantity=10)])
+        db.session.commit()
+        result = app.test_cli_runner().invoke(args=['sync-replicas'])
+        assert result.exit_code == 0, result.output
+        # Replication lag: the replica never sees this row
+        db.session.add(Inventory(part_name="Unreplicated", price=1, quantity=1))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def part_names(response):
+    return {item['part_name'] for item in response.get_json()['data']['inventory']}
+
+
+def test_get_reads_from_the_replica(client):
+    response = client.get('/inventory/')
+    assert response.headers['X-DB-Route'] == 'replica'
+    assert part_names(response) == {'Brake Pad'}
+
+
+def test_writes_go_to_the_primary_and_pin_the_client(client, mechanic_headers, customer_headers):
+    response = client.post('/inventory/', headers=mechanic_headers, json={'part_name': 'Rotor', 'price': 80})
+    assert response.status_code == 201
+    assert response.headers['X-DB-Route'] == 'primary'
+
+    # The writer reads its own write...
+    response = client.get('/inventory/', headers=mechanic_headers)
+    assert response.headers['X-DB-Route'] == 'primary'
+    assert 'Rotor' in part_names(response)
+    # ...other clients keep reading from the replica
+    response = client.get('/inventory/', headers=customer_headers)
+    assert response.headers['X-DB-Route'] == 'replica'
+    assert 'Rotor' not in part_names(response)
+
+    cache.clear()  # the pin expires
+    assert client.get('/inventory/', headers=mechanic_headers).headers['X-DB-Route'] == 'replica'
+
+
+@pytest.mark.parametrize('response_cache', [True])
+def test_cached_replica_reads_do_not_reach_the_writer(client, mechanic_headers, customer_headers):
+    client.post('/inventory/', headers=mechanic_headers, json={'part_name': 'Rotor', 'price': 80})
+    # Another client caches the replica's (lagging) list under the new tag version
+    response = client.get('/inventory/', headers=customer_headers)
+    assert 'Rotor' not in part_names(response)
+    assert client.get('/inventory/', headers=customer_headers).headers['X-Cache'] == 'HIT'
+
+    response = client.get('/inventory/', headers=mechanic_headers)
+    assert response.headers['X-DB-Route'] == 'primary'
+    assert 'Rotor' in part_names(response)
+
+
+def test_anonymous_writes_do_not_pin(client):
+    response = client.post('/customers/register', json={
+        'first_name': 'New', 'last_name': 'Customer', 'email': 'new@example.com', 'password': 'password123',
+    })
+    assert response.status_code == 201
+    assert client.get('/inventory/').headers['X-DB-Route'] == 'replica'
+
+
+def test_failed_writes_do_not_pin(client, mechanic_headers):
+    response = client.post('/inventory/', headers=mechanic_headers, json={'price': 80})
+    assert response.status_code == 400
+    assert client.get('/inventory/', headers=mechanic_headers).headers['X-DB-Route'] == 'replica'
+
+
+def test_read_only_functions_use_the_replica(app):
+    @read_only
+    def report():
+        return {item.part_name for item in Inventory.query.all()}
+
+    assert report() == {'Brake Pad'}
+    assert {item.part_name for item in Inventory.query.all()} == {'Brake Pad', 'Unreplicated'}
+
+
+def test_without_replicas_everything_uses_the_primary():
+    app = create_app(TestingConfig)
+    assert 'replicas' not in app.extensions
+    with app.app_context():
+        db.create_all()
+        response = app.test_client().get('/inventory/')
+    assert response.status_code == 200
+    assert 'X-DB-Route' not in response.headers
+
+
+def test_replica_binds_keep_existing_binds():
+    config = {'SQLALCHEMY_BINDS': {'audit': 'sqlite://'}, 'SQLALCHEMY_REPLICA_URIS': ['sqlite:///a', 'sqlite:///b']}
+    assert replica_binds(config) == {'audit': 'sqlite://', 'replica_0': 'sqlite:///a', 'replica_1': 'sqlite:///b'}
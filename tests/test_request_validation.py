@@ -0,0 +1,128 @@
+"""
+Tests for the request validators compiled from swagger.yaml
+"""
+import pytest
+
+from app.utils.request_validation import SpecError, compile_spec
+
+SPEC = {
+    'components': {
+        'schemas': {
+            'Part': {
+                'type': 'object',
+                'required': ['name', 'price'],
+                'properties': {
+                    'name': {'type': 'string', 'maxLength': 10},
+                    'price': {'type': 'number', 'minimum': 0},
+                    'quantity': {'type': 'integer'},
+                    'note': {'type': 'string', 'nullable': True},
+                    'grade': {'type': 'string', 'enum': ['oem', 'aftermarket']},
+                    'tags': {'type': 'array', 'items': {'type': 'string'}},
+                    'contact': {'$ref': '#/components/schemas/Contact'},
+                },
+            },
+            'Contact': {
+                'type': 'object',
+                'required': ['email'],
+                'properties': {'email': {'type': 'string', 'format': 'email'}},
+            },
+            'Login': {
+                'type': 'object',
+                'required': ['email'],
+                'x-empty-message': 'No data provided',
+                'x-required-message': 'Email is required',
+                'properties': {'email': {'type': 'string'}},
+            },
+        }
+    }
+}
+
+
+@pytest.fixture(scope='module')
+def validators():
+    return compile_spec(SPEC)
+
+
+def test_valid_body_passes(validators):
+    body = {'name': 'Pads', 'price': 0, 'quantity': 3, 'note': None, 'grade': 'oem',
+            'tags': ['brakes'], 'contact': {'email': 'a@b.co'}, 'unknown': 'ignored'}
+    assert validators['Part'](body) is None
+
+
+def test_missing_required_fields(validators):
+    assert validators['Part']({'name': '', 'price': None}) == ("Missing required fields: name, price", None)
+    assert validators['Part'](None) == ("No data provided", None)
+    assert validators['Part']([1]) == ("Request body must be a JSON object", None)
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('name', 'x' * 11, 'must be at most 10 characters'),
+    ('price', -1, 'must be >= 0'),
+    ('price', True, 'must be a number'),
+    ('quantity', 1.5, 'must be an integer'),
+    ('grade', 'used', 'must be one of: oem, aftermarket'),
+    ('tags', ['ok', 3], 'item 1 must be a string'),
+    ('contact', {'email': 'nope'}, 'email must be a valid email address'),
+    ('quantity', None, 'must not be null'),
+])
+def test_invalid_fields(validators, field, value, message):
+    body = {'name': 'Pads', 'price': 1, field: value}
+    assert validators['Part'](body) == (f"Invalid fields: {field} {message}", {field: message})
+
+
+def test_custom_messages(validators):
+    assert validators['Login']({}) == ("No data provided", None)
+    assert validators['Login']({'password': 'x'}) == ("Email is required", None)
+
+
+def test_bad_ref_is_rejected():
+    spec = {'components': {'schemas': {'A': {'type': 'object', 'properties': {
+        'b': {'$ref': '#/components/schemas/Missing'}}}}}}
+    with pytest.raises(SpecError):
+        compile_spec(spec)
+
+
+def test_every_route_schema_is_compiled(app):
+    validators = app.extensions['request_validators']
+    for name in ('CustomerLogin', 'CustomerRegister', 'CustomerUpdate', 'MechanicLogin',
+                 'MechanicRegister', 'MechanicUpdate', 'ServiceTicketCreate', 'ServiceTicketUpdate',
+                 'TicketMechanicAssign', 'TicketPartAdd', 'InventoryCreate', 'InventoryUpdate'):
+        assert name in validators
+
+
+def test_routes_keep_their_error_messages(client, mechanic_headers):
+    response = client.post('/auth/customer/login', data='email=x')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Missing JSON in request"
+
+    response = client.post('/auth/mechanic/login', json={})
+    assert response.get_json()['error'] == "No data provided"
+
+    response = client.post('/auth/mechanic/login', json={'email': 'mechanic@example.com'})
+    assert response.get_json()['error'] == "Email and password are required"
+
+    response = client.post('/customers/register', json={'email': 'new@example.com'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Missing required fields: first_name, last_name, password"
+
+    response = client.post('/tickets/1/add-part', json={'quantity': 1}, headers=mechanic_headers)
+    assert response.get_json()['error'] == "part_id is required"
+
+
+def test_routes_reject_wrong_types(client, mechanic_headers):
+    response = client.post('/inventory/', json={'part_name': 'Rotor', 'price': 'cheap'},
+                           headers=mechanic_headers)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['success'] is False
+    assert body['details'] == {'price': 'must be a number'}
+
+    response = client.post('/inventory/', data='{"part_name":', content_type='application/json',
+                           headers=mechanic_headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Malformed JSON in request"
+
+
+def test_auth_runs_before_validation(client):
+    response = client.post('/inventory/', json={})
+    assert response.status_code == 401
@@ -0,0 +1,80 @@
+"""
+Test tag-invalidated response caching on public GET endpoints
+"""
+from app import db
+from app.models.inventory import Inventory
+from app.models.service_ticket import ServiceTicket
+from app.models.customer import Customer
+
+
+def test_inventory_item_cached_until_update(client, mechanic_headers):
+    """A write to one item invalidates that item and the list"""
+    item_id = Inventory.query.first().id
+
+    first = client.get(f'/inventory/{item_id}')
+    second = client.get(f'/inventory/{item_id}')
+    listing = client.get('/inventory/')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+    assert client.get('/inventory/').headers['X-Cache'] == 'HIT'
+
+    response = client.put(f'/inventory/{item_id}', json={'quantity': 3}, headers=mechanic_headers)
+    assert response.status_code == 200
+
+    after = client.get(f'/inventory/{item_id}')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.get_json()['data']['quantity'] == 3
+    relisted = client.get('/inventory/')
+    assert relisted.headers['X-Cache'] == 'MISS'
+    assert relisted.get_json() != listing.get_json()
+
+
+def test_unrelated_tags_stay_cached(client, mechanic_headers):
+    """Creating a part leaves existing item pages cached"""
+    item_id = Inventory.query.first().id
+    client.get(f'/inventory/{item_id}')
+
+    response = client.post('/inventory/', json={'part_name': 'Filter', 'price': 9.5},
+                           headers=mechanic_headers)
+    assert response.status_code == 201
+
+    assert client.get(f'/inventory/{item_id}').headers['X-Cache'] == 'HIT'
+    assert client.get('/inventory/').get_json()['data']['count'] == 2
+
+
+def test_query_string_is_normalized(client):
+    """Parameter order doesn't create separate cache entries"""
+    assert client.get('/mechanics/?a=1&b=2').headers['X-Cache'] == 'MISS'
+    assert client.get('/mechanics/?b=2&a=1').headers['X-Cache'] == 'HIT'
+
+
+def test_ranking_invalidated_by_assignment(client, mechanic_headers):
+    """Assigning a mechanic to a ticket refreshes the ranking"""
+    customer = Customer.query.first()
+    ticket = ServiceTicket(customer_id=customer.id, vehicle_info='Civic', issue_description='Noise')
+    db.session.add(ticket)
+    db.session.commit()
+
+    before = client.get('/mechanics/ranking').get_json()
+    assert before['data']['ranking'][0]['ticket_count'] == 0
+
+    response = client.post(f'/tickets/{ticket.id}/assign-mechanic', json={}, headers=mechanic_headers)
+    assert response.status_code == 200
+
+    after = client.get('/mechanics/ranking')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.get_json()['data']['ranking'][0]['ticket_count'] == 1
+
+
+def test_rollback_keeps_cache(app, client):
+    """Tags scheduled in a rolled back transaction are not bumped"""
+    from app.utils.response_cache import invalidate_on_commit
+
+    item_id = Inventory.query.first().id
+    client.get(f'/inventory/{item_id}')
+    invalidate_on_commit(f'inventory:{item_id}')
+    db.session.rollback()
+    db.session.commit()
+
+    assert client.get(f'/inventory/{item_id}').headers['X-Cache'] == 'HIT'
@@ -0,0 +1,65 @@
+"""
+Tests for the deploy-time schema fingerprint
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, event
+
+from app import db
+from app.utils import schema_fingerprint
+from app.utils.schema_fingerprint import (
+    alembic_heads, compute_fingerprint, stored_fingerprint, sync_schema,
+)
+
+
+def quiet(_message):
+    pass
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_alembic_head_is_read_from_migration_scripts(tmp_path):
+    assert alembic_heads() == ['c55e6a707184']
+
+    (tmp_path / 'a.py').write_text("revision = 'aaa'\ndown_revision = None\n")
+    (tmp_path / 'b.py').write_text("revision = 'bbb'\ndown_revision = 'aaa'\n")
+    (tmp_path / 'c.py').write_text("revision = 'ccc'\ndown_revision = ('aaa',)\n")
+    assert alembic_heads(str(tmp_path)) == ['bbb', 'ccc']
+
+
+def test_fingerprint_tracks_models_and_head():
+    metadata = MetaData()
+    Table('part', metadata, Column('id', Integer, primary_key=True), Column('name', String(50)))
+    base = compute_fingerprint(metadata, ['head1'])
+
+    assert compute_fingerprint(metadata, ['head1']) == base
+    assert compute_fingerprint(metadata, ['head2']) != base
+
+    Table('part', metadata, Column('sku', String(20)), extend_existing=True)
+    assert compute_fingerprint(metadata, ['head1']) != base
+
+
+def test_unchanged_schema_skips_ddl_and_reflection(app):
+    assert stored_fingerprint(db.engine) is None
+    assert sync_schema(db, echo=quiet) is True
+    assert stored_fingerprint(db.engine) == compute_fingerprint(db.metadata)
+
+    statements = count_statements(db.engine)
+    assert sync_schema(db, echo=quiet) is False
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith('SELECT')
+
+
+def test_changed_fingerprint_runs_create_all(app, monkeypatch):
+    sync_schema(db, echo=quiet)
+    monkeypatch.setattr(schema_fingerprint, 'alembic_heads', lambda *args: ['newhead'])
+    assert sync_schema(db, echo=quiet) is True
+    assert sync_schema(db, echo=quiet) is False
+    assert sync_schema(db, force=True, echo=quiet) is True
+
+
+def test_bookkeeping_table_is_not_part_of_the_models(app):
+    assert schema_fingerprint.TABLE_NAME not in db.metadata.tables
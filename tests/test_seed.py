@@ -0,0 +1,67 @@
+"""
+Tests for the flask seed command
+"""
+from app import db
+from app.extensions import service_mechanic, ticket_inventory
+from app.models import Customer, Mechanic, ServiceTicket, Inventory
+from app.utils.seed import seed_database
+
+
+def _snapshot():
+    return [
+        (t.customer_id, t.vehicle_info, t.status, t.total_cost,
+         sorted(m.id for m in t.mechanics), sorted(p.id for p in t.inventory))
+        for t in ServiceTicket.query.order_by(ServiceTicket.id)
+    ]
+
+
+def test_seed_command_reports_rows(app):
+    result = app.test_cli_runner().invoke(args=['seed', '--tickets', '200', '--batch-size', '64'])
+
+    assert result.exit_code == 0, result.output
+    assert 'rows/sec' in result.output
+    # conftest already created one customer, mechanic and part
+    assert ServiceTicket.query.count() == 200
+    assert Customer.query.count() == 1 + 20
+    assert Mechanic.query.count() == 1 + 5
+    assert Inventory.query.count() == 1 + 20
+
+
+def test_seed_is_referentially_consistent(app):
+    seed_database(300, seed=5, batch_size=50)
+
+    customer_ids = {c.id for c in Customer.query}
+    mechanic_ids = {m.id for m in Mechanic.query}
+    part_ids = {p.id for p in Inventory.query}
+    assert {t.customer_id for t in ServiceTicket.query} <= customer_ids
+    assert {row.mechanic_id for row in db.session.execute(service_mechanic.select())} <= mechanic_ids
+    assert {row.inventory_id for row in db.session.execute(ticket_inventory.select())} <= part_ids
+    # Generated ids start after the existing rows
+    assert min(part_ids - {1}) == 2
+
+    ticket = ServiceTicket.query.filter(ServiceTicket.inventory.any()).first()
+    assert ticket.total_cost == round(sum(p.price for p in ticket.inventory), 2)
+
+
+def test_seed_is_deterministic(app):
+    seed_database(100, seed=9)
+    first = _snapshot()
+
+    ServiceTicket.query.delete()
+    db.session.execute(service_mechanic.delete())
+    db.session.execute(ticket_inventory.delete())
+    Customer.query.filter(Customer.id > 1).delete()
+    Mechanic.query.filter(Mechanic.id > 1).delete()
+    Inventory.query.filter(Inventory.id > 1).delete()
+    db.session.commit()
+
+    seed_database(100, seed=9)
+    assert _snapshot() == first
+
+
+def test_seeded_accounts_can_log_in(app, client):
+    seed_database(50)
+    response = client.post('/auth/customer/login', json={
+        'email': 'customer2@seed.example', 'password': 'password123',
+    })
+    assert response.status_code == 200
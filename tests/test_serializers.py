@@ -0,0 +1,56 @@
+"""
+Tests for the generated model serializers
+"""
+from datetime import datetime
+
+from app import db
+from app.models import Customer, Inventory, Mechanic, ServiceTicket
+from app.utils.serializers import serializer_for
+
+
+def make_ticket():
+    customer, mechanic, part = Customer.query.first(), Mechanic.query.first(), Inventory.query.first()
+    ticket = ServiceTicket(customer_id=customer.id, vehicle_info='2018 Civic', issue_description='Squeal',
+                           mechanics=[mechanic], inventory=[part])
+    db.session.add(ticket)
+    db.session.commit()
+    return ticket
+
+
+def test_fields_follow_the_table_without_excluded_columns(app):
+    customer = Customer.query.first()
+    data = customer.to_dict()
+    assert list(data) == ['id', 'first_name', 'last_name', 'email', 'phone', 'address', 'created_at']
+    assert 'password_hash' not in Mechanic.query.first().to_dict()
+    assert isinstance(data['created_at'], datetime)
+
+
+def test_ticket_nests_mechanics_and_parts(app):
+    ticket = make_ticket()
+    data = ticket.to_dict()
+    assert list(data)[-2:] == ['mechanics', 'inventory']
+    assert data['mechanics'] == [Mechanic.query.first().to_dict()]
+    assert data['inventory'][0]['part_number'] == 'TEST-001'
+
+
+def test_expired_instances_are_reloaded(app):
+    ticket = make_ticket()
+    db.session.expire(ticket)
+    assert 'vehicle_info' not in ticket.__dict__
+    assert ticket.to_dict()['vehicle_info'] == '2018 Civic'
+    assert len(ticket.to_dict()['mechanics']) == 1
+
+
+def test_core_rows_match_orm_instances(app):
+    make_ticket()
+    for model in (Customer, Mechanic, Inventory, ServiceTicket):
+        serializer = serializer_for(model)
+        rows = db.session.execute(serializer.select().order_by(model.id)).all()
+        expected = [{key: obj.to_dict()[key] for key, _column in serializer.fields}
+                    for obj in model.query.order_by(model.id)]
+        assert serializer.rows(rows) == expected
+
+
+def test_serializers_are_generated_once(app):
+    assert serializer_for(Customer) is serializer_for(Customer)
+    assert 'obj.__dict__' in serializer_for(ServiceTicket).one.__source__
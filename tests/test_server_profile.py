@@ -0,0 +1,110 @@
+"""
+Tests for the gunicorn server profile
+"""
+import os
+import runpy
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app import db
+from app.utils import server_profile
+from app.utils.server_profile import available_cpus, dispose_engines, warm_up
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+def write_cgroup(tmp_path, cpu_max):
+    (tmp_path / 'cpu.max').write_text(cpu_max)
+    return str(tmp_path)
+
+
+def test_available_cpus_honours_cgroup_quota(tmp_path):
+    affinity = len(os.sched_getaffinity(0))
+    assert available_cpus(write_cgroup(tmp_path, '50000 100000\n')) == 1
+    assert available_cpus(write_cgroup(tmp_path, 'max 100000\n')) == affinity
+    assert available_cpus(str(tmp_path / 'missing')) == affinity
+
+
+def test_available_cpus_reads_cgroup_v1(tmp_path):
+    (tmp_path / 'cpu').mkdir()
+    (tmp_path / 'cpu' / 'cpu.cfs_quota_us').write_text('150000')
+    (tmp_path / 'cpu' / 'cpu.cfs_period_us').write_text('100000')
+    assert available_cpus(str(tmp_path)) == min(2, len(os.sched_getaffinity(0)))
+
+
+def test_default_sizing():
+    assert server_profile.default_workers('gthread', 2) == 5
+    assert server_profile.default_workers('gevent', 2) == 2
+    assert server_profile.default_threads('gthread') == 4
+    assert server_profile.default_threads('gevent') == 1
+
+
+def test_dispose_engines_replaces_the_pool(app):
+    pool = db.engine.pool
+    dispose_engines(app)
+    assert db.engine.pool is not pool
+
+
+def test_warm_up_opens_connections_and_requests(app):
+    report = warm_up(app, connections=2)
+    assert report['connections'] == 2
+    assert [(path, status) for path, status, _ms in report['requests']] == [
+        ('/health', 200), ('/inventory/', 200), ('/mechanics/', 200),
+    ]
+
+
+def test_warm_up_reports_failures(app):
+    report = warm_up(app, connections=1, paths=('/nope',))
+    assert report['requests'][0][:2] == ('/nope', 404)
+
+
+def load_conf(monkeypatch, **env):
+    for name in ('GUNICORN_WORKER_CLASS', 'GUNICORN_WORKERS', 'WEB_CONCURRENCY', 'GUNICORN_THREADS'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONF)
+
+
+def test_gunicorn_conf_defaults(monkeypatch):
+    conf = load_conf(monkeypatch)
+    assert conf['worker_class'] == 'gthread'
+    assert conf['workers'] == 2 * available_cpus() + 1
+    assert conf['threads'] == 4
+    assert conf['preload_app'] is True
+    assert (conf['max_requests'], conf['max_requests_jitter']) == (1000, 100)
+
+
+def test_gunicorn_conf_overrides(monkeypatch):
+    conf = load_conf(monkeypatch, WEB_CONCURRENCY='3', GUNICORN_THREADS='8')
+    assert (conf['workers'], conf['threads']) == (3, 8)
+    with pytest.raises(RuntimeError):
+        load_conf(monkeypatch, GUNICORN_WORKER_CLASS='eventlet')
+
+
+def test_gevent_patches_before_the_app_is_imported(tmp_path):
+    # A stand-in gevent that reports what was imported when it was asked to patch
+    (tmp_path / 'gevent').mkdir()
+    (tmp_path / 'gevent' / '__init__.py').write_text('')
+    (tmp_path / 'gevent' / 'monkey.py').write_text(
+        "import sys\n"
+        "def patch_all():\n"
+        "    print('imported:', sorted(m for m in ('app', 'flask', 'sqlalchemy') if m in sys.modules))\n"
+    )
+    env = dict(os.environ, GUNICORN_WORKER_CLASS='gevent',
+               PYTHONPATH=os.pathsep.join((str(tmp_path), os.path.dirname(CONF))))
+    result = subprocess.run([sys.executable, '-c', f'import runpy; runpy.run_path({CONF!r})'],
+                            env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert 'imported: []' in result.stdout
+
+
+def test_post_fork_disposes_preloaded_engine(app, monkeypatch):
+    conf = load_conf(monkeypatch)
+    server = SimpleNamespace(cfg=SimpleNamespace(preload_app=True), app=SimpleNamespace(wsgi=lambda: app))
+    pool = db.engine.pool
+    conf['post_fork'](server, None)
+    assert db.engine.pool is not pool
@@ -0,0 +1,105 @@
+"""
+Test the shared SQLite cache backend
+"""
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+from flask import Flask
+
+from app.extensions import cache
+from app.utils.shared_cache import SQLiteCache
+
+
+def _set_in_child(path, key, value):
+    SQLiteCache(path).set(key, value)
+
+
+def _delete_in_child(path, key):
+    SQLiteCache(path).delete(key)
+
+
+class TestSQLiteCache:
+    """Test TTLs, LRU budget and cross-process visibility"""
+
+    def test_set_get_delete(self, tmp_path):
+        store = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+        assert store.get('missing') is None
+        assert store.set('ticket', {'id': 1, 'status': 'open'})
+        assert store.get('ticket') == {'id': 1, 'status': 'open'}
+        assert store.add('ticket', 'other') is False
+        assert store.delete('ticket') is True
+        assert store.has('ticket') is False
+
+    def test_ttl(self, tmp_path):
+        store = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+        store.set('short', 'value', timeout=1)
+        store.set('forever', 'value', timeout=0)
+        time.sleep(1.1)
+        assert store.get('short') is None
+        assert store.get('forever') == 'value'
+
+    def test_lru_byte_budget(self, tmp_path):
+        store = SQLiteCache(str(tmp_path / 'cache.sqlite'), max_bytes=3000)
+        for key in ('a', 'b', 'c'):
+            store.set(key, 'x' * 900)
+            time.sleep(0.01)
+        store._conn.execute("UPDATE cache_entry SET accessed = 0 WHERE key = 'a'")
+        store.set('d', 'x' * 900)
+
+        assert store.get('a') is None
+        assert [store.get(key) is not None for key in ('b', 'c', 'd')] == [True, True, True]
+        assert store.total_bytes() <= 3000
+
+    def test_inc(self, tmp_path):
+        store = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+        assert store.inc('hits') == 1
+        assert store.inc('hits', 5) == 6
+        assert store.dec('hits') == 5
+
+    def test_ignore_errors_covers_every_operation(self, tmp_path):
+        path = tmp_path / 'cache.sqlite'
+        path.write_bytes(b'not a database' * 512)
+
+        store = SQLiteCache(str(path), ignore_errors=True)
+        assert store.get('ticket') is None
+        assert store.has('ticket') is False
+        assert store.set('ticket', 1) is False
+        assert store.add('ticket', 1) is False
+        assert store.delete('ticket') is False
+        assert store.delete_many('a', 'b') == []
+        assert store.clear() is False
+        assert store.inc('hits') is None
+
+        with pytest.raises(sqlite3.DatabaseError):
+            SQLiteCache(str(path)).get('ticket')
+
+    def test_shared_across_processes(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        store = SQLiteCache(path)
+        store.set('stale', 'old')
+        ctx = multiprocessing.get_context('fork')
+
+        writer = ctx.Process(target=_set_in_child, args=(path, 'fresh', 'from-child'))
+        writer.start()
+        writer.join()
+        invalidator = ctx.Process(target=_delete_in_child, args=(path, 'stale'))
+        invalidator.start()
+        invalidator.join()
+
+        assert store.get('fresh') == 'from-child'
+        assert store.get('stale') is None
+
+    def test_flask_caching_integration(self, tmp_path):
+        app = Flask(__name__)
+        app.config.update(
+            CACHE_TYPE='app.utils.shared_cache.SQLiteCache',
+            CACHE_DIR=str(tmp_path),
+            CACHE_MAX_BYTES=1024 * 1024,
+        )
+        cache.init_app(app)
+        with app.app_context():
+            cache.set('answer', 42)
+            assert cache.get('answer') == 42
+        assert (tmp_path / 'mechanics_shop_cache.sqlite').exists()
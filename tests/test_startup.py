@@ -0,0 +1,47 @@
+"""
+Cold-start budget for the production entry point
+"""
+import os
+
+from app.utils.startup_profile import by_package, measure_cold_start
+
+# Process start to first served request. Generous for slow CI machines;
+# a typical run is well under a second.
+STARTUP_BUDGET_SECONDS = 3.0
+
+LAZY_MODULES = ('flask_migrate', 'alembic', 'flask_marshmallow', 'marshmallow')
+
+
+def production_env(tmp_path):
+    env = dict(os.environ)
+    env.pop('FLASK_ENV', None)
+    env.update(
+        DATABASE_URL='sqlite:///:memory:',
+        METRICS_PATH=str(tmp_path / 'metrics.bin'),
+        CACHE_DIR=str(tmp_path),
+        RATELIMIT_STORAGE_URI='memory://',
+    )
+    return env
+
+
+def test_cold_start_within_budget(tmp_path):
+    report = measure_cold_start('flask_app', env=production_env(tmp_path))
+
+    assert report['status'] == 200
+    assert report['total_s'] < STARTUP_BUDGET_SECONDS, report
+
+
+def test_rarely_used_extensions_are_not_imported(tmp_path):
+    report = measure_cold_start('flask_app', env=production_env(tmp_path))
+    loaded = [name for name in LAZY_MODULES if name in report['modules']]
+    assert loaded == []
+
+
+def test_by_package_sums_self_time():
+    rows = [('a', 10, 30), ('a.b', 20, 20), ('c', 5, 5)]
+    assert by_package(rows) == [('a', 30), ('c', 5)]
+
+
+def test_lazy_migrate_still_initialises_on_use(app):
+    # The `flask db` commands read the migrate config from app.extensions
+    assert app.extensions['migrate'].directory == 'migrations'
@@ -0,0 +1,105 @@
+"""
+Tests for the SQL-built ticket list JSON (SQL_JSON_TICKETS)
+"""
+import json
+
+import pytest
+
+from app import create_app, db
+from app.models import Customer, Inventory, Mechanic, ServiceTicket
+from config import TestingConfig
+
+
+class SQLJSONConfig(TestingConfig):
+    DEBUG = False
+    RESPONSE_CACHE_ENABLED = False
+    SQL_JSON_TICKETS = True
+    SQL_QUERY_HEADERS = True
+
+
+@pytest.fixture
+def app():
+    app = create_app(SQLJSONConfig)
+    with app.app_context():
+        db.create_all()
+        customer = Customer(first_name='Test', last_name='Customer', email='test@example.com')
+        other = Customer(first_name='Other', last_name='Customer', email='other@example.com')
+        mechanics = [Mechanic(first_name=f'Mech{i}', last_name='Anic', email=f'mechanic{i}@example.com',
+                              hourly_rate=55.0, is_active=i != 1) for i in range(3)]
+        mechanics[0].email = 'mechanic@example.com'
+        for person in (customer, other, *mechanics):
+            person.set_password('password123')
+        parts = [Inventory(part_name=f'Part {i}', part_number=f'P-{i:03d}', price=9.5 + i, quantity=i)
+                 for i in range(3)]
+        db.session.add_all([customer, other, *mechanics, *parts])
+        db.session.flush()
+        db.session.add_all([
+            ServiceTicket(customer_id=customer.id, vehicle_info='2018 Civic', issue_description='Squeal "brakes"',
+                          status='open', mechanics=[mechanics[2], mechanics[0]], inventory=[parts[1]]),
+            ServiceTicket(customer_id=other.id, vehicle_info='2020 Model 3', issue_description='Rattle',
+                          status='completed', priority='high', estimated_hours=1.5, total_cost=120.0),
+            ServiceTicket(customer_id=customer.id, vehicle_info='1999 Corolla', issue_description='Ünïcode',
+                          status='open', inventory=parts),
+        ])
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def both_paths(app, client, url, headers):
+    app.config['SQL_JSON_TICKETS'] = False
+    orm = client.get(url, headers=headers)
+    app.config['SQL_JSON_TICKETS'] = True
+    sql = client.get(url, headers=headers)
+    assert orm.status_code == sql.status_code == 200
+    return orm, sql
+
+
+@pytest.mark.parametrize('url, count', [
+    ('/tickets/', 3),
+    ('/tickets/?status=open', 2),
+    ('/tickets/?status=open&priority=high', 0),
+])
+def test_ticket_list_matches_orm_path(app, client, mechanic_headers, url, count):
+    orm, sql = both_paths(app, client, url, mechanic_headers)
+    assert sql.get_data() == orm.get_data()
+    assert sql.headers['X-Query-Count'] == '1'
+    assert sql.content_type == orm.content_type
+    assert sql.get_json()['data']['count'] == count
+
+
+@pytest.mark.parametrize('url', ['/customers/me/tickets', '/tickets/my-tickets'])
+def test_customer_tickets_match_orm_path(app, client, customer_headers, url):
+    orm, sql = both_paths(app, client, url, customer_headers)
+    assert sql.get_data() == orm.get_data()
+    tickets = sql.get_json()['data']['tickets']
+    assert [len(ticket['mechanics']) for ticket in tickets] == [2, 0]
+    assert [part['part_number'] for part in tickets[1]['inventory']] == ['P-000', 'P-001', 'P-002']
+
+
+def test_floats_keep_round_trip_precision(app, client, mechanic_headers):
+    # Sums a price list makes; SQLite's JSON functions would print 34.34 and 0.3
+    ticket = ServiceTicket.query.filter_by(status='completed').one()
+    ticket.total_cost = 29.99 + 4.35
+    ticket.estimated_hours = 0.1 + 0.2
+    Inventory.query.filter_by(part_number='P-002').one().price = 2 / 3
+    db.session.commit()
+
+    orm, sql = both_paths(app, client, '/tickets/', mechanic_headers)
+    assert sql.get_data() == orm.get_data()
+    completed = [ticket for ticket in sql.get_json()['data']['tickets'] if ticket['status'] == 'completed'][0]
+    assert (completed['total_cost'], completed['estimated_hours']) == (29.99 + 4.35, 0.1 + 0.2)
+
+
+def test_documents_are_built_in_one_query(app, client, mechanic_headers):
+    response = client.get('/tickets/', headers=mechanic_headers)
+    body = response.get_data()
+    assert response.headers['X-Query-Count'] == '1'
+    assert json.loads(body)['data']['tickets'][0]['mechanics'][0]['is_active'] is True
+
+
+def test_debug_output_takes_orm_path(app, client, mechanic_headers):
+    app.debug = True
+    response = client.get('/tickets/', headers=mechanic_headers)
+    assert b'\n  ' in response.get_data()
+    assert response.headers['X-Query-Count'] != '1'
@@ -0,0 +1,73 @@
+"""
+Tests for compact ticket lists with side-loaded mechanics and parts
+"""
+import pytest
+
+from app import db
+from app.models import Customer, Inventory, Mechanic, ServiceTicket
+
+
+def seed_shared(count):
+    """``count`` tickets that all share the seeded mechanic and part"""
+    customer, mechanic, part = Customer.query.first(), Mechanic.query.first(), Inventory.query.first()
+    extra = (Inventory.query.filter_by(part_number='F-1').first()
+             or Inventory(part_name='Filter', part_number='F-1', price=5.0, quantity=3))
+    for i in range(count):
+        ticket = ServiceTicket(customer_id=customer.id, vehicle_info=f'Car {i}', issue_description='Fix',
+                               status='open' if i % 2 else 'completed')
+        ticket.mechanics.append(mechanic)
+        ticket.inventory.extend([extra, part] if i % 3 == 0 else [part])
+        db.session.add(ticket)
+    db.session.commit()
+
+
+def expand(payload):
+    included = payload['included']
+    tickets = []
+    for ticket in payload['data']['tickets']:
+        ticket = dict(ticket)
+        ticket['mechanics'] = [included['mechanics'][str(i)] for i in ticket.pop('mechanic_ids')]
+        ticket['inventory'] = [included['parts'][str(i)] for i in ticket.pop('part_ids')]
+        tickets.append(ticket)
+    return tickets
+
+
+@pytest.mark.parametrize('query', ['', '?status=open'])
+def test_compact_expands_to_full_list(client, mechanic_headers, query):
+    seed_shared(6)
+    full = client.get(f'/tickets/{query}', headers=mechanic_headers).get_json()
+    compact = client.get(f'/tickets/{query}{"&" if query else "?"}compact=1', headers=mechanic_headers).get_json()
+
+    assert compact['success'] is True
+    assert compact['data']['count'] == full['data']['count']
+    assert expand(compact) == full['data']['tickets']
+
+
+def test_related_rows_are_included_once(client, mechanic_headers):
+    seed_shared(12)
+    payload = client.get('/tickets/?compact=true', headers=mechanic_headers).get_json()
+    tickets = payload['data']['tickets']
+
+    assert len(tickets) == 12
+    assert 'mechanics' not in tickets[0] and tickets[0]['mechanic_ids'] == [Mechanic.query.first().id]
+    assert len(payload['included']['mechanics']) == 1
+    assert sorted(payload['included']['parts']) == sorted(str(part.id) for part in Inventory.query)
+
+
+@pytest.mark.query_budget(6)
+def test_compact_query_count_is_flat(client, mechanic_headers):
+    seed_shared(1)
+    small = client.get('/tickets/?compact=1', headers=mechanic_headers).headers['X-Query-Count']
+    seed_shared(20)
+    assert client.get('/tickets/?compact=1', headers=mechanic_headers).headers['X-Query-Count'] == small
+
+
+@pytest.mark.parametrize('url', ['/customers/me/tickets?compact=1', '/tickets/my-tickets?compact=1'])
+def test_customer_compact_tickets(client, customer_headers, url):
+    payload = client.get(url, headers=customer_headers).get_json()
+    assert payload['data'] == {'tickets': [], 'count': 0}
+    assert payload['included'] == {'mechanics': {}, 'parts': {}}
+
+    seed_shared(2)
+    payload = client.get(url, headers=customer_headers).get_json()
+    assert [ticket['part_ids'] for ticket in payload['data']['tickets']] == [[1, 2], [1]]
@@ -0,0 +1,218 @@
+"""
+Tests for the webhook outbox and the batching delivery worker
+"""
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import db
+from app.models import Inventory, ServiceTicket, WebhookDelivery, WebhookEvent, WebhookSubscription
+from app.utils.webhooks import _utcnow, emit_event, sign, ticket_payload, verify_signature
+
+TICKET = {'vehicle_info': '2018 Civic', 'issue_description': 'Brakes squeal'}
+SECRET = 'shh'
+
+
+@pytest.fixture(autouse=True)
+def webhooks(app):
+    app.config['WEBHOOKS_ENABLED'] = True
+    dispatcher = app.extensions['webhooks']
+    dispatcher.batch_size, dispatcher.max_attempts = 3, 2
+    yield dispatcher
+    dispatcher.close()
+
+
+class Receiver(ThreadingHTTPServer):
+    """Records POSTs and answers with the queued statuses (then 200)"""
+    daemon_threads = True
+
+    def __init__(self):
+        self.requests, self.statuses, self.clients = [], [], set()
+        super().__init__(('127.0.0.1', 0), ReceiverHandler)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/hooks?source=shop'
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((self.path, dict(self.headers), body))
+        self.server.clients.add(self.client_address)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    server = Receiver()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def subscription(app, receiver):
+    subscription = WebhookSubscription(url=receiver.url, secret=SECRET, events='ticket.*,inventory.*')
+    db.session.add(subscription)
+    db.session.commit()
+    return subscription
+
+
+def sent_events(receiver):
+    return [event for _path, _headers, body in receiver.requests for event in json.loads(body)['events']]
+
+
+def test_events_commit_with_the_change_and_not_on_rollback(app, client, customer_headers):
+    client.post('/tickets/', headers=customer_headers, json=TICKET)
+    event = WebhookEvent.query.one()
+    assert event.event_type == 'ticket.created'
+    assert json.loads(event.payload)['ticket_id'] == ServiceTicket.query.one().id
+
+    # An event queued before a rollback goes with it
+    with app.test_request_context():
+        ticket = ServiceTicket(customer_id=1, vehicle_info='x', issue_description='y')
+        db.session.add(ticket)
+        emit_event('ticket.created', ticket_payload, ticket)
+        db.session.rollback()
+        db.session.commit()
+    assert WebhookEvent.query.count() == 1
+
+
+def test_no_events_when_disabled(app, client, customer_headers):
+    app.config['WEBHOOKS_ENABLED'] = False
+    client.post('/tickets/', headers=customer_headers, json=TICKET)
+    assert WebhookEvent.query.count() == 0
+
+
+def test_status_changes_and_stock_movements_are_emitted(client, customer_headers, mechanic_headers):
+    ticket_id = client.post('/tickets/', headers=customer_headers, json=TICKET).get_json()['data']['id']
+    client.put(f'/tickets/{ticket_id}', headers=customer_headers, json={'priority': 'high'})
+    client.put(f'/tickets/{ticket_id}', headers=customer_headers, json={'status': 'in_progress'})
+    part = Inventory.query.filter_by(part_number='TEST-001').first()
+    client.post(f'/tickets/{ticket_id}/add-part', headers=mechanic_headers, json={'part_id': part.id, 'quantity': 4})
+
+    events = [(event.event_type, json.loads(event.payload)) for event in WebhookEvent.query.order_by(WebhookEvent.id)]
+    assert [event_type for event_type, _ in events] == [
+        'ticket.created', 'ticket.status_changed', 'inventory.stock_changed',
+    ]
+    assert events[1][1]['previous_status'] == 'open' and events[1][1]['status'] == 'in_progress'
+    assert events[2][1] == {
+        'part_id': part.id, 'part_number': 'TEST-001', 'part_name': part.part_name, 'quantity': 6,
+        'previous_quantity': 10, 'change': -4, 'reason': 'used', 'below_min_stock': False,
+        'ticket_id': ticket_id,
+    }
+
+
+def test_events_are_batched_per_subscription_and_signed(app, client, customer_headers, receiver, subscription):
+    other = WebhookSubscription(url=receiver.url.replace('/hooks', '/inventory-only'), secret='other',
+                                events='inventory.*')
+    db.session.add(other)
+    db.session.commit()
+    for _ in range(5):
+        client.post('/tickets/', headers=customer_headers, json=TICKET)
+
+    stats = app.extensions['webhooks'].run_once()
+
+    assert stats == {'fanned_out': 5, 'delivered': 5, 'retrying': 0, 'failed': 0}
+    # Batches of 3 to the one subscription that wants ticket events
+    assert [path for path, _, _ in receiver.requests] == ['/hooks?source=shop'] * 2
+    # (sent in parallel, so in either order)
+    assert sorted(len(json.loads(body)['events']) for _, _, body in receiver.requests) == [2, 3]
+    assert sorted(event['id'] for event in sent_events(receiver)) == [event.id for event in WebhookEvent.query]
+    assert {event['type'] for event in sent_events(receiver)} == {'ticket.created'}
+    for _path, headers, body in receiver.requests:
+        assert verify_signature(SECRET, body, headers['X-Webhook-Signature'])
+        assert not verify_signature('wrong', body, headers['X-Webhook-Signature'])
+    assert {row.status for row in WebhookDelivery.query} == {'delivered'}
+
+    # Nothing is due on the next pass
+    assert app.extensions['webhooks'].run_once() == {'fanned_out': 0, 'delivered': 0, 'retrying': 0, 'failed': 0}
+
+
+def test_connections_are_kept_alive(app, client, customer_headers, receiver, subscription):
+    dispatcher = app.extensions['webhooks']
+    for _ in range(3):
+        client.post('/tickets/', headers=customer_headers, json=TICKET)
+        dispatcher.run_once()
+
+    assert len(receiver.requests) == 3
+    assert dispatcher.pool.connects == len(receiver.clients) == 1
+
+
+def test_failures_back_off_then_give_up(app, client, customer_headers, receiver, subscription):
+    dispatcher = app.extensions['webhooks']
+    receiver.statuses = [503, 500]
+    client.post('/tickets/', headers=customer_headers, json=TICKET)
+
+    assert dispatcher.run_once()['retrying'] == 1
+    delivery = WebhookDelivery.query.one()
+    assert (delivery.status, delivery.attempts) == ('pending', 1)
+    assert delivery.last_error.startswith('HTTP 503')
+    assert _utcnow() < delivery.next_attempt_at < _utcnow() + timedelta(seconds=3)
+
+    # Not due yet
+    assert dispatcher.run_once()['retrying'] == 0
+    delivery.next_attempt_at = _utcnow()
+    db.session.commit()
+    assert dispatcher.run_once()['failed'] == 1
+    db.session.refresh(delivery)
+    assert (delivery.status, delivery.attempts) == ('failed', 2)
+    assert len(receiver.requests) == 2
+
+
+def test_unreachable_endpoint_is_retried(app, client, customer_headers, receiver, subscription):
+    subscription.url = 'http://127.0.0.1:9/hooks'
+    db.session.commit()
+    client.post('/tickets/', headers=customer_headers, json=TICKET)
+
+    assert app.extensions['webhooks'].run_once()['retrying'] == 1
+    assert 'ConnectionRefusedError' in WebhookDelivery.query.one().last_error
+
+
+def test_backoff_doubles_up_to_the_cap(app):
+    dispatcher = app.extensions['webhooks']
+    delays = [dispatcher.backoff(attempt) for attempt in range(1, 20)]
+    assert 1 <= delays[0] <= 2 and 2 <= delays[1] <= 4
+    assert max(delays) <= dispatcher.backoff_max
+
+
+def test_signature_rejects_stale_and_malformed_headers():
+    body = b'{"events":[]}'
+    assert verify_signature(SECRET, body, sign(SECRET, body, timestamp=1000), now=1100)
+    assert not verify_signature(SECRET, body, sign(SECRET, body, timestamp=1000), now=2000)
+    assert not verify_signature(SECRET, body + b' ', sign(SECRET, body))
+    assert not verify_signature(SECRET, body, 'garbage')
+
+
+def test_cli_manages_subscriptions_and_delivers(app, runner, client, customer_headers, receiver):
+    result = runner.invoke(args=['webhooks', 'add', receiver.url, '--events', 'ticket.*', '--secret', SECRET])
+    assert 'Subscription 1' in result.output
+    assert runner.invoke(args=['webhooks', 'add', 'ftp://example.com']).exit_code != 0
+
+    client.post('/tickets/', headers=customer_headers, json=TICKET)
+    result = runner.invoke(args=['webhooks', 'deliver', '--once'])
+    assert '1 delivered' in result.output
+    assert '1 delivered' in runner.invoke(args=['webhooks', 'list']).output
+
+    WebhookDelivery.query.one().delivered_at = _utcnow() - timedelta(days=8)
+    WebhookEvent.query.one().created_at = _utcnow() - timedelta(days=8)
+    db.session.commit()
+    assert 'Deleted 1 deliveries and 1 events' in runner.invoke(args=['webhooks', 'purge']).output
+
+    assert 'Removed subscription 1' in runner.invoke(args=['webhooks', 'remove', '1']).output
+    assert WebhookSubscription.query.count() == 0